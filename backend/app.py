@@ -7,18 +7,53 @@ import tempfile
 import re
 import threading
 import gc
+import copy
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
-import whisper
+import numpy as np
 import ffmpeg
 import webvtt
 from werkzeug.utils import secure_filename
 from subtitles_utils import format_srt_with_line_limits, break_long_subtitles, split_subtitle_into_lines
 from custom_position import create_ass_file_with_custom_position, create_karaoke_ass_file, create_word_by_word_karaoke, create_precise_word_highlighting_ass
+from model_pool import ModelPool
+from quantization import add_quantized_variants, load_model_by_name
+from task_store import create_task_store
+from job_queue import PRIORITIES, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, JobQueue, QueueFullError
+from chunked_transcription import MAX_CHUNK_SECONDS, MIN_CHUNK_SECONDS, ChunkedTranscriber, shift_segments
+from batch_inference import BatchedTranscriber
+from transcription_cache import TranscriptionCache, make_cache_key
+from audio_artifacts import AudioArtifactStore
+from chunked_transcription import load_wav_pcm, load_wav_range, transcribe_in_sequence, wav_duration
+from segment_stream import SegmentStreamRegistry
+from vad import build_speech_timeline
+from engines import DEFAULT_ENGINE, create_engines
+from resource_manager import (ResourceManager, estimate_render_memory_mb, estimate_renditions_memory_mb,
+                              estimate_transcription_memory_mb)
+from cancellation import (CancellationRegistry, TaskCancelledError, check_cancelled, current_token,
+                          install_cancellation_hook)
+from mel_cache import MelCache
+from parallel_render import plan_segments, render_segments_parallel
+from ffmpeg_progress import EncodeProgress, follow_progress, with_progress
+from media_probe import MediaProbeStore
+from render_cache import RenderCache, make_render_key
+from preview import preview_window, window_subtitles
+from renditions import parse_renditions, render_renditions, rendition_geometry
+from soft_subtitles import DEFAULT_SOFT_CONTAINER, SOFT_SUBTITLE_CONTAINERS, mux_subtitles
+from encoding_profiles import (DEFAULT_PROFILE, ProfileStats, audio_args, cache_options, get_profile, scale_filter,
+                               thread_count, video_args)
+from retranscription import (RANGE_PADDING_SECONDS, clip_segments_to_range, context_prompt,
+                             expand_ranges_to_subtitles, merge_ranges, splice_subtitles)
 
 app = Flask(__name__)
 
+# Procesele worker ale transcrierii pe bucăți (pornite cu 'spawn') reimportă acest modul ca
+# __mp_main__, deși folosesc doar funcțiile din chunked_transcription. În ele nu pornim nimic:
+# nici încărcarea modelului, nici coada, store-ul de task-uri, cache-urile sau watchdog-ul
+# (serviciile de mai jos rămân None).
+IS_WORKER_PROCESS = __name__ == '__mp_main__'
+
 # Configurare CORS mai permisivă pentru a accepta toate cererile
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 
@@ -32,14 +67,28 @@ app.config['MAX_CONTENT_LENGTH'] = None  # Eliminăm limita de mărime
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
 # Ensure directories exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(PROCESSED_FOLDER, exist_ok=True)
+if not IS_WORKER_PROCESS:
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    os.makedirs(PROCESSED_FOLDER, exist_ok=True)
+
+# Cu mai mulți workeri gunicorn (WEB_CONCURRENCY, vezi gunicorn.conf.py), fiecare proces are
+# propriile modele și propria coadă: bugetele de memorie sunt ale containerului și se împart între ei
+WORKER_PROCESSES = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
 
 # Variabile globale pentru gestionarea modelelor Whisper
-current_model = None
+# Pool-ul păstrează mai multe modele încărcate simultan, în limita bugetului de RAM,
+# iar current_model_name este modelul implicit pentru cererile fără model explicit
+MODEL_POOL_MEMORY_MB = float(os.environ.get('WHISPER_POOL_MEMORY_MB', 2500)) / WORKER_PROCESSES
 current_model_name = None
 model_lock = threading.Lock()
 
+def load_whisper_checkpoint(model_size):
+    """Încarcă un checkpoint Whisper (sau varianta INT8); torch este importat abia aici, nu la pornire."""
+    # Hook-ul de anulare întrerupe decodarea job-urilor anulate (DELETE /api/tasks/<task_id>)
+    return install_cancellation_hook(load_model_by_name(model_size))
+
+model_pool = ModelPool(load_whisper_checkpoint, MODEL_POOL_MEMORY_MB)
+
 # Dicționar cu informații despre modelele Whisper disponibile
 AVAILABLE_MODELS = {
     'base': {
@@ -64,95 +113,402 @@ AVAILABLE_MODELS = {
     }
 }
 
+# Fiecare model are și o variantă INT8 (ex: 'small-int8') pentru inferență mai rapidă pe CPU
+AVAILABLE_MODELS = add_quantized_variants(AVAILABLE_MODELS)
+
 def load_whisper_model(model_size):
-    """Încarcă un model Whisper specific, cu gestionarea memoriei."""
-    global current_model, current_model_name
-    
-    with model_lock:
-        # Dacă modelul curent este deja cel dorit, nu facem nimic
-        if current_model_name == model_size and current_model is not None:
-            print(f"Model {model_size} already loaded")
-            return current_model
-        
-        # Eliberăm memoria pentru modelul anterior
-        if current_model is not None:
-            print(f"Unloading previous model: {current_model_name}")
-            del current_model
-            gc.collect()  # Forțează garbage collection
-            time.sleep(1)  # Dăm timp pentru eliberarea memoriei
-        
-        print(f"Loading Whisper model: {model_size}")
-        try:
-            current_model = whisper.load_model(model_size)
-            current_model_name = model_size
-            print(f"Successfully loaded model: {model_size}")
-            return current_model
-        except Exception as e:
-            print(f"Error loading model {model_size}: {str(e)}")
-            # Fallback la modelul base dacă nu se poate încărca cel dorit
-            if model_size != 'base':
-                print("Falling back to base model")
-                try:
-                    current_model = whisper.load_model('base')
-                    current_model_name = 'base'
-                    return current_model
-                except Exception as fallback_error:
-                    print(f"Failed to load fallback model: {fallback_error}")
-                    raise e
-            else:
+    """
+    Încarcă un model Whisper în pool (dacă nu este deja rezident).
+
+    Returns:
+        str: Numele modelului încărcat efectiv (poate fi 'base' dacă s-a folosit fallback-ul)
+    """
+    try:
+        model_pool.get(model_size)
+        return model_size
+    except Exception as e:
+        print(f"Error loading model {model_size}: {str(e)}")
+        # Fallback la modelul base dacă nu se poate încărca cel dorit
+        if model_size != 'base':
+            print("Falling back to base model")
+            try:
+                model_pool.get('base')
+                return 'base'
+            except Exception as fallback_error:
+                print(f"Failed to load fallback model: {fallback_error}")
                 raise e
+        else:
+            raise e
 
-# Inițializare model la pornirea aplicației
+# Inițializare model în fundal: API-ul pornește imediat, iar modelul implicit este
+# încărcat și "încălzit" cu o inferență scurtă într-un thread separat
 initial_model_size = os.environ.get('WHISPER_MODEL', 'small')
-print(f"Initializing with model: {initial_model_size}")
-try:
-    current_model = load_whisper_model(initial_model_size)
-    print(f"Application started with model: {current_model_name}")
-except Exception as e:
-    print(f"Failed to initialize Whisper model: {e}")
-    current_model = None
-    current_model_name = None
-
-# Dicționar global pentru a stoca progresul activităților
-processing_status = {}
+current_model_name = initial_model_size
+model_ready = threading.Event()
+model_readiness = {
+    'state': 'pending',
+    'model': initial_model_size,
+    'error': None,
+    'load_time': None,
+    'warmup_time': None
+}
+
+def warm_up_default_model():
+    """Încarcă modelul implicit și rulează o transcriere pe o secundă de liniște."""
+    global current_model_name
+    try:
+        model_readiness['state'] = 'loading'
+        print(f"Initializing with model: {initial_model_size} (pool budget: {MODEL_POOL_MEMORY_MB:.0f} MB)")
+        start_time = time.time()
+        with model_lock:
+            current_model_name = load_whisper_model(initial_model_size)
+        model_readiness['model'] = current_model_name
+        model_readiness['load_time'] = round(time.time() - start_time, 2)
+        
+        model_readiness['state'] = 'warming_up'
+        start_time = time.time()
+        with model_pool.lease(current_model_name) as model:
+            model.transcribe(np.zeros(16000, dtype=np.float32), language='ro', fp16=False, verbose=None)
+        model_readiness['warmup_time'] = round(time.time() - start_time, 2)
+        
+        model_readiness['state'] = 'ready'
+        print(f"Application ready with model: {current_model_name} "
+              f"(load {model_readiness['load_time']}s, warm-up {model_readiness['warmup_time']}s)")
+    except Exception as e:
+        print(f"Failed to initialize Whisper model: {e}")
+        model_readiness['state'] = 'error'
+        model_readiness['error'] = str(e)
+    finally:
+        # Job-urile în așteptare pornesc oricum; vor încerca să încarce modelul la cerere
+        model_ready.set()
+
+if not IS_WORKER_PROCESS:
+    threading.Thread(target=warm_up_default_model, name='model-warmup', daemon=True).start()
+
+# Statusul și rezultatele task-urilor: în memorie (un singur proces) sau SQLite în modul WAL pe un
+# volum comun (TASK_STORE=sqlite), ca polling-ul să meargă și cu mai mulți workeri gunicorn.
+# Task-urile terminate expiră după TASK_TTL_SECONDS; progresul se scrie cel mult o dată pe interval.
+task_store = None if IS_WORKER_PROCESS else create_task_store(
+    os.environ.get('TASK_STORE', 'memory'),
+    os.environ.get('TASK_STORE_PATH', os.path.join(os.getcwd(), 'cache', 'tasks.sqlite3')),
+    ttl_seconds=float(os.environ.get('TASK_TTL_SECONDS', 3600)),
+    write_interval=float(os.environ.get('TASK_STATUS_WRITE_INTERVAL', 0.5))
+)
+
+# Coada de job-uri (transcrieri, re-transcrieri, randări): cererile HTTP returnează imediat,
+# workerii procesează în fundal. Job-urile pornesc în ordinea priorității și doar cât timp
+# vârful de memorie estimat încape în JOB_MEMORY_BUDGET_MB alături de modelele rezidente.
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', os.cpu_count() or 2))
+JOB_QUEUE_MAX_SIZE = int(os.environ.get('JOB_QUEUE_MAX_SIZE', 100))
+JOB_MEMORY_BUDGET_MB = float(os.environ.get('JOB_MEMORY_BUDGET_MB', 3500)) / WORKER_PROCESSES
+
+def resident_model_memory_mb():
+    """Memoria ocupată de modelele încărcate în pool-urile tuturor motoarelor."""
+    pools = {id(model_pool): model_pool}
+    for engine in transcription_engines.values():
+        pool = getattr(engine, 'model_pool', None)
+        if pool is not None:
+            pools[id(pool)] = pool
+    return sum(pool.memory_used_mb() for pool in pools.values())
+
+job_queue = None if IS_WORKER_PROCESS else JobQueue(
+    JOB_WORKERS, max_pending=JOB_QUEUE_MAX_SIZE, name='jobs',
+    memory_budget_mb=JOB_MEMORY_BUDGET_MB if JOB_MEMORY_BUDGET_MB > 0 else None,
+    baseline_memory=resident_model_memory_mb, result_store=task_store
+)
+
+# Anularea job-urilor (DELETE /api/tasks/<task_id>) și watchdog-ul pentru ffmpeg blocat
+FFMPEG_STALL_SECONDS = float(os.environ.get('FFMPEG_STALL_SECONDS', 120))
+cancellations = CancellationRegistry()
+if not IS_WORKER_PROCESS:
+    cancellations.start_watchdog(FFMPEG_STALL_SECONDS)
+
+# Bugetul de nuclee per job activ (torch, workerii de transcriere pe bucăți și ffmpeg)
+resource_manager = ResourceManager(min_threads=int(os.environ.get('JOB_MIN_THREADS', 1)))
+
+# Randare paralelă: video-ul este tăiat la cadre cheie și fiecare segment e codat de un ffmpeg separat
+PARALLEL_RENDER = os.environ.get('PARALLEL_RENDER', 'false').lower() == 'true'
+RENDER_SEGMENTS = int(os.environ.get('RENDER_SEGMENTS', 4))
+
+# Profilul de codare implicit ('draft', 'balanced', 'final') și viteza măsurată a fiecărui profil
+ENCODING_PROFILE = os.environ.get('ENCODING_PROFILE', DEFAULT_PROFILE)
+profile_stats = ProfileStats(default_profile=ENCODING_PROFILE)
+
+# Video-urile randate sunt refolosite pentru aceeași sursă + același ASS + aceleași setări ffmpeg
+render_cache = None if IS_WORKER_PROCESS else RenderCache(
+    os.environ.get('RENDER_CACHE_DIR', os.path.join(os.getcwd(), 'cache', 'renders')),
+    PROCESSED_FOLDER,
+    max_size_mb=float(os.environ.get('RENDER_CACHE_MAX_MB', 5000))
+)
+
+# Transcriere paralelă pe bucăți tăiate în liniște (fiecare proces worker are propriul model)
+CHUNKED_TRANSCRIPTION = os.environ.get('CHUNKED_TRANSCRIPTION', 'false').lower() == 'true'
+CHUNK_WORKERS = int(os.environ.get('CHUNK_WORKERS', 2))
+chunked_transcriber = None if IS_WORKER_PROCESS else ChunkedTranscriber(CHUNK_WORKERS)
+
+# Micro-batching: ferestrele de 30 s ale job-urilor concurente sunt decodate împreună
+BATCHED_INFERENCE = os.environ.get('BATCHED_INFERENCE', 'false').lower() == 'true'
+batched_transcriber = None if IS_WORKER_PROCESS else BatchedTranscriber(
+    model_pool,
+    max_batch=int(os.environ.get('BATCH_MAX_SIZE', 8)),
+    max_wait_ms=float(os.environ.get('BATCH_MAX_WAIT_MS', 50))
+)
+
+# Moduri de transcriere: 'standard' (model.transcribe), 'chunked' (procese paralele), 'batched'
+TRANSCRIPTION_MODES = ('standard', 'chunked', 'batched')
+
+# Motoare de transcriere selectabile per job ('whisper' = openai-whisper, 'faster-whisper' = CTranslate2 int8)
+# Modurile chunked/batched se aplică doar motorului openai-whisper
+# Implicit, modelele ambelor motoare împart WHISPER_POOL_MEMORY_MB; FASTER_WHISPER_MEMORY_MB dă un buget
+# separat, adunat oricum la memoria rezidentă văzută de coada de job-uri
+TRANSCRIPTION_ENGINE = os.environ.get('TRANSCRIPTION_ENGINE', DEFAULT_ENGINE)
+FASTER_WHISPER_MEMORY_MB = os.environ.get('FASTER_WHISPER_MEMORY_MB')
+transcription_engines = create_engines(
+    model_pool,
+    memory_budget_mb=float(FASTER_WHISPER_MEMORY_MB) / WORKER_PROCESSES if FASTER_WHISPER_MEMORY_MB else None,
+    cpu_threads=int(os.environ.get('FASTER_WHISPER_THREADS', 0))
+)
+
+# Segmentele parțiale publicate în timpul transcrierii (SSE sau polling incremental)
+# Cu store-ul SQLite, segmentele ajung și la clienții serviți de alți workeri gunicorn
+segment_streams = SegmentStreamRegistry(store=task_store if task_store is not None and task_store.shared else None)
+
+# Anularea unui job din alt worker este o cerere în store-ul partajat; worker-ul care îl
+# rulează verifică cererile pentru job-urile lui la fiecare CANCEL_POLL_SECONDS
+CANCEL_POLL_SECONDS = float(os.environ.get('CANCEL_POLL_SECONDS', 1.0))
+
+def cancel_owned_task(task_id):
+    """
+    Anulează un job din coada acestui worker: îl scoate din coadă dacă încă așteaptă,
+    altfel semnalează token-ul job-ului în lucru.
+
+    Returns:
+        tuple: (starea din coadă, True dacă job-ul este al acestui worker,
+            'dequeued' / 'cancelling' / None după ce s-a întâmplat)
+    """
+    queue_state, is_local = job_queue.cancel(task_id)
+    if queue_state == 'queued' and is_local:
+        cancellations.discard(task_id)
+        update_task_status(task_id, "cancelled", 0, "Task anulat înainte de pornire")
+        segment_streams.finish(task_id, error='cancelled')
+        return queue_state, is_local, 'dequeued'
+    if cancellations.cancel(task_id, reason='user'):
+        # Job-ul se oprește la următoarea verificare; statusul final devine 'cancelled'
+        update_task_status(task_id, "cancelling", (task_store.get_status(task_id) or {}).get('progress', 0),
+                           "Anulare în curs")
+        return queue_state, is_local, 'cancelling'
+    return queue_state, is_local, None
+
+def watch_cancel_requests():
+    """Aplică cererile de anulare trimise prin store de alți workeri pentru job-urile acestui worker."""
+    while True:
+        time.sleep(CANCEL_POLL_SECONDS)
+        try:
+            for task_id in task_store.take_cancel_requests(job_queue.local_task_ids()):
+                print(f"Task {task_id}: cancellation requested through another worker")
+                cancel_owned_task(task_id)
+        except Exception as e:
+            print(f"Could not read cancellation requests: {e}")
+
+if not IS_WORKER_PROCESS and task_store.shared:
+    threading.Thread(target=watch_cancel_requests, name='cancel-requests', daemon=True).start()
+
+# Pre-procesare VAD: zonele fără vorbire nu mai sunt trimise la Whisper
+VAD_ENABLED = os.environ.get('VAD_ENABLED', 'false').lower() == 'true'
+
+# Audio 16 kHz extras o singură dată la încărcare și refolosit de toate job-urile
+audio_artifacts = AudioArtifactStore(max_parallel_extractions=int(os.environ.get('AUDIO_EXTRACTION_WORKERS', 2)))
+
+# Metadatele (dimensiuni, durată, cadre cheie, audio) citite o singură dată la încărcare
+media_probes = MediaProbeStore()
+
+# Cache persistent pentru rezultatele brute Whisper (reformatarea nu mai rulează modelul)
+TRANSCRIPTION_CACHE_DIR = os.environ.get('TRANSCRIPTION_CACHE_DIR', os.path.join(os.getcwd(), 'cache', 'transcriptions'))
+transcription_cache = None if IS_WORKER_PROCESS else TranscriptionCache(
+    TRANSCRIPTION_CACHE_DIR,
+    max_entries=int(os.environ.get('TRANSCRIPTION_CACHE_MAX_ENTRIES', 200)),
+    max_size_mb=float(os.environ.get('TRANSCRIPTION_CACHE_MAX_MB', 500))
+)
+
+# Spectrogramele log-mel calculate o singură dată per fișier și n_mels (memory-mapped, comune modelelor)
+mel_cache = None if IS_WORKER_PROCESS else MelCache(
+    os.environ.get('MEL_CACHE_DIR', os.path.join(os.getcwd(), 'cache', 'mel')),
+    max_size_mb=float(os.environ.get('MEL_CACHE_MAX_MB', 2000))
+)
 
 @app.route('/api/status/<task_id>', methods=['GET'])
 def get_task_status(task_id):
     """Returnează statusul și progresul pentru un task specific."""
-    if task_id in processing_status:
-        return jsonify(processing_status[task_id]), 200
+    status = task_store.get_status(task_id)
+    if status is not None:
+        position = job_queue.queue_position(task_id)
+        if position is not None:
+            status['queue_position'] = position
+        job_info = job_queue.job_info(task_id)
+        if job_info is not None:
+            status['priority'] = job_info['priority']
+            status['estimated_memory_mb'] = job_info['estimated_memory_mb']
+        allocation = resource_manager.get_allocation(task_id)
+        if allocation is not None:
+            status['resources'] = allocation
+        
+        # Polling incremental: ?since=N returnează segmentele transcrise de la indexul N
+        since = request.args.get('since', type=int)
+        if since is not None:
+            partial = segment_streams.read(task_id, max(0, since))
+            if partial is not None:
+                status['segments'] = partial['segments']
+                status['next_segment'] = partial['next']
+        return jsonify(status), 200
     return jsonify({'error': 'Task ID not found'}), 404
 
-def update_task_status(task_id, status, progress, message=""):
-    """Actualizează statusul unui task."""
-    processing_status[task_id] = {
+@app.route('/api/stream/<task_id>', methods=['GET'])
+def stream_task_segments(task_id):
+    """Server-Sent Events cu segmentele transcrise pe măsură ce sunt gata."""
+    if segment_streams.read(task_id) is None:
+        return jsonify({'error': 'Task ID not found'}), 404
+    
+    since = max(0, request.args.get('since', 0, type=int))
+    
+    def generate():
+        position = since
+        while True:
+            partial = segment_streams.wait(task_id, position)
+            if partial is None:
+                break
+            if partial['segments']:
+                position = partial['next']
+                payload = {'segments': partial['segments'], 'next': position}
+                yield f"event: segments\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            elif not partial['finished']:
+                yield ": keep-alive\n\n"
+            if partial['finished'] and position >= partial['next']:
+                payload = {'error': partial['error'], 'total': position}
+                yield f"event: {'error' if partial['error'] else 'done'}\ndata: {json.dumps(payload)}\n\n"
+                break
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/transcription-cache', methods=['GET'])
+def get_transcription_cache_stats():
+    """Returnează statisticile cache-ului de transcrieri (hits, misses, dimensiune)."""
+    return jsonify(transcription_cache.stats()), 200
+
+@app.route('/api/mel-cache', methods=['GET'])
+def get_mel_cache_stats():
+    """Returnează statisticile cache-ului de spectrograme log-mel."""
+    return jsonify(mel_cache.stats()), 200
+
+@app.route('/api/encoding-profiles', methods=['GET'])
+def get_encoding_profiles():
+    """Returnează profilele de codare disponibile și viteza măsurată a fiecăruia pe acest host."""
+    return jsonify({'default': profile_stats.default_profile, 'profiles': profile_stats.report()}), 200
+
+@app.route('/api/render-cache', methods=['GET'])
+def get_render_cache_stats():
+    """Returnează statisticile cache-ului de video-uri randate."""
+    return jsonify(render_cache.stats()), 200
+
+@app.route('/api/audio-artifacts', methods=['GET'])
+def get_audio_artifact_stats():
+    """Returnează statisticile extragerilor audio (extrageri, refolosiri, eșecuri)."""
+    return jsonify(audio_artifacts.stats()), 200
+
+@app.route('/api/media-info/<filename>', methods=['GET'])
+def get_media_info(filename):
+    """Returnează record-ul de metadate al unui fișier încărcat (fără lista cadrelor cheie)."""
+    file_path = os.path.join(UPLOAD_FOLDER, secure_filename(filename))
+    if not os.path.exists(file_path):
+        return jsonify({'error': 'File not found'}), 404
+    record = media_probes.get(file_path)
+    if record is None:
+        return jsonify({'error': 'Could not read media metadata'}), 500
+    media_info = {key: value for key, value in record.items() if key != 'keyframes'}
+    media_info['keyframe_count'] = len(record['keyframes'])
+    return jsonify(media_info), 200
+
+@app.route('/api/jobs', methods=['GET'])
+def get_job_queue_stats():
+    """Returnează starea cozii de job-uri (workeri, job-uri în așteptare și în lucru) și a store-ului de task-uri."""
+    return jsonify(dict(job_queue.stats(), task_store=task_store.stats())), 200
+
+@app.route('/api/engines', methods=['GET'])
+def get_transcription_engines():
+    """Returnează motoarele de transcriere, disponibilitatea lor și motorul implicit."""
+    return jsonify({
+        'engines': [engine.describe() for engine in transcription_engines.values()],
+        'default_engine': TRANSCRIPTION_ENGINE
+    }), 200
+
+@app.route('/api/resources', methods=['GET'])
+def get_resource_allocation():
+    """Returnează alocarea curentă a nucleelor pe job-uri."""
+    return jsonify(resource_manager.stats()), 200
+
+@app.route('/api/cancellations', methods=['GET'])
+def get_cancellation_stats():
+    """Returnează numărul de job-uri anulate (de utilizator sau de watchdog)."""
+    return jsonify(cancellations.stats()), 200
+
+@app.route('/api/batching', methods=['GET'])
+def get_batching_stats():
+    """Returnează statisticile serverelor de micro-batching (dimensiunea medie a batch-urilor)."""
+    return jsonify(batched_transcriber.stats()), 200
+
+def update_task_status(task_id, status, progress, message="", **details):
+    """
+    Actualizează statusul unui task.
+
+    `details` sunt câmpuri suplimentare expuse în /api/status (ex: 'encode' = telemetria ffmpeg).
+    """
+    state_changed = task_store.update_status(task_id, {
         'status': status,
         'progress': progress,
         'message': message,
-        'timestamp': time.time()
-    }
-    print(f"Task {task_id}: {status} - {progress}% - {message}")
+        'timestamp': time.time(),
+        **details
+    })
+    # Logăm doar trecerile de stare, nu fiecare actualizare de progres
+    if state_changed:
+        print(f"Task {task_id}: {status} - {progress}% - {message}")
 
 @app.route('/api/available-models', methods=['GET'])
 def get_available_models():
     """Returnează lista modelelor Whisper disponibile și modelul curent."""
     models_list = []
     for model_key, model_info in AVAILABLE_MODELS.items():
+        # Memoria și RTF-ul (timp procesare / durată audio) măsurate, pentru comparația fp32 vs INT8
+        report = model_pool.model_report(model_key)
         models_list.append({
             'value': model_key,
             'name': model_info['name'],
             'size': model_info['size'],
-            'description': model_info['description']
+            'description': model_info['description'],
+            'quantized': model_info.get('quantized', False),
+            'base_model': model_info.get('base_model', model_key),
+            'memory_mb': report['memory_mb'],
+            'memory_measured': report['memory_measured'],
+            'loaded': report['loaded'],
+            'rtf': report['rtf'],
+            'rtf_runs': report['rtf_runs']
         })
     
     return jsonify({
         'models': models_list,
-        'current_model': current_model_name or 'none'
+        'current_model': current_model_name or 'none',
+        'loaded_models': model_pool.loaded_models()
     }), 200
 
+@app.route('/api/model-pool', methods=['GET'])
+def get_model_pool_stats():
+    """Returnează statisticile pool-ului de modele (hits, misses, timpi de încărcare, memorie)."""
+    return jsonify(model_pool.stats()), 200
+
 @app.route('/api/change-model', methods=['POST'])
 def change_whisper_model():
-    """Schimbă modelul Whisper curent."""
+    """Schimbă modelul Whisper implicit (modelele anterioare rămân în pool)."""
+    global current_model_name
     data = request.json
     new_model = data.get('model', 'small')
     
@@ -161,12 +517,14 @@ def change_whisper_model():
     
     try:
         print(f"Request to change model to: {new_model}")
-        model = load_whisper_model(new_model)
+        with model_lock:
+            current_model_name = load_whisper_model(new_model)
         
         return jsonify({
             'message': f'Model changed to {new_model}',
             'current_model': current_model_name,
-            'model_info': AVAILABLE_MODELS[new_model]
+            'model_info': AVAILABLE_MODELS[new_model],
+            'loaded_models': model_pool.loaded_models()
         }), 200
         
     except Exception as e:
@@ -336,11 +694,16 @@ def upload_file():
             print(f"API: File saved successfully to {file_path}")
             update_task_status(task_id, "completed", 100, "Fișier încărcat cu succes")
             
+            # Extragem audio-ul și metadatele în fundal, ca job-urile să le găsească gata
+            audio_artifacts.start_extraction(file_path)
+            media_probes.start_probe(file_path)
+            
             return jsonify({
                 'message': 'File uploaded successfully',
                 'file_id': unique_id,
                 'filename': unique_filename,
                 'path': file_path,
+                'audio_status': audio_artifacts.status(file_path),
                 'task_id': task_id
             }), 200
             
@@ -355,15 +718,24 @@ def upload_file():
 
 @app.route('/api/generate-subtitles', methods=['POST'])
 def generate_subtitles():
+    """Pune în coadă un job de transcriere și returnează imediat task_id-ul."""
     data = request.json
     filename = data.get('filename')
     style = data.get('style', {})
     requested_model = data.get('model', current_model_name)  # Model solicitat din frontend
-    
-    # FIX #8: Folosim maxLines din configurare
-    max_lines = style.get('maxLines', 2)
-    # FIX #9: Nu mai folosim maxWordsPerLine - se calculează automat
-    max_width_percent = style.get('maxWidth', 50)  # Crescut la 70% pentru mai mult spați
+    # Modul de transcriere: explicit ('mode') sau prin flag-urile 'chunked'/'batched'
+    transcription_mode = data.get('mode')
+    if transcription_mode not in TRANSCRIPTION_MODES:
+        if data.get('batched', BATCHED_INFERENCE):
+            transcription_mode = 'batched'
+        elif data.get('chunked', CHUNKED_TRANSCRIPTION):
+            transcription_mode = 'chunked'
+        else:
+            transcription_mode = 'standard'
+    use_vad = bool(data.get('vad', VAD_ENABLED))  # Eliminarea zonelor fără vorbire înainte de Whisper
+    # În modul standard, segmentele parțiale se publică doar la cerere (transcriere pe bucăți succesive)
+    use_stream = bool(data.get('stream', False))
+    engine_name = data.get('engine') or TRANSCRIPTION_ENGINE
     
     # Create a unique task ID for transcription
     task_id = str(uuid.uuid4())
@@ -379,91 +751,134 @@ def generate_subtitles():
         update_task_status(task_id, "error", 0, "Fișierul nu a fost găsit")
         return jsonify({'error': 'File not found', 'task_id': task_id}), 404
     
+    engine = transcription_engines.get(engine_name)
+    if engine is None or not engine.is_available():
+        update_task_status(task_id, "error", 0, f"Motorul de transcriere {engine_name} nu este disponibil")
+        return jsonify({'error': f'Transcription engine "{engine_name}" not available', 'task_id': task_id}), 400
+    if engine_name != 'whisper':
+        # Celelalte motoare publică segmentele incremental, fără chunked/batched
+        transcription_mode = 'standard'
+    
     try:
-        # Verificăm dacă trebuie să schimbăm modelul
-        model_to_use = current_model
-        if requested_model and requested_model != current_model_name:
-            update_task_status(task_id, "processing", 5, f"Încărcare model {requested_model.upper()}")
-            try:
-                model_to_use = load_whisper_model(requested_model)
-                print(f"Switched to model: {requested_model} for this transcription")
-            except Exception as e:
-                print(f"Failed to switch to {requested_model}, using current model {current_model_name}: {str(e)}")
-                model_to_use = current_model
+        segment_streams.open(task_id)
+        cancellations.create(task_id)
+        memory_mb, resident_memory = estimate_transcription_job_memory_mb(
+            requested_model, engine_name, media_probes.duration(file_path), transcription_mode)
+        position = job_queue.submit(task_id, cancellations.run, run_transcription_job, filename, file_path,
+                                    style, requested_model, transcription_mode, use_vad, use_stream, engine_name,
+                                    priority=requested_priority(data, PRIORITY_NORMAL), memory_mb=memory_mb,
+                                    resident_memory=resident_memory, kind='transcription')
+    except QueueFullError:
+        cancellations.discard(task_id)
+        update_task_status(task_id, "error", 0, "Prea multe transcrieri în așteptare")
+        return jsonify({'error': 'Too many queued transcriptions, try again later', 'task_id': task_id}), 503
+    
+    update_task_status(task_id, "queued", 0, f"Transcriere în așteptare (poziția {position} în coadă)")
+    
+    return jsonify({
+        'message': 'Transcription queued',
+        'task_id': task_id,
+        'queue_position': position,
+        'status_url': f'/api/status/{task_id}',
+        'stream_url': f'/api/stream/{task_id}',
+        'result_url': f'/api/result/{task_id}'
+    }), 202
+
+def run_transcription_job(task_id, filename, file_path, style, requested_model, transcription_mode='standard',
+                          use_vad=False, use_stream=False, engine_name='whisper'):
+    """
+    Execută transcrierea unui fișier (rulează într-un worker al cozii).
+
+    Returns:
+        dict: Rezultatul final (subtitrările formatate și modelul folosit)
+    """
+    # FIX #8: Folosim maxLines din configurare
+    max_lines = style.get('maxLines', 2)
+    # FIX #9: Nu mai folosim maxWordsPerLine - se calculează automat
+    max_width_percent = style.get('maxWidth', 50)  # Crescut la 70% pentru mai mult spați
+    
+    if not model_ready.is_set():
+        update_task_status(task_id, "queued", 0, "Se așteaptă încărcarea modelului Whisper")
+        model_ready.wait()
+    
+    update_task_status(task_id, "processing", 1, "Transcriere pornită")
+    
+    try:
+        # Alegem modelul pentru această cerere; modelul implicit nu se schimbă
+        model_name = requested_model if requested_model in AVAILABLE_MODELS else current_model_name
         
         # Verificăm dacă avem un model disponibil
-        if model_to_use is None:
-            update_task_status(task_id, "error", 0, "Nu s-a putut încărca modelul Whisper")
-            return jsonify({'error': 'No Whisper model available', 'task_id': task_id}), 500
+        if model_name is None:
+            raise RuntimeError("No Whisper model available")
         
-        # Extract audio from video
-        update_task_status(task_id, "processing", 10, "Extragere audio din video")
-        audio_path = os.path.join(tempfile.gettempdir(), f"{os.path.splitext(filename)[0]}.wav")
+        # Audio-ul extras la încărcare este refolosit; așteptăm extragerea dacă încă rulează
+        if audio_artifacts.status(file_path) != 'ready':
+            update_task_status(task_id, "processing", 10, "Extragere audio din video")
+        audio_path = audio_artifacts.ensure(file_path)
         
-        try:
-            subprocess.run([
-                'ffmpeg', '-i', file_path, '-vn', '-acodec', 'pcm_s16le', 
-                '-ar', '16000', '-ac', '1', audio_path
-            ], check=True)
-        except subprocess.CalledProcessError as e:
-            update_task_status(task_id, "error", 10, f"Eroare la extragerea audio: {str(e)}")
-            return jsonify({'error': f'Failed to extract audio: {str(e)}', 'task_id': task_id}), 500
-        
-        update_task_status(task_id, "processing", 30, f"Audio extras. Transcriere cu model {current_model_name.upper()}...")
-        
-        # Transcribe audio cu modelul curent - PĂSTREAZĂ INFORMAȚIILE DE TIMING WORD-LEVEL
-        print(f"Transcribing audio: {audio_path} with model: {current_model_name}")
-        
-        update_task_status(task_id, "transcribing", 40, f"Procesare audio cu {current_model_name.upper()}...")
-        
-        result = model_to_use.transcribe(
-            audio_path, 
-            language='ro', 
-            fp16=False, 
-            verbose=True,  # Pentru a obține informații detaliate
-            word_timestamps=True  # CRITICAL: Obține timing-ul pentru fiecare cuvânt
-        )
+        # Căutăm rezultatul brut în cache (același audio, model și opțiuni)
+        audio_hash = audio_artifacts.get_audio_hash(file_path)
+        # Decodarea pe ferestre independente (batched), pe bucăți paralele (chunked) sau pe bucăți
+        # succesive (stream) poate da alt text decât un singur apel transcribe
+        decoding = None
+        if transcription_mode == 'batched':
+            decoding = 'windowed'
+        elif transcription_mode == 'chunked':
+            # Lungimea bucăților rezultă din durata audio (fixată de hash), numărul de workeri și limite
+            decoding = f"chunked:{CHUNK_WORKERS}w:{MIN_CHUNK_SECONDS:g}-{MAX_CHUNK_SECONDS:g}s"
+        elif transcription_mode == 'standard' and use_stream and engine_name == 'whisper':
+            decoding = 'sequential'
+        # Motorul implicit nu apare în cheie, ca intrările existente să rămână valide
+        cache_engine = engine_name if engine_name != 'whisper' else None
+
+        cached_entry = transcription_cache.get(make_cache_key(audio_hash, model_name, 'ro', True, vad=use_vad,
+                                                              decoding=decoding, engine=cache_engine))
+        from_cache = cached_entry is not None
         
-        update_task_status(task_id, "processing", 90, "Transcriere finalizată. Generare subtitrări...")
-        
-        # Pregătim subtitrările inițiale din rezultatul Whisper CU WORD TIMESTAMPS
-        raw_subtitles = []
-        for segment in result['segments']:
-            # Păstrăm informațiile de timing pentru cuvinte dacă sunt disponibile
-            words_with_timing = []
-            if 'words' in segment and segment['words']:
-                for word_info in segment['words']:
-                    words_with_timing.append({
-                        'word': word_info.get('word', '').strip(),
-                        'start': word_info.get('start', segment['start']),
-                        'end': word_info.get('end', segment['end'])
-                    })
+        if from_cache:
+            print(f"Transcription cache hit for {filename} with model {model_name}")
+            update_task_status(task_id, "processing", 90, "Transcriere găsită în cache. Generare subtitrări...")
+            raw_subtitles = cached_entry['subtitles']
+            vad_stats = cached_entry.get('vad')
+            segment_streams.publish(task_id, raw_subtitles)
+        elif engine_name != 'whisper':
+            # Motoarele alternative își încarcă singure modelele (alt format decât checkpoint-urile PyTorch)
+            update_task_status(task_id, "processing", 30, f"Transcriere cu {engine_name} ({model_name.upper()})...")
+            result = transcribe_audio(task_id, audio_path, model_name, transcription_mode, use_vad, use_stream,
+                                      engine_name, audio_hash=audio_hash)
+        else:
+            # Modelul se încarcă doar dacă trebuie rulat Whisper
+            if not model_pool.is_loaded(model_name):
+                update_task_status(task_id, "processing", 20, f"Încărcare model {model_name.upper()}")
+            try:
+                model_name = load_whisper_model(model_name)
+            except Exception as e:
+                print(f"Failed to load {model_name}, using current model {current_model_name}: {str(e)}")
+                if current_model_name is None:
+                    raise RuntimeError("No Whisper model available")
+                model_name = current_model_name
+            
+            update_task_status(task_id, "processing", 30, f"Audio extras. Transcriere cu model {model_name.upper()}...")
+            
+            result = transcribe_audio(task_id, audio_path, model_name, transcription_mode, use_vad, use_stream,
+                                      audio_hash=audio_hash)
+        
+        if not from_cache:
+            vad_stats = result.get('vad')
+            if vad_stats:
+                vad_stats['measured_rtf'] = (round(result['transcription_time'] / vad_stats['total_seconds'], 3)
+                                             if vad_stats['total_seconds'] else None)
             
-            subtitle_data = {
-                'start': segment['start'],
-                'end': segment['end'],
-                'text': segment['text'].strip(),
-                'words': words_with_timing  # ADĂUGĂM INFORMAȚIILE DE TIMING PENTRU CUVINTE
-            }
-            raw_subtitles.append(subtitle_data)
+            update_task_status(task_id, "processing", 90, "Transcriere finalizată. Generare subtitrări...")
+            
+            raw_subtitles = segments_to_raw_subtitles(result['segments'])
+            transcription_cache.put(make_cache_key(audio_hash, model_name, 'ro', True, vad=use_vad,
+                                                   decoding=decoding, engine=cache_engine),
+                                    raw_subtitles, model=model_name, engine=engine_name, language='ro', vad=vad_stats)
         
         # FIX #8 & #9: Folosim noile funcții cu calculare automată
         # Obținem dimensiunile video pentru calcul precis
-        try:
-            probe_cmd = [
-                'ffprobe', '-v', 'error', '-select_streams', 'v:0',
-                '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0',
-                file_path
-            ]
-            video_dimensions = subprocess.check_output(probe_cmd, universal_newlines=True).strip()
-            if 'x' in video_dimensions:
-                video_width, video_height = map(int, video_dimensions.split('x'))
-                print(f"Video dimensions for subtitle calculation: {video_width}x{video_height}")
-            else:
-                video_width = 1920  # Default
-        except Exception as e:
-            print(f"Could not determine video dimensions, using default: {e}")
-            video_width = 1920
+        video_width = media_probes.dimensions(file_path)[0]
 
          # Importăm noile funcții
         from subtitles_utils import format_srt_with_auto_lines
@@ -496,24 +911,400 @@ def generate_subtitles():
                     update_task_status(task_id, "generating_subtitles", progress, 
                                       f"Generare subtitrări: {i}/{len(formatted_subtitles)}")
         
-        # Clean up temporary files
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
-        
-        update_task_status(task_id, "completed", 100, f"Subtitrări generate cu succes folosind {current_model_name.upper()}")
+        update_task_status(task_id, "completed", 100, f"Subtitrări generate cu succes folosind {model_name.upper()}")
+        segment_streams.finish(task_id)
         
-        return jsonify({
+        return {
             'message': 'Subtitles generated successfully',
             'subtitle_path': subtitle_path,
             'subtitles': formatted_subtitles,
-            'model_used': current_model_name,
+            'model_used': model_name,
+            'from_cache': from_cache,
+            'transcription_mode': transcription_mode,
+            'engine': engine_name,
+            'vad': vad_stats,
             'task_id': task_id
-        }), 200
+        }
+    
+    except TaskCancelledError:
+        update_task_status(task_id, "cancelled", 0, "Transcriere anulată")
+        segment_streams.finish(task_id, error='cancelled')
+        raise
     
     except Exception as e:
         print(f"Error generating subtitles: {str(e)}")
         update_task_status(task_id, "error", 0, f"Eroare la generarea subtitrărilor: {str(e)}")
-        return jsonify({'error': f'Failed to generate subtitles: {str(e)}', 'task_id': task_id}), 500
+        segment_streams.finish(task_id, error=str(e))
+        raise
+
+def estimate_transcription_job_memory_mb(model_name, engine_name, duration_seconds, transcription_mode='standard'):
+    """
+    Vârful de memorie estimat al unei transcrieri, pentru admiterea în coadă.
+
+    Returns:
+        tuple: (memoria estimată în MB, funcția `resident_memory` pentru coadă: greutățile
+            modelului cât timp acesta este în pool, deci numărate deja în memoria de bază)
+    """
+    model_name = model_name if model_name in AVAILABLE_MODELS else (current_model_name or 'base')
+    engine = transcription_engines[engine_name]
+    pool_name = engine.pool_model_name(model_name)
+    model_memory_mb = engine.model_pool.model_report(pool_name)['memory_mb']
+    if transcription_mode == 'chunked':
+        # Workerii de transcriere pe bucăți își încarcă propriile modele, în afara pool-ului
+        return estimate_transcription_memory_mb(model_memory_mb, duration_seconds, CHUNK_WORKERS), None
+
+    def resident_memory():
+        return model_memory_mb if engine.model_pool.is_loaded(pool_name) else 0.0
+
+    return estimate_transcription_memory_mb(model_memory_mb, duration_seconds), resident_memory
+
+def requested_priority(data, default):
+    """Prioritatea cerută de client ('high'/'normal'/'low') sau cea implicită a tipului de job."""
+    return PRIORITIES.get(data.get('priority'), default)
+
+def transcribe_audio(task_id, audio_path, model_name, transcription_mode='standard', use_vad=False, use_stream=False,
+                     engine_name='whisper', audio_hash=None):
+    """
+    Rulează Whisper pe fișierul audio și returnează rezultatul brut (segments cu words).
+
+    Segmentele terminate sunt publicate în stream-ul task-ului pe măsură ce apar
+    (în modul standard doar dacă `use_stream` este activ sau motorul le produce incremental).
+    Cu `audio_hash`, modurile batched și standard (motorul whisper) citesc mel-ul din
+    MelCache în loc să îl recalculeze; stream și chunked lucrează pe bucăți și îl calculează per bucată.
+    """
+    # Transcribe audio cu modelul ales - PĂSTREAZĂ INFORMAȚIILE DE TIMING WORD-LEVEL
+    print(f"Transcribing audio: {audio_path} with model: {model_name}")
+    
+    audio = audio_path
+    timeline = None
+    if use_vad:
+        # Eliminăm zonele fără vorbire; Whisper primește doar audio-ul compactat
+        update_task_status(task_id, "processing", 35, "Detectare zone cu vorbire (VAD)")
+        timeline = build_speech_timeline(load_wav_pcm(audio_path))
+        audio = timeline.audio
+        vad_stats = timeline.stats()
+        print(f"VAD: kept {vad_stats['speech_seconds']}s of {vad_stats['total_seconds']}s "
+              f"({vad_stats['speech_spans']} spans, skipped {vad_stats['skipped_percent']}%)")
+        if timeline.speech_seconds == 0:
+            return {'text': '', 'segments': [], 'language': 'ro', 'vad': vad_stats, 'transcription_time': 0.0}
+    
+    def publish_segments(segments):
+        # Copiem segmentele: rezultatul final este remapat separat după transcriere
+        segments = copy.deepcopy(segments)
+        if timeline is not None:
+            timeline.remap_segments(segments)
+        segment_streams.publish(task_id, segments_to_raw_subtitles(segments))
+    
+    def load_cached_mel(audio_samples):
+        if not audio_hash:
+            return None
+        # Același mel servește toate modelele cu același n_mels (audio-ul compactat are cheia lui)
+        update_task_status(task_id, "transcribing", 40, "Pregătire spectrogramă (cache mel)")
+        return mel_cache.get_or_compute(
+            audio_hash,
+            audio_samples,
+            model_pool.get(model_name).dims.n_mels,
+            variant=f"vad:{timeline.fingerprint()}" if timeline is not None else None
+        )
+    
+    start_time = time.time()
+    
+    with resource_manager.allocate(task_id, 'transcription') as cpu_allocation:
+        # Thread-urile torch ale acestui job (și afinitatea) rămân în bugetul alocat
+        cpu_allocation.apply_to_current_thread()
+        update_task_status(task_id, "transcribing", 40,
+                           f"Procesare audio cu {model_name.upper()} ({cpu_allocation.threads} thread-uri)")
+        
+        if engine_name != 'whisper':
+            result = transcription_engines[engine_name].transcribe(
+                audio,
+                model_name,
+                segment_callback=publish_segments,
+                language='ro',
+                word_timestamps=True
+            )
+        elif transcription_mode == 'batched':
+            def report_window_progress(done, total):
+                update_task_status(task_id, "transcribing", 40 + int(done / total * 50),
+                                   f"Transcriere: {done}/{total} ferestre")
+        
+            audio_samples = audio if not isinstance(audio, str) else load_wav_pcm(audio)
+            result = batched_transcriber.transcribe(
+                audio_samples,
+                model_name,
+                language='ro',
+                word_timestamps=True,
+                progress_callback=report_window_progress,
+                segment_callback=publish_segments,
+                mel=load_cached_mel(audio_samples)
+            )
+        elif transcription_mode == 'chunked':
+            def report_chunk_progress(done, total):
+                update_task_status(task_id, "transcribing", 40 + int(done / total * 50),
+                                   f"Transcriere paralelă: {done}/{total} bucăți")
+        
+            result = chunked_transcriber.transcribe(
+                audio,
+                model_name,
+                progress_callback=report_chunk_progress,
+                segment_callback=publish_segments,
+                cpu_allocation=cpu_allocation,
+                language='ro',
+                fp16=False,
+                word_timestamps=True
+            )
+        elif use_stream:
+            with model_pool.lease(model_name) as model_to_use:
+                result = transcribe_in_sequence(
+                    model_to_use,
+                    audio,
+                    segment_callback=publish_segments,
+                    language='ro',
+                    fp16=False,
+                    verbose=None,
+                    word_timestamps=True
+                )
+        else:
+            # Eșantioanele citite aici sunt exact cele din care e calculat mel-ul din cache
+            audio_samples = audio if not isinstance(audio, str) else load_wav_pcm(audio)
+            result = transcription_engines['whisper'].transcribe(
+                audio_samples,
+                model_name,
+                segment_callback=publish_segments,
+                mel=load_cached_mel(audio_samples),
+                language='ro', 
+                fp16=False, 
+                verbose=True,  # Pentru a obține informații detaliate
+                word_timestamps=True  # CRITICAL: Obține timing-ul pentru fiecare cuvânt
+            )
+    
+    result['transcription_time'] = round(time.time() - start_time, 2)
+    
+    # RTF-ul se raportează față de durata audio procesată efectiv de model
+    if engine_name == 'whisper':
+        processed_seconds = timeline.speech_seconds if timeline is not None else wav_duration(audio_path)
+        model_pool.record_run(model_name, processed_seconds, result['transcription_time'])
+    
+    if timeline is not None:
+        # Timestamp-urile Whisper sunt relative la audio-ul compactat
+        timeline.remap_segments(result['segments'])
+        result['vad'] = timeline.stats()
+    
+    return result
+
+def segments_to_raw_subtitles(segments):
+    """Convertește segmentele Whisper în subtitrările brute folosite de editor (start/end/text/words)."""
+    # Pregătim subtitrările inițiale din rezultatul Whisper CU WORD TIMESTAMPS
+    raw_subtitles = []
+    for segment in segments:
+        # Păstrăm informațiile de timing pentru cuvinte dacă sunt disponibile
+        words_with_timing = []
+        if 'words' in segment and segment['words']:
+            for word_info in segment['words']:
+                words_with_timing.append({
+                    'word': word_info.get('word', '').strip(),
+                    'start': word_info.get('start', segment['start']),
+                    'end': word_info.get('end', segment['end'])
+                })
+        
+        subtitle_data = {
+            'start': segment['start'],
+            'end': segment['end'],
+            'text': segment['text'].strip(),
+            'words': words_with_timing  # ADĂUGĂM INFORMAȚIILE DE TIMING PENTRU CUVINTE
+        }
+        raw_subtitles.append(subtitle_data)
+    
+    return raw_subtitles
+
+@app.route('/api/tasks/<task_id>', methods=['DELETE'])
+def cancel_task(task_id):
+    """
+    Anulează un task: îl scoate din coadă dacă încă așteaptă, altfel oprește ffmpeg-ul
+    și transcrierea în curs; fișierele temporare ale job-ului sunt șterse. Pentru job-urile
+    din alți workeri gunicorn se lasă o cerere de anulare în store (202).
+    """
+    queue_state, is_local, outcome = cancel_owned_task(task_id)
+    if outcome == 'dequeued':
+        return jsonify({'task_id': task_id, 'cancelled': True, 'previous_state': 'queued'}), 200
+    if outcome == 'cancelling':
+        return jsonify({'task_id': task_id, 'cancelled': True, 'previous_state': queue_state or 'running'}), 202
+    
+    if queue_state in ('queued', 'running') and not is_local:
+        # Job-ul este în coada altui worker gunicorn: doar acela îl poate opri, deci lăsăm o cerere
+        # în store (o aplică în cel mult CANCEL_POLL_SECONDS) și nu scriem noi 'cancelled' peste stările lui
+        task_store.request_cancel(task_id)
+        return jsonify({'task_id': task_id, 'cancelled': True, 'previous_state': queue_state,
+                        'handled_by': 'another worker process'}), 202
+    stored_status = task_store.get_status(task_id)
+    if queue_state is not None or stored_status is not None:
+        return jsonify({'error': 'Task already finished', 'task_id': task_id,
+                        'state': queue_state or stored_status['status']}), 409
+    return jsonify({'error': 'Task ID not found'}), 404
+
+@app.route('/api/result/<task_id>', methods=['GET'])
+def get_task_result(task_id):
+    """Returnează rezultatul unui job din coadă (transcriere sau randare; 202 cât timp încă rulează)."""
+    job = job_queue.get_result(task_id)
+    if job is None:
+        return jsonify({'error': 'Task ID not found'}), 404
+    
+    if job['state'] == 'completed':
+        return jsonify(job['result']), 200
+    if job['state'] == 'error':
+        return jsonify({'error': job['error'], 'task_id': task_id}), 500
+    if job['state'] == 'cancelled':
+        return jsonify({'error': 'Task cancelled', 'task_id': task_id}), 409
+    
+    return jsonify({
+        'task_id': task_id,
+        'state': job['state'],
+        'queue_position': job_queue.queue_position(task_id)
+    }), 202
+
+@app.route('/api/retranscribe', methods=['POST'])
+def retranscribe_ranges():
+    """
+    Pune în coadă re-transcrierea doar a unor intervale de timp (ex: pasaje greșite),
+    opțional cu alt model; subtitrările noi înlocuiesc intervalele în transcrierea trimisă.
+    """
+    data = request.json or {}
+    filename = data.get('filename')
+    subtitles = data.get('subtitles') or []
+    style = data.get('style', {})
+    requested_model = data.get('model', current_model_name)
+    engine_name = data.get('engine') or TRANSCRIPTION_ENGINE
+    
+    if not filename:
+        return jsonify({'error': 'No filename provided'}), 400
+    file_path = os.path.join(UPLOAD_FOLDER, filename)
+    if not os.path.exists(file_path):
+        return jsonify({'error': 'File not found'}), 404
+    
+    try:
+        ranges = merge_ranges(data.get('ranges') or [])
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid ranges: {str(e)}'}), 400
+    if not ranges:
+        return jsonify({'error': 'No time ranges provided'}), 400
+    
+    engine = transcription_engines.get(engine_name)
+    if engine is None or not engine.is_available():
+        return jsonify({'error': f'Transcription engine "{engine_name}" not available'}), 400
+    
+    task_id = str(uuid.uuid4())
+    update_task_status(task_id, "started", 0, "Inițializare re-transcriere")
+    try:
+        cancellations.create(task_id)
+        # Se citește doar audio-ul intervalelor (plus marjele), deci memoria depinde de lungimea lor
+        ranges_seconds = sum(end - start + 2 * RANGE_PADDING_SECONDS for start, end in ranges)
+        memory_mb, resident_memory = estimate_transcription_job_memory_mb(requested_model, engine_name,
+                                                                          ranges_seconds)
+        position = job_queue.submit(task_id, cancellations.run, run_retranscription_job, file_path,
+                                    subtitles, ranges, style, requested_model, engine_name,
+                                    priority=requested_priority(data, PRIORITY_HIGH), memory_mb=memory_mb,
+                                    resident_memory=resident_memory, kind='retranscription')
+    except QueueFullError:
+        cancellations.discard(task_id)
+        update_task_status(task_id, "error", 0, "Prea multe transcrieri în așteptare")
+        return jsonify({'error': 'Too many queued transcriptions, try again later', 'task_id': task_id}), 503
+    
+    update_task_status(task_id, "queued", 0, f"Re-transcriere în așteptare (poziția {position} în coadă)")
+    return jsonify({
+        'message': 'Re-transcription queued',
+        'task_id': task_id,
+        'queue_position': position,
+        'status_url': f'/api/status/{task_id}',
+        'result_url': f'/api/result/{task_id}'
+    }), 202
+
+def run_retranscription_job(task_id, file_path, subtitles, ranges, style, requested_model, engine_name='whisper'):
+    """
+    Re-transcrie intervalele din artefactul audio și le înlocuiește în `subtitles`.
+
+    Se citește doar audio-ul intervalelor (plus o marjă), deci costul depinde de lungimea
+    lor, nu de lungimea fișierului.
+
+    Returns:
+        dict: Subtitrările rezultate și detaliile înlocuirii
+    """
+    if not model_ready.is_set():
+        update_task_status(task_id, "queued", 0, "Se așteaptă încărcarea modelului Whisper")
+        model_ready.wait()
+    
+    try:
+        model_name = requested_model if requested_model in AVAILABLE_MODELS else current_model_name
+        if model_name is None:
+            raise RuntimeError("No Whisper model available")
+        if engine_name == 'whisper':
+            if not model_pool.is_loaded(model_name):
+                update_task_status(task_id, "processing", 5, f"Încărcare model {model_name.upper()}")
+            model_name = load_whisper_model(model_name)
+        
+        update_task_status(task_id, "processing", 10, "Pregătire audio")
+        audio_path = audio_artifacts.ensure(file_path)
+        duration = wav_duration(audio_path)
+        
+        # Înlocuim subtitrări întregi: intervalele se extind până la marginile celor atinse
+        ranges = [(start, min(end, duration)) for start, end in expand_ranges_to_subtitles(ranges, subtitles)
+                  if start < duration]
+        
+        from subtitles_utils import format_srt_with_auto_lines
+        video_width = media_probes.dimensions(file_path)[0]
+        
+        replacements = []
+        start_time = time.time()
+        with resource_manager.allocate(task_id, 'transcription') as cpu_allocation:
+            cpu_allocation.apply_to_current_thread()
+            for index, (start, end) in enumerate(ranges):
+                check_cancelled()
+                update_task_status(task_id, "transcribing", 10 + int(index / len(ranges) * 80),
+                                   f"Re-transcriere interval {index + 1}/{len(ranges)} "
+                                   f"({format_timestamp(start)} - {format_timestamp(end)})")
+                audio, offset = load_wav_range(audio_path, start - RANGE_PADDING_SECONDS, end + RANGE_PADDING_SECONDS)
+                result = transcription_engines[engine_name].transcribe(
+                    audio,
+                    model_name,
+                    language='ro',
+                    fp16=False,
+                    word_timestamps=True,
+                    initial_prompt=context_prompt(subtitles, start)
+                )
+                segments = shift_segments(result['segments'], offset)
+                segments = clip_segments_to_range(segments, start, end)
+                new_subtitles = format_srt_with_auto_lines(
+                    segments_to_raw_subtitles(segments),
+                    max_lines=style.get('maxLines', 2),
+                    max_width_percent=style.get('maxWidth', 50),
+                    video_width=video_width
+                )
+                replacements.append(((start, end), new_subtitles))
+        
+        spliced, removed = splice_subtitles(subtitles, replacements)
+        transcription_time = round(time.time() - start_time, 2)
+        update_task_status(task_id, "completed", 100,
+                           f"{len(ranges)} intervale re-transcrise cu {model_name.upper()} în {transcription_time}s")
+        
+        return {
+            'message': 'Ranges re-transcribed successfully',
+            'subtitles': spliced,
+            'ranges': [{'start': round(start, 3), 'end': round(end, 3)} for start, end in ranges],
+            'removed_subtitles': removed,
+            'added_subtitles': sum(len(new_subtitles) for _, new_subtitles in replacements),
+            'model_used': model_name,
+            'engine': engine_name,
+            'transcription_time': transcription_time,
+            'task_id': task_id
+        }
+    
+    except TaskCancelledError:
+        update_task_status(task_id, "cancelled", 0, "Re-transcriere anulată")
+        raise
+    
+    except Exception as e:
+        print(f"Error re-transcribing ranges: {str(e)}")
+        update_task_status(task_id, "error", 0, f"Eroare la re-transcriere: {str(e)}")
+        raise
 
 def format_timestamp(seconds):
     """Convert seconds to VTT timestamp format."""
@@ -525,10 +1316,23 @@ def format_timestamp(seconds):
 
 @app.route('/api/create-video', methods=['POST'])
 def create_video_with_subtitles():
+    """
+    Pune în coadă randarea video-ului cu subtitrări arse și returnează imediat task_id-ul
+    (poate fi anulată prin DELETE /api/tasks/<task_id>; rezultatul vine prin /api/result).
+    Cu `renditions` (ex: ["1080p", "720p", "vertical"]), toate variantele ies din aceeași
+    decodare, iar rezultatul le listează în 'outputs'.
+    """
     data = request.json
     filename = data.get('filename')
     subtitles = data.get('subtitles', [])
     style = data.get('style', {})
+    parallel = bool(data.get('parallel', PARALLEL_RENDER))  # Randare pe segmente în procese ffmpeg paralele
+    profile_name = data.get('profile') or ENCODING_PROFILE  # draft / balanced / final
+    # 'burn' = subtitrări arse (recodare); 'soft' = pistă de subtitrare adăugată cu -c copy
+    subtitle_mode = data.get('mode', 'burn')
+    soft_container = data.get('container', DEFAULT_SOFT_CONTAINER) if subtitle_mode == 'soft' else None
+    # Mai multe variante (ex: ["1080p", "720p", "vertical"]) randate dintr-o singură decodare
+    renditions = data.get('renditions')
     
     # Create a unique task ID for video processing
     task_id = str(uuid.uuid4())
@@ -545,368 +1349,723 @@ def create_video_with_subtitles():
         return jsonify({'error': 'Video file not found', 'task_id': task_id}), 404
     
     try:
-        # CRITICAL FIX: Transmitem toate opțiunile de stil inclusiv poziționarea EXACTĂ
-        print('=== VIDEO GENERATION DEBUG ===')
-        print('Raw style received from frontend:', json.dumps(style, indent=2))
-        
-        # FIX #6: Extragem informațiile despre dispozitivul mobil
-        is_mobile = style.get('isMobile', False)
-        screen_width = style.get('screenWidth', None)
-        screen_height = style.get('screenHeight', None)
-        
-        print(f'Mobile detection: is_mobile={is_mobile}, screen_width={screen_width}, screen_height={screen_height}')
-        
-        # Validăm și normalizăm stilul primit
-        validated_style = {
-            'fontFamily': style.get('fontFamily', 'Arial'),
-            'fontSize': int(style.get('fontSize', 24)),
-            'fontColor': style.get('fontColor', '#FFFFFF'),
-            'borderColor': style.get('borderColor', '#000000'),
-            'borderWidth': int(style.get('borderWidth', 2)),
-            'position': style.get('position', 'bottom'),
-            'useCustomPosition': bool(style.get('useCustomPosition', False)),
-            'customX': int(style.get('customX', 50)),
-            'customY': int(style.get('customY', 90)),
-            'allCaps': bool(style.get('allCaps', False)),
-            'removePunctuation': bool(style.get('removePunctuation', False)),
-            'useKaraoke': bool(style.get('useKaraoke', False)),
-            'currentWordColor': style.get('currentWordColor', '#FFFF00'),
-            'currentWordBorderColor': style.get('currentWordBorderColor', '#000000'),
-            'highlightMode': style.get('highlightMode', 'none'),  # NEW: Highlight mode support
-            'maxLines': int(style.get('maxLines', 2)),  # FIX #8: Include maxLines
-            'maxWidth': int(style.get('maxWidth', 50)),   # FIX #9: Folosim 70% implicit
-            # CRITICAL FIX: Add maxWordsPerLine parameter
-            'maxWordsPerLine': style.get('maxWordsPerLine', None),  # None = auto-calculation
-            # FIX #6: Adăugăm informații mobile
-            'isMobile': is_mobile,
-            'screenWidth': screen_width,
-            'screenHeight': screen_height
-        }
-        
-        print('Validated and normalized style:', json.dumps(validated_style, indent=2))
-        print('=== END VIDEO GENERATION DEBUG ===\n')
-        
-        # Verificăm dimensiunea video-ului real pentru a face ajustări mai precise
+        profile = get_profile(profile_name)
+    except ValueError as e:
+        update_task_status(task_id, "error", 0, f"Profil de codare necunoscut: {profile_name}")
+        return jsonify({'error': str(e), 'task_id': task_id}), 400
+    if subtitle_mode not in ('burn', 'soft') or (soft_container and soft_container not in SOFT_SUBTITLE_CONTAINERS):
+        update_task_status(task_id, "error", 0, "Mod de subtitrare sau container necunoscut")
+        return jsonify({'error': f"Unknown subtitle mode '{subtitle_mode}' or container '{soft_container}' "
+                                 f"(soft containers: {', '.join(SOFT_SUBTITLE_CONTAINERS)})",
+                        'task_id': task_id}), 400
+    if renditions:
         try:
-            # Obținem dimensiunile video-ului original
-            probe_cmd = [
-                'ffprobe', '-v', 'error', '-select_streams', 'v:0',
-                '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0',
-                input_path
-            ]
-            video_dimensions = subprocess.check_output(probe_cmd, universal_newlines=True).strip()
-            if 'x' in video_dimensions:
-                video_width, video_height = map(int, video_dimensions.split('x'))
-                print(f"Detected video dimensions: {video_width}x{video_height}")
+            if soft_container:
+                raise ValueError("Renditions are only supported with burned-in subtitles (mode 'burn')")
+            renditions = parse_renditions(renditions)
+        except ValueError as e:
+            update_task_status(task_id, "error", 0, f"Variante de randare invalide: {e}")
+            return jsonify({'error': str(e), 'task_id': task_id}), 400
+    
+    try:
+        cancellations.create(task_id)
+        if renditions:
+            source_width, source_height = media_probes.dimensions(input_path)
+            output_sizes = [(geometry['width'], geometry['height']) for geometry in
+                            (rendition_geometry(rendition, source_width, source_height) for rendition in renditions)]
+            memory_mb = estimate_renditions_memory_mb(source_width, source_height, output_sizes)
+        elif soft_container:
+            # Doar copiere de stream-uri: fără decodare, memoria nu depinde de rezoluție
+            memory_mb = estimate_render_memory_mb(0, 0)
+        else:
+            memory_mb = estimate_render_memory_mb(*media_probes.dimensions(input_path),
+                                                  workers=RENDER_SEGMENTS if parallel else 1)
+        position = job_queue.submit(task_id, cancellations.run, run_render_job, filename, input_path, subtitles,
+                                    style, parallel, profile, soft_container, None, renditions,
+                                    priority=requested_priority(data, PRIORITY_LOW), memory_mb=memory_mb,
+                                    kind='render')
+    except QueueFullError:
+        cancellations.discard(task_id)
+        update_task_status(task_id, "error", 0, "Prea multe job-uri în așteptare")
+        return jsonify({'error': 'Too many queued jobs, try again later', 'task_id': task_id}), 503
+    
+    update_task_status(task_id, "queued", 0, f"Randare în așteptare (poziția {position} în coadă)")
+    return jsonify({
+        'message': 'Video rendering queued',
+        'task_id': task_id,
+        'queue_position': position,
+        'status_url': f'/api/status/{task_id}',
+        'result_url': f'/api/result/{task_id}'
+    }), 202
+
+@app.route('/api/preview', methods=['POST'])
+def preview_video_window():
+    """
+    Pune în coadă (cu prioritate mare) randarea unei ferestre scurte din video, pentru verificarea
+    stilului: `center` + `duration` (implicit 5 s), la calitate draft. Cu `start`/`end` și
+    `profile: 'final'`, același drum exportă un clip de calitate finală din interval.
+    """
+    data = request.json or {}
+    filename = data.get('filename')
+    subtitles = data.get('subtitles') or []
+    style = data.get('style', {})
+    profile_name = data.get('profile') or 'draft'
+    
+    if not filename:
+        return jsonify({'error': 'No filename provided'}), 400
+    input_path = os.path.join(UPLOAD_FOLDER, filename)
+    if not os.path.exists(input_path):
+        return jsonify({'error': 'Video file not found'}), 404
+    
+    try:
+        profile = get_profile(profile_name)
+        window = preview_window(data.get('center'), data.get('duration'), data.get('start'), data.get('end'),
+                                media_duration=media_probes.duration(input_path))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    task_id = str(uuid.uuid4())
+    update_task_status(task_id, "started", 0, "Inițializare previzualizare")
+    try:
+        cancellations.create(task_id)
+        memory_mb = estimate_render_memory_mb(*media_probes.dimensions(input_path))
+        position = job_queue.submit(task_id, cancellations.run, run_render_job, filename, input_path, subtitles,
+                                    style, False, profile, None, window,
+                                    priority=requested_priority(data, PRIORITY_HIGH), memory_mb=memory_mb,
+                                    kind='preview')
+    except QueueFullError:
+        cancellations.discard(task_id)
+        update_task_status(task_id, "error", 0, "Prea multe job-uri în așteptare")
+        return jsonify({'error': 'Too many queued jobs, try again later', 'task_id': task_id}), 503
+    
+    update_task_status(task_id, "queued", 0, f"Previzualizare în așteptare (poziția {position} în coadă)")
+    return jsonify({
+        'message': 'Preview queued',
+        'task_id': task_id,
+        'queue_position': position,
+        'window': {'start': round(window[0], 3), 'end': round(window[1], 3)},
+        'profile': profile['name'],
+        'status_url': f'/api/status/{task_id}',
+        'result_url': f'/api/result/{task_id}'
+    }), 202
+
+def run_render_job(task_id, filename, input_path, subtitles, style, parallel=False, profile=None,
+                   soft_container=None, window=None, renditions=None):
+    """
+    Randează video-ul cu subtitrări (rulează într-un worker al cozii).
+
+    Returns:
+        dict: Numele și calea fișierului generat
+    """
+    try:
+        return render_video_with_subtitles(task_id, filename, input_path, subtitles, style, parallel, profile,
+                                           soft_container, window, renditions)
+    
+    except TaskCancelledError as e:
+        print(f"Video processing cancelled: {str(e)}")
+        update_task_status(task_id, "cancelled", 0, "Procesare video anulată")
+        raise
+    
+    except Exception as e:
+        print(f"Error creating video with subtitles: {str(e)}")
+        update_task_status(task_id, "error", 0, f"Eroare la crearea videoclipului: {str(e)}")
+        raise
+
+def render_video_with_subtitles(task_id, filename, input_path, subtitles, style, parallel=False, profile=None,
+                                soft_container=None, window=None, renditions=None):
+    """
+    Generează fișierul ASS și arde subtitrările în video cu ffmpeg.
+
+    Cu `parallel`, video-ul este tăiat la cadre cheie în segmente codate simultan
+    (câte un ffmpeg pe o parte din nucleele job-ului) și apoi concatenat fără recodare.
+    `profile` (din `get_profile`) alege preset-ul, CRF-ul, rezoluția, thread-urile și audio-ul.
+    Cu `soft_container` ('mkv'/'mp4'), subtitrările nu sunt arse: sunt adăugate ca pistă separată,
+    iar video-ul și audio-ul sunt copiate fără recodare.
+    Cu `window` (start, end), se randează doar intervalul (previzualizare sau clip), cu
+    subtitrările care îl ating mutate la începutul lui.
+    Cu `renditions` (din `parse_renditions`), se randează mai multe variante dintr-o singură
+    decodare (vezi `render_renditions_with_subtitles`).
+
+    Rulează cu token-ul de anulare al task-ului activ: procesul ffmpeg și fișierele
+    temporare sunt înregistrate pe token, deci anularea îl oprește și curăță fișierele.
+
+    Returns:
+        dict: Numele și calea fișierului generat
+    """
+    # CRITICAL FIX: Transmitem toate opțiunile de stil inclusiv poziționarea EXACTĂ
+    print('=== VIDEO GENERATION DEBUG ===')
+    print('Raw style received from frontend:', json.dumps(style, indent=2))
+    
+    # FIX #6: Extragem informațiile despre dispozitivul mobil
+    is_mobile = style.get('isMobile', False)
+    screen_width = style.get('screenWidth', None)
+    screen_height = style.get('screenHeight', None)
+    
+    print(f'Mobile detection: is_mobile={is_mobile}, screen_width={screen_width}, screen_height={screen_height}')
+    
+    # Validăm și normalizăm stilul primit
+    validated_style = {
+        'fontFamily': style.get('fontFamily', 'Arial'),
+        'fontSize': int(style.get('fontSize', 24)),
+        'fontColor': style.get('fontColor', '#FFFFFF'),
+        'borderColor': style.get('borderColor', '#000000'),
+        'borderWidth': int(style.get('borderWidth', 2)),
+        'position': style.get('position', 'bottom'),
+        'useCustomPosition': bool(style.get('useCustomPosition', False)),
+        'customX': int(style.get('customX', 50)),
+        'customY': int(style.get('customY', 90)),
+        'allCaps': bool(style.get('allCaps', False)),
+        'removePunctuation': bool(style.get('removePunctuation', False)),
+        'useKaraoke': bool(style.get('useKaraoke', False)),
+        'currentWordColor': style.get('currentWordColor', '#FFFF00'),
+        'currentWordBorderColor': style.get('currentWordBorderColor', '#000000'),
+        'highlightMode': style.get('highlightMode', 'none'),  # NEW: Highlight mode support
+        'maxLines': int(style.get('maxLines', 2)),  # FIX #8: Include maxLines
+        'maxWidth': int(style.get('maxWidth', 50)),   # FIX #9: Folosim 70% implicit
+        # CRITICAL FIX: Add maxWordsPerLine parameter
+        'maxWordsPerLine': style.get('maxWordsPerLine', None),  # None = auto-calculation
+        # FIX #6: Adăugăm informații mobile
+        'isMobile': is_mobile,
+        'screenWidth': screen_width,
+        'screenHeight': screen_height
+    }
+    
+    print('Validated and normalized style:', json.dumps(validated_style, indent=2))
+    print('=== END VIDEO GENERATION DEBUG ===\n')
+    
+    # Verificăm dimensiunea video-ului real pentru a face ajustări mai precise
+    video_width, video_height = media_probes.dimensions(input_path)
+    
+    if renditions:
+        return render_renditions_with_subtitles(task_id, filename, input_path, subtitles, validated_style,
+                                                renditions, profile, (video_width, video_height))
+    
+    # Generate a unique ID for the output file
+    unique_id = str(uuid.uuid4())[:8]
+    base_name = os.path.splitext(filename)[0]
+    if window:
+        # Previzualizare/clip: doar subtitrările din fereastră, cu timpii relativi la începutul ei
+        subtitles = window_subtitles(subtitles, *window)
+        parallel = False
+        output_filename = f"{base_name}_preview_{int(window[0])}s_{unique_id}.mp4"
+    else:
+        output_filename = f"{base_name}_subtitled_{unique_id}.{soft_container or 'mp4'}"
+    output_path = os.path.join(PROCESSED_FOLDER, output_filename)
+    
+    # Fișierele temporare (și output-ul parțial) sunt șterse la final sau la anulare
+    cancel_token = current_token()
+    file_base = os.path.join(tempfile.gettempdir(), f"{base_name}_{unique_id}")
+    temp_srt_path, ass_path = write_subtitle_files(task_id, subtitles, validated_style, video_width, file_base)
+    
+    # Aceeași sursă, același ASS și aceleași setări ffmpeg: refolosim video-ul randat anterior
+    profile = profile or get_profile(ENCODING_PROFILE)
+    if soft_container:
+        render_options = {'soft_container': soft_container}
+    else:
+        render_options = {'profile': cache_options(profile), 'parallel': parallel, 'window': window}
+    render_key = make_render_key(input_path, ass_path, render_options)
+    cached_render = render_cache.get(render_key)
+    if cached_render is not None:
+        print(f"Render cache hit for {filename}: {cached_render['output_filename']}")
+        update_task_status(task_id, "completed", 100, "Video cu subtitrări găsit în cache")
+        return {
+            'message': 'Video with subtitles created successfully',
+            'output_filename': cached_render['output_filename'],
+            'output_path': os.path.join(PROCESSED_FOLDER, cached_render['output_filename']),
+            'from_cache': True,
+            'profile': profile['name'],
+            'task_id': task_id
+        }
+    
+    # Folosim filtrul 'ass' direct
+    vf_filter = f"ass={ass_path}:fontsdir=/usr/share/fonts"
+    
+    render_start = time.time()
+    if soft_container:
+        # Pista ASS păstrează stilurile (mkv); mp4 acceptă doar text (mov_text din SRT-ul formatat)
+        update_task_status(task_id, "processing", 40, f"Adăugare pistă de subtitrare ({soft_container}, fără recodare)")
+        cancel_token.register_file(output_path)
+        subtitle_format = SOFT_SUBTITLE_CONTAINERS[soft_container]['subtitle_format']
+        mux_subtitles(input_path, ass_path if subtitle_format == 'ass' else temp_srt_path, output_path,
+                      soft_container, cancel_token)
+        cancel_token.release_file(output_path)
+        render_time = time.time() - render_start
+        render_cache.put(render_key, output_filename, source=filename, soft_container=soft_container,
+                         render_time=round(render_time, 2))
+        update_task_status(task_id, "completed", 100, "Video cu pistă de subtitrare creat cu succes")
+        return {
+            'message': 'Video with subtitle track created successfully',
+            'output_filename': output_filename,
+            'output_path': output_path,
+            'from_cache': False,
+            'soft_container': soft_container,
+            'render_time': round(render_time, 2),
+            'task_id': task_id
+        }
+    
+    # Randarea primește și ea un buget de nuclee, ca să nu concureze cu transcrierile active
+    with resource_manager.allocate(task_id, 'render') as cpu_allocation:
+        cancel_token.register_file(output_path)
+        render_threads = thread_count(profile, cpu_allocation.threads)
+        segments = []
+        parallel_fallback = None
+        if parallel and render_threads < 2:
+            parallel_fallback = f"only {render_threads} thread available for this job"
+        elif parallel:
+            try:
+                segments = plan_segments(media_probes.keyframes(input_path), media_probes.duration(input_path),
+                                         min(RENDER_SEGMENTS, render_threads))
+            except Exception as e:
+                parallel_fallback = f"could not plan segments: {e}"
             else:
-                # Valori default dacă nu putem determina dimensiunile
-                video_width, video_height = 1280, 720
-        except Exception as e:
-            print(f"Could not determine video dimensions: {str(e)}")
-            # Valori default
-            video_width, video_height = 1280, 720
-        
-        # Generate a unique ID for the output file
-        unique_id = str(uuid.uuid4())[:8]
-        base_name = os.path.splitext(filename)[0]
-        output_filename = f"{base_name}_subtitled_{unique_id}.mp4"
-        output_path = os.path.join(PROCESSED_FOLDER, output_filename)
-        
-        update_task_status(task_id, "processing", 10, "Creare fișier temporar de subtitrări")
+                if len(segments) < 2:
+                    parallel_fallback = "not enough keyframes to split the video"
+        if parallel_fallback:
+            # Randarea paralelă a fost cerută explicit: spunem de ce rulează un singur ffmpeg
+            print(f"Parallel render requested for {filename}, using a single FFmpeg process: {parallel_fallback}")
         
-        # Extragem parametrii de stil din stilul validat
-        # FIX #8 & #9: Folosim noile funcții cu calculare automată
-        max_lines = validated_style['maxLines']
-        max_width = validated_style['maxWidth']
-        
-        # Importăm noile funcții
-        from subtitles_utils import format_srt_with_auto_lines
-        
-        # Aplicăm formatarea automată pentru video final
-        formatted_subtitles = format_srt_with_auto_lines(
-            subtitles, 
-            max_lines=max_lines,
-            max_width_percent=max_width,
-            video_width=video_width
-        )
-        
-        # DEBUG: Verificăm primele 3 subtitrări formatate
-        print("DEBUG: Checking first 3 formatted subtitles:")
-        for i, sub in enumerate(formatted_subtitles[:3]):
-            newline_char = '\n'
-            print(f"  Subtitle {i+1}: '{sub['text']}' (contains \\n: {newline_char in sub['text']})")
-        
-        # Create a temporary SRT file with the subtitles
-        temp_srt_path = os.path.join(tempfile.gettempdir(), f"{base_name}_{unique_id}.srt")
-        
-        with open(temp_srt_path, 'w', encoding='utf-8') as srt_file:
-            for i, sub in enumerate(formatted_subtitles, 1):
-                start_time = format_srt_timestamp(sub['start'])
-                end_time = format_srt_timestamp(sub['end'])
-                
-                # Procesează textul conform opțiunilor de stil (ALL CAPS, eliminare punctuație, formatare pe linii)
-                from custom_position import process_text_with_options
-                text = process_text_with_options(sub['text'].strip(), validated_style)
-                
-                srt_file.write(f"{i}\n")
-                srt_file.write(f"{start_time} --> {end_time}\n")
-                srt_file.write(f"{text}\n\n")
-                
-                # Actualizăm progresul pentru fiecare 10% din subtitrări procesate
-                if i % max(1, len(subtitles) // 10) == 0:
-                    progress = 10 + int((i / len(subtitles)) * 20)
-                    update_task_status(task_id, "creating_subtitles", progress, 
-                                     f"Creare fișier subtitrări: {i}/{len(subtitles)}")
-        
-        # Extract style parameters din stilul validat
-        font_family = validated_style['fontFamily']
-        base_font_size = validated_style['fontSize']
-        
-        # FIX #6: Ajustăm dimensiunea fontului pentru video cu tratament special pentru mobil
-        font_size = adjust_font_size_for_video(
-            base_font_size, 
-            video_width, 
-            1920, 
-            is_mobile=is_mobile,
-            screen_width=screen_width
-        )
+        if len(segments) > 1:
+            update_task_status(task_id, "processing", 40,
+                               f"Procesare video în paralel ({profile['name']}): {len(segments)} segmente "
+                               f"({render_threads} thread-uri)")
+            
+            def report_segment_progress(telemetry):
+                report_encode_progress(task_id, telemetry, f"{len(segments)} segmente")
+            
+            scale = scale_filter(profile)
+            render_segments_parallel(input_path, output_path, ass_path, segments, cpu_allocation, cancel_token,
+                                     encoder_args=video_args(profile), audio_args=audio_args(profile),
+                                     extra_filters=[scale] if scale else None,
+                                     progress_callback=report_segment_progress, max_threads=render_threads)
+        else:
+            burn_subtitles_single_pass(task_id, input_path, output_path, vf_filter, cpu_allocation, cancel_token,
+                                       profile, window)
+    
+    # Fișierele temporare SRT/ASS sunt șterse la ieșirea din job; output-ul rămâne
+    cancel_token.release_file(output_path)
+    render_time = time.time() - render_start
+    render_cache.put(render_key, output_filename, source=filename, parallel=parallel, profile=profile['name'],
+                     render_time=round(render_time, 2))
+    media_seconds = window[1] - window[0] if window else media_probes.duration(input_path)
+    profile_stats.record(profile['name'], media_seconds, render_time)
+    
+    update_task_status(task_id, "completed", 100, "Video cu subtitrări creat cu succes")
+    
+    return {
+        'message': 'Video with subtitles created successfully',
+        'output_filename': output_filename,
+        'output_path': output_path,
+        'from_cache': False,
+        'profile': profile['name'],
+        'parallel': len(segments) > 1,
+        'parallel_fallback': parallel_fallback,
+        'render_time': round(render_time, 2),
+        'task_id': task_id
+    }
+
+def render_renditions_with_subtitles(task_id, filename, input_path, subtitles, validated_style, renditions,
+                                     profile, source_size):
+    """
+    Randează mai multe variante (rezoluții, decupări) dintr-o singură decodare a sursei.
+
+    Fiecare variantă are propriul ASS: PlayRes, împărțirea pe linii și fontul sunt calculate pentru
+    geometria ei (ex: 1080x1920 la vertical), nu pentru 1920x1080. Variantele găsite în cache-ul
+    de randări nu se mai codează; celelalte ies din același proces ffmpeg. Geometria vine din
+    variantă, deci `max_height` al profilului nu se aplică.
+
+    Returns:
+        dict: Variantele generate ('outputs'); 'output_filename' este prima variantă
+    """
+    profile = profile or get_profile(ENCODING_PROFILE)
+    cancel_token = current_token()
+    unique_id = str(uuid.uuid4())[:8]
+    base_name = os.path.splitext(filename)[0]
+    
+    update_task_status(task_id, "processing", 10, f"Creare subtitrări pentru {len(renditions)} variante")
+    branches = []
+    for rendition in renditions:
+        geometry = rendition_geometry(rendition, *source_size)
+        label = secure_filename(rendition['name']) or f"{geometry['height']}p"
+        file_base = os.path.join(tempfile.gettempdir(), f"{base_name}_{unique_id}_{label}")
+        _, ass_path = write_subtitle_files(task_id, subtitles, validated_style, geometry['width'], file_base,
+                                           play_res=(geometry['width'], geometry['height']))
+        render_key = make_render_key(input_path, ass_path, {'profile': cache_options(profile), 'rendition': geometry})
+        output_filename = f"{base_name}_subtitled_{label}_{unique_id}.mp4"
+        branches.append(dict(
+            geometry,
+            name=rendition['name'],
+            ass_path=ass_path,
+            output_filename=output_filename,
+            output_path=os.path.join(PROCESSED_FOLDER, output_filename),
+            render_key=render_key,
+            cached=render_cache.get(render_key)
+        ))
+    
+    pending = [branch for branch in branches if branch['cached'] is None]
+    render_start = time.time()
+    if pending:
+        duration = media_probes.duration(input_path)
+        update_task_status(task_id, "processing", 40,
+                           f"Randare {len(pending)} variante dintr-o singură decodare ({profile['name']})")
         
-        print(f"Font size adjusted from {base_font_size} to {font_size} for video width {video_width}px "
-              f"(mobile: {is_mobile}, screen: {screen_width}px)")
+        def report_progress(telemetry):
+            report_encode_progress(task_id, telemetry, f"{len(pending)} variante")
         
-        font_color = validated_style['fontColor']
-        border_color = validated_style['borderColor']
-        border_width = validated_style['borderWidth']
-        position = validated_style['position']
-        use_custom_position = validated_style['useCustomPosition']
-        custom_x = validated_style['customX']
-        custom_y = validated_style['customY']
+        with resource_manager.allocate(task_id, 'render') as cpu_allocation:
+            render_renditions(input_path, pending, cpu_allocation, cancel_token, video_args(profile),
+                              audio_args(profile), thread_count(profile, cpu_allocation.threads),
+                              duration=duration, progress_callback=report_progress)
+        for branch in pending:
+            render_cache.put(branch['render_key'], branch['output_filename'], source=filename,
+                             rendition=branch['name'], profile=profile['name'],
+                             render_time=round(time.time() - render_start, 2))
+    render_time = time.time() - render_start
+    
+    outputs = []
+    for branch in branches:
+        output_filename = branch['cached']['output_filename'] if branch['cached'] else branch['output_filename']
+        outputs.append({
+            'name': branch['name'],
+            'width': branch['width'],
+            'height': branch['height'],
+            'output_filename': output_filename,
+            'from_cache': branch['cached'] is not None
+        })
+    
+    update_task_status(task_id, "completed", 100, f"{len(outputs)} variante cu subtitrări create cu succes")
+    return {
+        'message': 'Video renditions created successfully',
+        'output_filename': outputs[0]['output_filename'],
+        'output_path': os.path.join(PROCESSED_FOLDER, outputs[0]['output_filename']),
+        'outputs': outputs,
+        'from_cache': not pending,
+        'profile': profile['name'],
+        'render_time': round(render_time, 2),
+        'task_id': task_id
+    }
 
-        # Asigură-te că culorile sunt în format corect (cu # în față)
-        if font_color and not font_color.startswith('#'):
-            font_color = '#' + font_color
-            
-        if border_color and not border_color.startswith('#'):
-            border_color = '#' + border_color
+def write_subtitle_files(task_id, subtitles, validated_style, video_width, file_base, play_res=(1920, 1080)):
+    """
+    Formatează subtitrările pentru lățimea video-ului și scrie fișierele SRT și ASS.
 
-        # Extragem parametrii pentru cuvântul curent
-        current_word_color = validated_style['currentWordColor']
-        if current_word_color and not current_word_color.startswith('#'):
-            current_word_color = '#' + current_word_color
+    Args:
+        validated_style (dict): Stilul normalizat din `render_video_with_subtitles`
+        video_width (int): Lățimea cadrului pe care se ard subtitrările (împărțirea pe linii, fontul)
+        file_base (str): Calea fișierelor fără extensie (se adaugă .srt și .ass)
+        play_res (tuple): Rezoluția de referință a ASS (PlayResX, PlayResY)
+
+    Returns:
+        tuple: (calea SRT, calea ASS), înregistrate pe token-ul de anulare al task-ului
+    """
+    is_mobile = validated_style['isMobile']
+    screen_width = validated_style['screenWidth']
+    
+    update_task_status(task_id, "processing", 10, "Creare fișier temporar de subtitrări")
+    
+    # Extragem parametrii de stil din stilul validat
+    # FIX #8 & #9: Folosim noile funcții cu calculare automată
+    max_lines = validated_style['maxLines']
+    max_width = validated_style['maxWidth']
+    
+    # Importăm noile funcții
+    from subtitles_utils import format_srt_with_auto_lines
+    
+    # Aplicăm formatarea automată pentru video final
+    formatted_subtitles = format_srt_with_auto_lines(
+        subtitles, 
+        max_lines=max_lines,
+        max_width_percent=max_width,
+        video_width=video_width
+    )
+    
+    # DEBUG: Verificăm primele 3 subtitrări formatate
+    print("DEBUG: Checking first 3 formatted subtitles:")
+    for i, sub in enumerate(formatted_subtitles[:3]):
+        newline_char = '\n'
+        print(f"  Subtitle {i+1}: '{sub['text']}' (contains \\n: {newline_char in sub['text']})")
+    
+    # Fișierele temporare sunt șterse la finalul job-ului sau la anulare
+    cancel_token = current_token()
+    
+    # Create a temporary SRT file with the subtitles
+    temp_srt_path = f"{file_base}.srt"
+    cancel_token.register_file(temp_srt_path)
+    
+    with open(temp_srt_path, 'w', encoding='utf-8') as srt_file:
+        for i, sub in enumerate(formatted_subtitles, 1):
+            start_time = format_srt_timestamp(sub['start'])
+            end_time = format_srt_timestamp(sub['end'])
             
-        current_word_border_color = validated_style['currentWordBorderColor']
-        if current_word_border_color and not current_word_border_color.startswith('#'):
-            current_word_border_color = '#' + current_word_border_color
+            # Procesează textul conform opțiunilor de stil (ALL CAPS, eliminare punctuație, formatare pe linii)
+            from custom_position import process_text_with_options
+            text = process_text_with_options(sub['text'].strip(), validated_style)
             
-        # Activăm sau dezactivăm karaoke (evidențierea cuvântului curent)
-        use_karaoke = validated_style['useKaraoke']
-        
-        # NEW: Extragem modul de evidențiere
-        highlight_mode = validated_style.get('highlightMode', 'none')
-
-        # Log pentru debugging
-        print(f"Applying subtitle style: font={font_family}, size={font_size}, color={font_color}, border={border_color}, width={border_width}")
-        print(f"Position: {'custom' if use_custom_position else position}, X={custom_x}, Y={custom_y}")
-        print(f"Word highlighting: {use_karaoke}, current word color: {current_word_color}, highlight mode: {highlight_mode}")
-        print(f"Mobile optimizations: is_mobile={is_mobile}, screen_width={screen_width}")
-
-        update_task_status(task_id, "processing", 30, "Aplicare subtitrări cu stil personalizat")
-        
-        # Create ASS file with precise word highlighting
-        ass_path = os.path.join(tempfile.gettempdir(), f"{base_name}_{unique_id}.ass")
-        
-        print("Using formatted subtitles with auto-calculated word distribution")
-        
-        # Alegem metoda potrivită pentru karaoke
-        if use_custom_position:
-            if use_karaoke:
-                create_precise_word_highlighting_ass(
-                    temp_srt_path,
-                    ass_path,
-                    {
-                        'fontFamily': font_family,
-                        'fontSize': font_size,
-                        'fontColor': font_color,
-                        'borderColor': border_color,
-                        'borderWidth': border_width,
-                        'useCustomPosition': use_custom_position,
-                        'customX': custom_x,
-                        'customY': custom_y,
-                        'currentWordColor': current_word_color,
-                        'currentWordBorderColor': current_word_border_color,
-                        'highlightMode': highlight_mode,  # NEW: Add highlight mode
-                        'allCaps': validated_style['allCaps'],
-                        'removePunctuation': validated_style['removePunctuation'],
-                        'useKaraoke': True,
-                        'textAlign': 2,
-                        # CRITICAL FIX: Add line formatting parameters
-                        'maxLines': validated_style['maxLines'],
-                        'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
-                        'videoWidth': video_width,
-                        # FIX #6: Transmitem informații mobile
-                        'isMobile': is_mobile,
-                        'screenWidth': screen_width
-                    },
-                    formatted_subtitles
-                )
-            else:
-                create_ass_file_with_custom_position(
-                    temp_srt_path,
-                    ass_path,
-                    {
-                        'fontFamily': font_family,
-                        'fontSize': font_size,
-                        'fontColor': font_color,
-                        'borderColor': border_color,
-                        'borderWidth': border_width,
-                        'useCustomPosition': use_custom_position,
-                        'customX': custom_x,
-                        'customY': custom_y,
-                        'allCaps': validated_style['allCaps'],
-                        'removePunctuation': validated_style['removePunctuation'],
-                        # CRITICAL FIX: Add line formatting parameters
-                        'maxLines': validated_style['maxLines'],
-                        'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
-                        'videoWidth': video_width,
-                        # FIX #6: Transmitem informații mobile
-                        'isMobile': is_mobile,
-                        'screenWidth': screen_width
-                    },
-                    formatted_subtitles
-                )
-        else:
-            if use_karaoke:
-                create_precise_word_highlighting_ass(
-                    temp_srt_path,
-                    ass_path,
-                    {
-                        'fontFamily': font_family,
-                        'fontSize': font_size,
-                        'fontColor': font_color,
-                        'borderColor': border_color,
-                        'borderWidth': border_width,
-                        'position': position,
-                        'currentWordColor': current_word_color,
-                        'currentWordBorderColor': current_word_border_color,
-                        'highlightMode': highlight_mode,  # NEW: Add highlight mode
-                        'allCaps': validated_style['allCaps'],
-                        'removePunctuation': validated_style['removePunctuation'],
-                        'useKaraoke': True,
-                        # CRITICAL FIX: Add line formatting parameters
-                        'maxLines': validated_style['maxLines'],
-                        'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
-                        'videoWidth': video_width,
-                        # FIX #6: Transmitem informații mobile
-                        'isMobile': is_mobile,
-                        'screenWidth': screen_width
-                    },
-                    formatted_subtitles
-                )
-            else:
-                create_ass_file_with_custom_position(
-                    temp_srt_path,
-                    ass_path,
-                    {
-                        'fontFamily': font_family,
-                        'fontSize': font_size,
-                        'fontColor': font_color,
-                        'borderColor': border_color,
-                        'borderWidth': border_width,
-                        'position': position,
-                        'allCaps': validated_style['allCaps'],
-                        'removePunctuation': validated_style['removePunctuation'],
-                        # CRITICAL FIX: Add line formatting parameters
-                        'maxLines': validated_style['maxLines'],
-                        'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
-                        'videoWidth': video_width,
-                        # FIX #6: Transmitem informații mobile
-                        'isMobile': is_mobile,
-                        'screenWidth': screen_width
-                    },
-                    formatted_subtitles
-                )
-        
-        print(f"Created ASS file at {ass_path}")
-        
-        # Folosim filtrul 'ass' direct
-        vf_filter = f"ass={ass_path}:fontsdir=/usr/share/fonts"
-        
-        # Create the FFmpeg command for adding styled subtitles
-        ffmpeg_cmd = [
-            'ffmpeg', '-i', input_path,
-            '-vf', vf_filter,
-            '-c:a', 'copy',
-            '-preset', 'fast',
-            output_path
-        ]
-        
-        update_task_status(task_id, "processing", 40, "Procesare video cu FFmpeg")
-        
-        # Set up process to capture progress
-        process = subprocess.Popen(
-            ffmpeg_cmd, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            universal_newlines=True
-        )
-        
-        # Procesăm outputul pentru a extrage progresul
-        last_progress_time = time.time()
-        
-        # Citim stderr-ul pentru a vedea progresul FFmpeg
-        for line in process.stderr:
-            if "time=" in line and time.time() - last_progress_time > 0.5:
-                # Extragem timpul curent din output-ul ffmpeg
-                time_match = line.split("time=")[1].split()[0]
-                if ":" in time_match:
-                    # Convertim formatul HH:MM:SS.MS în secunde
-                    h, m, s = time_match.split(":")
-                    current_time = int(h) * 3600 + int(m) * 60 + float(s)
-                    
-                    # Obținem durata totală a video-ului (dacă e disponibilă)
-                    duration = 0
-                    if "Duration:" in line:
-                        duration_str = line.split("Duration:")[1].split(",")[0].strip()
-                        h, m, s = duration_str.split(":")
-                        duration = int(h) * 3600 + int(m) * 60 + float(s)
-                    
-                    # Calculăm progresul (între 40% și 95%)
-                    if duration > 0:
-                        progress = 40 + int((current_time / duration) * 55)
-                        update_task_status(task_id, "encoding", progress, 
-                                         f"Procesare video: {time_match}/{duration_str}")
-                    
-                    last_progress_time = time.time()
-        
-        # Așteptăm finalizarea procesului
-        process.wait()
-        
-        # Verificăm dacă procesul s-a încheiat cu succes
-        if process.returncode != 0:
-            error_message = "Eroare la procesarea video cu FFmpeg"
-            update_task_status(task_id, "error", 0, error_message)
-            return jsonify({'error': error_message, 'task_id': task_id}), 500
-        
-        # Clean up temporary files
-        if os.path.exists(temp_srt_path):
-            os.remove(temp_srt_path)
+            srt_file.write(f"{i}\n")
+            srt_file.write(f"{start_time} --> {end_time}\n")
+            srt_file.write(f"{text}\n\n")
             
-        if os.path.exists(ass_path):
-            os.remove(ass_path)
+            # Actualizăm progresul pentru fiecare 10% din subtitrări procesate
+            if i % max(1, len(subtitles) // 10) == 0:
+                progress = 10 + int((i / len(subtitles)) * 20)
+                update_task_status(task_id, "creating_subtitles", progress, 
+                                 f"Creare fișier subtitrări: {i}/{len(subtitles)}")
+    
+    # Extract style parameters din stilul validat
+    font_family = validated_style['fontFamily']
+    base_font_size = validated_style['fontSize']
+    
+    # FIX #6: Ajustăm dimensiunea fontului pentru video cu tratament special pentru mobil
+    font_size = adjust_font_size_for_video(
+        base_font_size, 
+        video_width, 
+        1920, 
+        is_mobile=is_mobile,
+        screen_width=screen_width
+    )
+    
+    print(f"Font size adjusted from {base_font_size} to {font_size} for video width {video_width}px "
+          f"(mobile: {is_mobile}, screen: {screen_width}px)")
+    
+    font_color = validated_style['fontColor']
+    border_color = validated_style['borderColor']
+    border_width = validated_style['borderWidth']
+    position = validated_style['position']
+    use_custom_position = validated_style['useCustomPosition']
+    custom_x = validated_style['customX']
+    custom_y = validated_style['customY']
+
+    # Asigură-te că culorile sunt în format corect (cu # în față)
+    if font_color and not font_color.startswith('#'):
+        font_color = '#' + font_color
         
-        update_task_status(task_id, "completed", 100, "Video cu subtitrări creat cu succes")
+    if border_color and not border_color.startswith('#'):
+        border_color = '#' + border_color
+
+    # Extragem parametrii pentru cuvântul curent
+    current_word_color = validated_style['currentWordColor']
+    if current_word_color and not current_word_color.startswith('#'):
+        current_word_color = '#' + current_word_color
         
-        return jsonify({
-            'message': 'Video with subtitles created successfully',
-            'output_filename': output_filename,
-            'output_path': output_path,
-            'task_id': task_id
-        }), 200
+    current_word_border_color = validated_style['currentWordBorderColor']
+    if current_word_border_color and not current_word_border_color.startswith('#'):
+        current_word_border_color = '#' + current_word_border_color
+        
+    # Activăm sau dezactivăm karaoke (evidențierea cuvântului curent)
+    use_karaoke = validated_style['useKaraoke']
     
-    except Exception as e:
-        print(f"Error creating video with subtitles: {str(e)}")
-        update_task_status(task_id, "error", 0, f"Eroare la crearea videoclipului: {str(e)}")
-        return jsonify({'error': f'Failed to create video: {str(e)}', 'task_id': task_id}), 500
+    # NEW: Extragem modul de evidențiere
+    highlight_mode = validated_style.get('highlightMode', 'none')
+
+    # Log pentru debugging
+    print(f"Applying subtitle style: font={font_family}, size={font_size}, color={font_color}, border={border_color}, width={border_width}")
+    print(f"Position: {'custom' if use_custom_position else position}, X={custom_x}, Y={custom_y}")
+    print(f"Word highlighting: {use_karaoke}, current word color: {current_word_color}, highlight mode: {highlight_mode}")
+    print(f"Mobile optimizations: is_mobile={is_mobile}, screen_width={screen_width}")
+
+    update_task_status(task_id, "processing", 30, "Aplicare subtitrări cu stil personalizat")
+    
+    # Create ASS file with precise word highlighting
+    ass_path = f"{file_base}.ass"
+    cancel_token.register_file(ass_path)
+    
+    print("Using formatted subtitles with auto-calculated word distribution")
+    
+    # Alegem metoda potrivită pentru karaoke
+    if use_custom_position:
+        if use_karaoke:
+            create_precise_word_highlighting_ass(
+                temp_srt_path,
+                ass_path,
+                {
+                    'fontFamily': font_family,
+                    'fontSize': font_size,
+                    'fontColor': font_color,
+                    'borderColor': border_color,
+                    'borderWidth': border_width,
+                    'useCustomPosition': use_custom_position,
+                    'customX': custom_x,
+                    'customY': custom_y,
+                    'currentWordColor': current_word_color,
+                    'currentWordBorderColor': current_word_border_color,
+                    'highlightMode': highlight_mode,  # NEW: Add highlight mode
+                    'allCaps': validated_style['allCaps'],
+                    'removePunctuation': validated_style['removePunctuation'],
+                    'useKaraoke': True,
+                    'textAlign': 2,
+                    # CRITICAL FIX: Add line formatting parameters
+                    'maxLines': validated_style['maxLines'],
+                    'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
+                    'videoWidth': video_width,
+                    'playResX': play_res[0],
+                    'playResY': play_res[1],
+                    # FIX #6: Transmitem informații mobile
+                    'isMobile': is_mobile,
+                    'screenWidth': screen_width
+                },
+                formatted_subtitles
+            )
+        else:
+            create_ass_file_with_custom_position(
+                temp_srt_path,
+                ass_path,
+                {
+                    'fontFamily': font_family,
+                    'fontSize': font_size,
+                    'fontColor': font_color,
+                    'borderColor': border_color,
+                    'borderWidth': border_width,
+                    'useCustomPosition': use_custom_position,
+                    'customX': custom_x,
+                    'customY': custom_y,
+                    'allCaps': validated_style['allCaps'],
+                    'removePunctuation': validated_style['removePunctuation'],
+                    # CRITICAL FIX: Add line formatting parameters
+                    'maxLines': validated_style['maxLines'],
+                    'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
+                    'videoWidth': video_width,
+                    'playResX': play_res[0],
+                    'playResY': play_res[1],
+                    # FIX #6: Transmitem informații mobile
+                    'isMobile': is_mobile,
+                    'screenWidth': screen_width
+                },
+                formatted_subtitles
+            )
+    else:
+        if use_karaoke:
+            create_precise_word_highlighting_ass(
+                temp_srt_path,
+                ass_path,
+                {
+                    'fontFamily': font_family,
+                    'fontSize': font_size,
+                    'fontColor': font_color,
+                    'borderColor': border_color,
+                    'borderWidth': border_width,
+                    'position': position,
+                    'currentWordColor': current_word_color,
+                    'currentWordBorderColor': current_word_border_color,
+                    'highlightMode': highlight_mode,  # NEW: Add highlight mode
+                    'allCaps': validated_style['allCaps'],
+                    'removePunctuation': validated_style['removePunctuation'],
+                    'useKaraoke': True,
+                    # CRITICAL FIX: Add line formatting parameters
+                    'maxLines': validated_style['maxLines'],
+                    'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
+                    'videoWidth': video_width,
+                    'playResX': play_res[0],
+                    'playResY': play_res[1],
+                    # FIX #6: Transmitem informații mobile
+                    'isMobile': is_mobile,
+                    'screenWidth': screen_width
+                },
+                formatted_subtitles
+            )
+        else:
+            create_ass_file_with_custom_position(
+                temp_srt_path,
+                ass_path,
+                {
+                    'fontFamily': font_family,
+                    'fontSize': font_size,
+                    'fontColor': font_color,
+                    'borderColor': border_color,
+                    'borderWidth': border_width,
+                    'position': position,
+                    'allCaps': validated_style['allCaps'],
+                    'removePunctuation': validated_style['removePunctuation'],
+                    # CRITICAL FIX: Add line formatting parameters
+                    'maxLines': validated_style['maxLines'],
+                    'maxWordsPerLine': validated_style.get('maxWordsPerLine'),
+                    'videoWidth': video_width,
+                    'playResX': play_res[0],
+                    'playResY': play_res[1],
+                    # FIX #6: Transmitem informații mobile
+                    'isMobile': is_mobile,
+                    'screenWidth': screen_width
+                },
+                formatted_subtitles
+            )
+    
+    print(f"Created ASS file at {ass_path}")
+    
+    return temp_srt_path, ass_path
+
+def burn_subtitles_single_pass(task_id, input_path, output_path, vf_filter, cpu_allocation, cancel_token, profile,
+                               window=None):
+    """
+    Arde subtitrările cu un singur proces ffmpeg peste tot video-ul (sau doar peste `window`),
+    cu setările profilului de codare.
+
+    Cu `-ss` înaintea lui `-i` seek-ul este precis (se decodează de la cadrul cheie anterior,
+    cadrele dinainte sunt aruncate), iar timpii încep de la 0, ca subtitrările deja mutate.
+
+    Raises:
+        RuntimeError: Dacă ffmpeg eșuează
+    """
+    # Scalarea profilului se aplică după subtitrări, ca poziționarea să rămână cea calculată pe sursă
+    scale = scale_filter(profile)
+    if scale:
+        vf_filter = f"{vf_filter},{scale}"
+    render_threads = thread_count(profile, cpu_allocation.threads)
+    
+    window_args = ['-ss', f"{window[0]:.3f}", '-t', f"{window[1] - window[0]:.3f}"] if window else []
+    
+    # Create the FFmpeg command for adding styled subtitles
+    ffmpeg_cmd = [
+        'ffmpeg', *window_args, '-i', input_path,
+        '-vf', vf_filter,
+        *audio_args(profile),
+        *video_args(profile),
+        '-threads', str(render_threads),
+        output_path
+    ]
+
+    update_task_status(task_id, "processing", 40,
+                       f"Procesare video cu FFmpeg ({profile['name']}, {render_threads} thread-uri)")
+
+    # Progresul vine pe stdout (-progress pipe:1), ca perechi cheie=valoare
+    process = subprocess.Popen(
+        with_progress(ffmpeg_cmd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    cpu_allocation.apply_to_process(process.pid)
+    cancel_token.register_process(process)
+
+    # Durata vine din record-ul de metadate (sau este lungimea ferestrei), pentru procent și ETA
+    duration = window[1] - window[0] if window else media_probes.duration(input_path)
+    
+    def report_progress(tracker):
+        report_encode_progress(task_id, tracker.snapshot())
+    
+    stderr_tail = follow_progress(process, cancel_token, EncodeProgress(duration), report_progress)
+    cancel_token.unregister_process(process)
+    
+    # Verificăm dacă procesul s-a încheiat cu succes
+    if process.returncode != 0:
+        check_cancelled()  # ffmpeg oprit de anulare sau de watchdog
+        print(f"FFmpeg error: {stderr_tail}")
+        raise RuntimeError("Eroare la procesarea video cu FFmpeg")
+
+def report_encode_progress(task_id, telemetry, detail=None):
+    """
+    Publică progresul codării (40-95%) și telemetria ffmpeg (timp codat, fps, viteză,
+    bitrate, cadre pierdute, ETA) în statusul task-ului.
+    """
+    progress = 40 + int((telemetry['percent'] or 0) * 0.55)
+    message = f"Procesare video: {format_timestamp(telemetry['out_time'])}"
+    if telemetry['duration']:
+        message += f"/{format_timestamp(telemetry['duration'])}"
+    if telemetry['speed']:
+        message += f" ({telemetry['speed']}x"
+        if telemetry['eta_seconds'] is not None:
+            message += f", ~{int(telemetry['eta_seconds'])}s rămase"
+        message += ")"
+    if detail:
+        message += f" [{detail}]"
+    update_task_status(task_id, "encoding", progress, message, encode=telemetry)
 
 def format_srt_timestamp(seconds):
     """Convert seconds to SRT timestamp format."""
@@ -926,6 +2085,17 @@ def download_file(filename):
     
     return send_file(file_path, as_attachment=True)
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness: procesul API răspunde (nu depinde de încărcarea modelului)."""
+    return jsonify({'status': 'alive'}), 200
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: modelul implicit este încărcat și încălzit."""
+    ready = model_readiness['state'] == 'ready'
+    return jsonify(dict(model_readiness, ready=ready, queued_jobs=job_queue.stats()['pending'])), 200 if ready else 503
+
 @app.route('/api/test', methods=['GET'])
 def test_connection():
     """Rută simplă pentru testarea conexiunii la backend."""
@@ -935,12 +2105,14 @@ def test_connection():
         'upload_folder': UPLOAD_FOLDER,
         'processed_folder': PROCESSED_FOLDER,
         'current_whisper_model': current_model_name,
+        'model_state': model_readiness['state'],
+        'loaded_models': model_pool.loaded_models(),
         'available_models': list(AVAILABLE_MODELS.keys()),
         'version': '1.0'
     }), 200
 
 if __name__ == '__main__':
     print("Starting Flask server on port 5000...")
-    print(f"Whisper model loaded: {current_model_name}")
+    print(f"Whisper model (loading in background): {current_model_name}")
     print(f"Available models: {list(AVAILABLE_MODELS.keys())}")
     app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
\ No newline at end of file
@@ -0,0 +1,140 @@
+# backend/audio_artifacts.py
+# Audio-ul 16 kHz mono este extras o singură dată, imediat după încărcare, și salvat
+# lângă fișierul încărcat. Toate transcrierile ulterioare citesc acest artefact,
+# deci decodarea ffmpeg nu mai este pe drumul critic al fiecărui job.
+
+import os
+import subprocess
+import threading
+import time
+
+from transcription_cache import hash_audio_pcm
+
+ARTIFACT_SUFFIX = '.audio16k.wav'
+HASH_SUFFIX = '.sha256'
+
+
+def audio_artifact_path(media_path):
+    """Calea artefactului audio asociat unui fișier încărcat."""
+    return f"{os.path.splitext(media_path)[0]}{ARTIFACT_SUFFIX}"
+
+
+def extract_audio(media_path, audio_path):
+    """Extrage audio PCM 16-bit, 16 kHz, mono cu ffmpeg (scriere atomică)."""
+    temp_path = f"{audio_path}.part.wav"
+    try:
+        subprocess.run([
+            'ffmpeg', '-y', '-v', 'error', '-i', media_path, '-vn', '-acodec', 'pcm_s16le',
+            '-ar', '16000', '-ac', '1', temp_path
+        ], check=True)
+        os.replace(temp_path, audio_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class AudioArtifactStore:
+    """
+    Gestionează extragerea audio în fundal și reutilizarea artefactelor.
+
+    Job-urile care cer un artefact aflat încă în extragere așteaptă finalizarea
+    ei în loc să pornească o a doua decodare.
+    """
+
+    def __init__(self, max_parallel_extractions=2):
+        self._lock = threading.Lock()
+        self._in_progress = {}  # media_path -> threading.Event
+        self._errors = {}
+        self._semaphore = threading.BoundedSemaphore(max_parallel_extractions)
+        self._stats = {'extractions': 0, 'reuses': 0, 'failures': 0, 'total_extraction_time': 0.0}
+
+    def start_extraction(self, media_path):
+        """Pornește extragerea în fundal (dacă artefactul nu există și nu e deja în lucru)."""
+        with self._lock:
+            if media_path in self._in_progress or os.path.exists(audio_artifact_path(media_path)):
+                return
+            done_event = threading.Event()
+            self._in_progress[media_path] = done_event
+            self._errors.pop(media_path, None)
+
+        thread = threading.Thread(target=self._extract, args=(media_path, done_event), daemon=True)
+        thread.start()
+
+    def _extract(self, media_path, done_event):
+        audio_path = audio_artifact_path(media_path)
+        try:
+            with self._semaphore:
+                start_time = time.time()
+                print(f"Audio artifact: extracting {os.path.basename(media_path)}")
+                extract_audio(media_path, audio_path)
+                # Hash-ul PCM este calculat acum, o singură dată, pentru cache-ul de transcrieri
+                with open(f"{audio_path}{HASH_SUFFIX}", 'w') as hash_file:
+                    hash_file.write(hash_audio_pcm(audio_path))
+                elapsed = time.time() - start_time
+            with self._lock:
+                self._stats['extractions'] += 1
+                self._stats['total_extraction_time'] += elapsed
+            print(f"Audio artifact: {os.path.basename(audio_path)} ready in {elapsed:.1f}s")
+        except Exception as e:
+            print(f"Audio artifact: extraction failed for {media_path}: {e}")
+            with self._lock:
+                self._errors[media_path] = str(e)
+                self._stats['failures'] += 1
+        finally:
+            with self._lock:
+                self._in_progress.pop(media_path, None)
+            done_event.set()
+
+    def ensure(self, media_path, timeout=None):
+        """
+        Returnează calea artefactului audio, așteptând sau pornind extragerea dacă e nevoie.
+
+        Raises:
+            RuntimeError: Dacă extragerea a eșuat sau nu s-a terminat în `timeout` secunde
+        """
+        audio_path = audio_artifact_path(media_path)
+        with self._lock:
+            done_event = self._in_progress.get(media_path)
+            if done_event is None and os.path.exists(audio_path):
+                self._stats['reuses'] += 1
+                return audio_path
+
+        if done_event is None:
+            self.start_extraction(media_path)
+            with self._lock:
+                done_event = self._in_progress.get(media_path)
+
+        if done_event is not None and not done_event.wait(timeout):
+            raise RuntimeError(f"Audio extraction still running after {timeout}s")
+
+        with self._lock:
+            error = self._errors.get(media_path)
+        if error or not os.path.exists(audio_path):
+            raise RuntimeError(f"Failed to extract audio: {error or 'artifact missing'}")
+        return audio_path
+
+    def get_audio_hash(self, media_path):
+        """Returnează hash-ul PCM al artefactului (din fișierul alăturat sau recalculat)."""
+        audio_path = self.ensure(media_path)
+        hash_path = f"{audio_path}{HASH_SUFFIX}"
+        if os.path.exists(hash_path):
+            with open(hash_path) as hash_file:
+                return hash_file.read().strip()
+        audio_hash = hash_audio_pcm(audio_path)
+        with open(hash_path, 'w') as hash_file:
+            hash_file.write(audio_hash)
+        return audio_hash
+
+    def status(self, media_path):
+        """Starea artefactului: 'ready', 'extracting', 'error' sau 'missing'."""
+        with self._lock:
+            if media_path in self._in_progress:
+                return 'extracting'
+            if media_path in self._errors:
+                return 'error'
+        return 'ready' if os.path.exists(audio_artifact_path(media_path)) else 'missing'
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_progress=len(self._in_progress),
+                        total_extraction_time=round(self._stats['total_extraction_time'], 2))
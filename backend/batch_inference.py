@@ -0,0 +1,325 @@
+# backend/batch_inference.py
+# Micro-batching între cereri: ferestrele mel de 30 de secunde ale tuturor job-urilor
+# active sunt colectate de un server de inferență per model și decodate împreună
+# într-un singur apel `whisper.decode` (encoder + decoder pe batch).
+# Segmentele rezultate sunt returnate job-ului care a trimis fereastra.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from cancellation import TaskCancelledError, check_cancelled
+from chunked_transcription import SAMPLE_RATE, find_silence_split_points, load_wav_pcm
+
+HOP_LENGTH = 160
+N_FRAMES = 3000                 # O fereastră Whisper = 30 s de mel
+TIME_PRECISION = 0.02           # Rezoluția token-urilor de timestamp
+WINDOW_TARGET_SECONDS = 26.0    # Ferestrele sunt tăiate în liniște, sub limita de 30 s
+WINDOW_SEARCH_SECONDS = 3.0
+
+# Aceleași praguri ca în `whisper.transcribe` pentru reîncercarea cu temperatură mai mare
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+class _WindowRequest:
+    def __init__(self, mel, options):
+        self.mel = mel
+        self.options = options
+        self.options_key = tuple(sorted(options.items()))
+        self.future = Future()
+
+
+class BatchingInferenceServer:
+    """
+    Thread care servește un singur model: adună ferestre mel din cererile concurente
+    (cel mult `max_batch`, așteptând cel mult `max_wait_ms`) și le decodează împreună.
+    """
+
+    def __init__(self, model_pool, model_name, max_batch=8, max_wait_ms=50):
+        self.model_pool = model_pool
+        self.model_name = model_name
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'windows': 0, 'max_batch_seen': 0, 'decode_time': 0.0}
+        self._thread = threading.Thread(target=self._serve, name=f"batch-{model_name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, mel, **options):
+        """Trimite o fereastră mel (n_mels x 3000) și returnează un Future cu DecodingResult."""
+        request = _WindowRequest(mel, options)
+        self._queue.put(request)
+        return request.future
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve(self):
+        import torch
+        import whisper
+
+        while True:
+            batch = self._collect_batch()
+            # Doar ferestrele cu aceleași opțiuni de decodare pot merge în același apel
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.options_key, []).append(request)
+
+            for requests in groups.values():
+                # Ferestrele job-urilor anulate (Future anulat) nu mai sunt decodate
+                requests = [request for request in requests if request.future.set_running_or_notify_cancel()]
+                if not requests:
+                    continue
+                try:
+                    start_time = time.time()
+                    with self.model_pool.lease(self.model_name) as model:
+                        mel_batch = torch.stack([request.mel for request in requests]).to(model.device)
+                        results = whisper.decode(model, mel_batch, whisper.DecodingOptions(**requests[0].options))
+                    elapsed = time.time() - start_time
+                except Exception as e:
+                    for request in requests:
+                        request.future.set_exception(e)
+                    continue
+
+                with self._lock:
+                    self._stats['batches'] += 1
+                    self._stats['windows'] += len(requests)
+                    self._stats['max_batch_seen'] = max(self._stats['max_batch_seen'], len(requests))
+                    self._stats['decode_time'] += elapsed
+                for request, result in zip(requests, results):
+                    request.future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            batches = self._stats['batches']
+            return {
+                'model': self.model_name,
+                'batches': batches,
+                'windows': self._stats['windows'],
+                'avg_batch_size': round(self._stats['windows'] / batches, 2) if batches else 0.0,
+                'max_batch_seen': self._stats['max_batch_seen'],
+                'decode_time': round(self._stats['decode_time'], 2),
+                'pending_windows': self._queue.qsize(),
+            }
+
+
+def split_into_windows(audio):
+    """Tăie audio-ul în ferestre de cel mult 30 s, la pauze; returnează intervale de cadre mel."""
+    spans = find_silence_split_points(audio, WINDOW_TARGET_SECONDS, search_seconds=WINDOW_SEARCH_SECONDS)
+    max_samples = N_FRAMES * HOP_LENGTH
+    windows = []
+    for start, end in spans:
+        # Ultima bucată poate depăși 30 s; o împărțim în părți egale
+        parts = int(np.ceil((end - start) / max_samples))
+        edges = np.linspace(start, end, parts + 1).astype(int)
+        windows.extend(zip(edges[:-1], edges[1:]))
+    return [(int(start) // HOP_LENGTH, int(end) // HOP_LENGTH) for start, end in windows if end > start]
+
+
+def tokens_to_segments(tokens, tokenizer, seek, window_frames):
+    """
+    Transformă token-urile unei ferestre în segmente cu timestamp-uri absolute
+    (aceeași logică de tăiere ca în `whisper.transcribe`).
+    """
+    time_offset = seek * HOP_LENGTH / SAMPLE_RATE
+    window_duration = window_frames * HOP_LENGTH / SAMPLE_RATE
+    is_timestamp = [token >= tokenizer.timestamp_begin for token in tokens]
+
+    def make_segment(start, end, segment_tokens):
+        text_tokens = [token for token in segment_tokens if token < tokenizer.eot]
+        return {
+            'seek': seek,
+            'start': round(time_offset + start, 3),
+            'end': round(time_offset + end, 3),
+            'text': tokenizer.decode(text_tokens),
+            'tokens': list(segment_tokens),
+        }
+
+    consecutive = [index + 1 for index in range(len(tokens) - 1) if is_timestamp[index] and is_timestamp[index + 1]]
+    segments = []
+    if consecutive:
+        if is_timestamp[-2:] == [False, True]:
+            consecutive.append(len(tokens))
+        last_slice = 0
+        for current_slice in consecutive:
+            sliced = tokens[last_slice:current_slice]
+            start = (sliced[0] - tokenizer.timestamp_begin) * TIME_PRECISION
+            end = (sliced[-1] - tokenizer.timestamp_begin) * TIME_PRECISION
+            segments.append(make_segment(start, min(end, window_duration), sliced))
+            last_slice = current_slice
+        # Fereastra nu este re-decodată de la ultimul timestamp (ca în transcribe),
+        # așa că textul rămas după ultima pereche de timestamp-uri devine ultimul segment
+        if last_slice < len(tokens):
+            remainder = tokens[last_slice:]
+            start = (remainder[0] - tokenizer.timestamp_begin) * TIME_PRECISION if is_timestamp[last_slice] else 0.0
+            segments.append(make_segment(start, window_duration, remainder))
+    else:
+        duration = window_duration
+        timestamps = [token for token, flag in zip(tokens, is_timestamp) if flag]
+        if timestamps and timestamps[-1] != tokenizer.timestamp_begin:
+            duration = (timestamps[-1] - tokenizer.timestamp_begin) * TIME_PRECISION
+        segments.append(make_segment(0.0, duration, tokens))
+
+    return [segment for segment in segments if segment['text'].strip()]
+
+
+def _mel_window(mel, start, end):
+    """Fereastra [start, end) din mel ca tensor (mel-ul poate fi un memmap din MelCache)."""
+    import torch
+
+    window = mel[:, start:end]
+    if isinstance(window, np.ndarray):
+        window = torch.from_numpy(np.array(window, dtype=np.float32))
+    return window
+
+
+def _needs_fallback(result):
+    if result.compression_ratio is not None and result.compression_ratio > COMPRESSION_RATIO_THRESHOLD:
+        return True
+    return result.avg_logprob is not None and result.avg_logprob < LOGPROB_THRESHOLD
+
+
+class BatchedTranscriber:
+    """
+    Transcriere prin serverele de batching (un server per model, creat la prima cerere).
+
+    Fiecare job calculează mel-ul o singură dată, trimite toate ferestrele sale și
+    primește segmentele înapoi; ferestrele job-urilor concurente se decodează în același batch.
+    """
+
+    def __init__(self, model_pool, max_batch=8, max_wait_ms=50):
+        self.model_pool = model_pool
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._servers = {}
+        self._lock = threading.Lock()
+
+    def get_server(self, model_name):
+        with self._lock:
+            server = self._servers.get(model_name)
+            if server is None:
+                server = BatchingInferenceServer(self.model_pool, model_name, self.max_batch, self.max_wait_ms)
+                self._servers[model_name] = server
+            return server
+
+    def compute_mel(self, audio, model_name):
+        """Log-mel pentru tot fișierul, cu padding de 30 s la final (ca în `whisper.transcribe`)."""
+        import whisper
+
+        model = self.model_pool.get(model_name)
+        return whisper.log_mel_spectrogram(audio, model.dims.n_mels, padding=N_FRAMES * HOP_LENGTH)
+
+    def transcribe(self, audio, model_name, language='ro', word_timestamps=True, progress_callback=None,
+                   segment_callback=None, mel=None, **options):
+        """
+        Transcrie audio-ul prin batching și returnează un rezultat compatibil cu `model.transcribe`.
+
+        Args:
+            audio (str | np.ndarray): Fișier WAV 16 kHz sau eșantioanele audio
+            model_name (str): Modelul folosit
+            language (str): Limba transcrierii
+            word_timestamps (bool): Calculează timing-ul pe cuvinte
+            progress_callback (callable): Apelată cu (ferestre_terminate, total_ferestre)
+            segment_callback (callable): Primește segmentele fiecărei ferestre, în ordine
+            mel (torch.Tensor | np.ndarray): Mel-ul precalculat al fișierului, cu padding-ul de 30 s
+                (opțional; ex: memmap din MelCache)
+        """
+        import whisper
+        from whisper.timing import add_word_timestamps
+
+        if isinstance(audio, str):
+            audio = load_wav_pcm(audio)
+        if mel is None:
+            mel = self.compute_mel(audio, model_name)
+
+        model = self.model_pool.get(model_name)
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages, language=language, task='transcribe'
+        )
+        server = self.get_server(model_name)
+        decode_options = dict(language=language, task='transcribe', fp16=False, without_timestamps=False)
+
+        windows = split_into_windows(audio)
+        window_mels = [whisper.pad_or_trim(_mel_window(mel, start, end), N_FRAMES) for start, end in windows]
+        futures = [server.submit(window_mel, temperature=TEMPERATURES[0], **decode_options) for window_mel in window_mels]
+
+        all_segments = []
+        last_speech_timestamp = 0.0
+        for index, ((start, end), window_mel, future) in enumerate(zip(windows, window_mels, futures), 1):
+            try:
+                check_cancelled()
+            except TaskCancelledError:
+                for pending in futures:
+                    pending.cancel()
+                raise
+            result = future.result()
+            for temperature in TEMPERATURES[1:]:
+                if not _needs_fallback(result):
+                    break
+                check_cancelled()
+                result = server.submit(window_mel, temperature=temperature, **decode_options).result()
+
+            skip_window = (result.no_speech_prob > NO_SPEECH_THRESHOLD
+                           and result.avg_logprob < LOGPROB_THRESHOLD)
+            if not skip_window:
+                segments = tokens_to_segments(result.tokens, tokenizer, start, end - start)
+                if word_timestamps and segments:
+                    # Alinierea pe cuvinte instalează hook-uri pe model, deci rulează sub lease
+                    with self.model_pool.lease(model_name) as leased_model:
+                        add_word_timestamps(
+                            segments=segments,
+                            model=leased_model,
+                            tokenizer=tokenizer,
+                            mel=window_mel,
+                            num_frames=end - start,
+                            last_speech_timestamp=last_speech_timestamp,
+                        )
+                    words = [word for segment in segments for word in segment.get('words', [])]
+                    if words:
+                        last_speech_timestamp = words[-1]['end']
+                for segment in segments:
+                    segment.update(
+                        id=len(all_segments),
+                        temperature=result.temperature,
+                        avg_logprob=result.avg_logprob,
+                        compression_ratio=result.compression_ratio,
+                        no_speech_prob=result.no_speech_prob,
+                    )
+                    all_segments.append(segment)
+                if segment_callback and segments:
+                    segment_callback(segments)
+
+            if progress_callback:
+                progress_callback(index, len(windows))
+
+        return {
+            'text': ''.join(segment['text'] for segment in all_segments),
+            'segments': all_segments,
+            'language': language,
+        }
+
+    def stats(self):
+        with self._lock:
+            servers = list(self._servers.values())
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait_ms,
+            'servers': [server.stats() for server in servers],
+        }
@@ -0,0 +1,184 @@
+# backend/benchmark_engines.py
+# Comparație între motoarele de transcriere pe aceleași fișiere: viteză (RTF) și
+# acordul timing-ului pe cuvinte față de motorul de referință openai-whisper.
+#
+# Utilizare:
+#   python benchmark_engines.py video1.mp4 audio2.wav --model small
+#   python benchmark_engines.py clip.mp4 --engines whisper faster-whisper --json raport.json
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from audio_artifacts import extract_audio
+from chunked_transcription import SAMPLE_RATE, load_wav_pcm
+from engines import create_engines
+from model_pool import ModelPool
+from quantization import load_model_by_name
+
+REFERENCE_ENGINE = 'whisper'
+TIMING_TOLERANCES_MS = (50, 100, 250)
+
+
+def normalize_word(word):
+    """Cuvântul fără punctuație și majuscule, pentru alinierea între motoare."""
+    return re.sub(r'[^\w]', '', word.lower())
+
+
+def collect_words(result):
+    words = []
+    for segment in result['segments']:
+        for word_info in segment.get('words') or []:
+            normalized = normalize_word(word_info['word'])
+            if normalized:
+                words.append((normalized, word_info['start'], word_info['end']))
+    return words
+
+
+def compare_word_timings(reference, candidate):
+    """
+    Aliniază cuvintele celor două transcrieri (după text) și compară timestamp-urile.
+
+    Returns:
+        dict: Procentul de cuvinte potrivite, erorile de start/end și procentul în toleranță
+    """
+    reference_words = collect_words(reference)
+    candidate_words = collect_words(candidate)
+    matcher = difflib.SequenceMatcher(a=[word for word, _, _ in reference_words],
+                                      b=[word for word, _, _ in candidate_words], autojunk=False)
+
+    start_errors = []
+    end_errors = []
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            _, ref_start, ref_end = reference_words[block.a + offset]
+            _, cand_start, cand_end = candidate_words[block.b + offset]
+            start_errors.append(abs(ref_start - cand_start) * 1000)
+            end_errors.append(abs(ref_end - cand_end) * 1000)
+
+    report = {
+        'reference_words': len(reference_words),
+        'candidate_words': len(candidate_words),
+        'matched_words': len(start_errors),
+        'word_match_percent': round(100 * len(start_errors) / len(reference_words), 1) if reference_words else None,
+    }
+    if start_errors:
+        start_errors = np.array(start_errors)
+        end_errors = np.array(end_errors)
+        report.update({
+            'start_error_ms_mean': round(float(start_errors.mean()), 1),
+            'start_error_ms_median': round(float(np.median(start_errors)), 1),
+            'start_error_ms_p95': round(float(np.percentile(start_errors, 95)), 1),
+            'end_error_ms_mean': round(float(end_errors.mean()), 1),
+        })
+        for tolerance in TIMING_TOLERANCES_MS:
+            within = np.mean((start_errors <= tolerance) & (end_errors <= tolerance))
+            report[f'within_{tolerance}ms_percent'] = round(100 * float(within), 1)
+    return report
+
+
+def load_audio(path, work_dir):
+    """Fișierele care nu sunt deja WAV 16 kHz mono sunt convertite cu ffmpeg."""
+    try:
+        return load_wav_pcm(path)
+    except Exception:
+        audio_path = os.path.join(work_dir, f"{os.path.basename(path)}.16k.wav")
+        extract_audio(path, audio_path)
+        return load_wav_pcm(audio_path)
+
+
+def run_benchmark(paths, model_name, engine_names, language='ro'):
+    model_pool = ModelPool(load_model_by_name, memory_budget_mb=float('inf'))
+    engines = create_engines(model_pool, memory_budget_mb=float('inf'))
+    missing = [name for name in engine_names if name not in engines or not engines[name].is_available()]
+    if missing:
+        raise SystemExit(f"Engines not available: {', '.join(missing)}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for path in paths:
+            audio = load_audio(path, work_dir)
+            duration = len(audio) / SAMPLE_RATE
+            results = {}
+            elapsed_by_engine = {}
+            for engine_name in engine_names:
+                engine = engines[engine_name]
+                # Prima rulare doar încarcă modelul și încălzește motorul (nu intră în timpi)
+                engine.transcribe(audio[:SAMPLE_RATE * 5], model_name, language=language, word_timestamps=True, fp16=False)
+
+                start_time = time.time()
+                results[engine_name] = engine.transcribe(audio, model_name, language=language,
+                                                         word_timestamps=True, fp16=False)
+                elapsed = time.time() - start_time
+                elapsed_by_engine[engine_name] = elapsed
+                row = {
+                    'file': os.path.basename(path),
+                    'engine': engine_name,
+                    'model': model_name,
+                    'audio_seconds': round(duration, 1),
+                    'processing_seconds': round(elapsed, 2),
+                    'rtf': round(elapsed / duration, 3) if duration else None,
+                    'segments': len(results[engine_name]['segments']),
+                }
+                if engine_name != REFERENCE_ENGINE:
+                    row['speedup'] = round(elapsed_by_engine[REFERENCE_ENGINE] / elapsed, 2) if elapsed else None
+                    row['timing'] = compare_word_timings(results[REFERENCE_ENGINE], results[engine_name])
+                rows.append(row)
+                print(f"{row['file']} [{engine_name}] {elapsed:.1f}s for {duration:.1f}s audio (RTF {row['rtf']})",
+                      file=sys.stderr)
+    return rows
+
+
+def format_report(rows):
+    """Tabel Markdown cu rezultatele, câte un rând per fișier și motor."""
+    header = ('| Fișier | Motor | Audio (s) | Procesare (s) | RTF | Accelerare | Cuvinte potrivite | '
+              'Eroare start med. (ms) | Eroare start p95 (ms) | În 100 ms |')
+    lines = [header, '|' + '---|' * (header.count('|') - 1)]
+    for row in rows:
+        timing = row.get('timing') or {}
+
+        def cell(value, suffix=''):
+            return '-' if value is None else f"{value}{suffix}"
+
+        lines.append('| ' + ' | '.join([
+            row['file'],
+            row['engine'],
+            cell(row['audio_seconds']),
+            cell(row['processing_seconds']),
+            cell(row['rtf']),
+            cell(row.get('speedup'), 'x'),
+            cell(timing.get('word_match_percent'), '%'),
+            cell(timing.get('start_error_ms_median')),
+            cell(timing.get('start_error_ms_p95')),
+            cell(timing.get('within_100ms_percent'), '%'),
+        ]) + ' |')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compară motoarele de transcriere (viteză și timing pe cuvinte).')
+    parser.add_argument('files', nargs='+', help='Fișiere audio/video de test')
+    parser.add_argument('--model', default='small', help='Modelul folosit de toate motoarele')
+    parser.add_argument('--engines', nargs='+', default=['whisper', 'faster-whisper'],
+                        help='Motoarele comparate (referința whisper este rulată mereu)')
+    parser.add_argument('--language', default='ro')
+    parser.add_argument('--json', dest='json_path', help='Salvează și rezultatele detaliate în JSON')
+    args = parser.parse_args()
+
+    engine_names = [REFERENCE_ENGINE] + [name for name in args.engines if name != REFERENCE_ENGINE]
+    rows = run_benchmark(args.files, args.model, engine_names, args.language)
+    print(format_report(rows))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as json_file:
+            json.dump(rows, json_file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
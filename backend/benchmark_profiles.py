@@ -0,0 +1,155 @@
+# backend/benchmark_profiles.py
+# Măsoară pe acest host viteza fiecărui profil de codare (draft / balanced / final) la arderea
+# subtitrărilor: secunde de video randate pe secundă, dimensiunea și bitrate-ul rezultatului.
+#
+# Utilizare:
+#   python benchmark_profiles.py video.mp4 --seconds 60
+#   python benchmark_profiles.py video.mp4 --ass subtitrari.ass --profiles draft final --json raport.json
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from encoding_profiles import ENCODING_PROFILES, audio_args, get_profile, scale_filter, thread_count, video_args
+from resource_manager import available_cpus
+
+TEST_SUBTITLE_INTERVAL = 2.0
+
+
+def write_test_ass(path, duration, interval=TEST_SUBTITLE_INTERVAL):
+    """Un fișier ASS sintetic cu câte o subtitrare la fiecare `interval` secunde (cost realist al filtrului)."""
+    def timestamp(seconds):
+        hours, remainder = divmod(seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"{int(hours)}:{int(minutes):02d}:{seconds:05.2f}"
+
+    lines = [
+        '[Script Info]',
+        'ScriptType: v4.00+',
+        'PlayResX: 1920',
+        'PlayResY: 1080',
+        '',
+        '[V4+ Styles]',
+        'Format: Name, Fontname, Fontsize, PrimaryColour, OutlineColour, BorderStyle, Outline, Alignment, MarginV',
+        'Style: Default,Arial,64,&H00FFFFFF,&H00000000,1,3,2,60',
+        '',
+        '[Events]',
+        'Format: Layer, Start, End, Style, Text',
+    ]
+    start = 0.0
+    while start < duration:
+        end = min(duration, start + interval)
+        lines.append(f"Dialogue: 0,{timestamp(start)},{timestamp(end)},Default,Subtitrare de test {int(start)}s")
+        start = end
+    with open(path, 'w', encoding='utf-8') as ass_file:
+        ass_file.write('\n'.join(lines) + '\n')
+
+
+def probe_duration(path):
+    output = subprocess.check_output(['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                                      '-of', 'csv=p=0', path], universal_newlines=True)
+    return float(output.strip())
+
+
+def run_benchmark(paths, profile_names, seconds=None, ass_path=None, threads=None):
+    threads = threads or len(available_cpus())
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for path in paths:
+            duration = probe_duration(path)
+            if seconds:
+                duration = min(duration, seconds)
+            subtitles_path = ass_path
+            if subtitles_path is None:
+                subtitles_path = os.path.join(work_dir, 'test.ass')
+                write_test_ass(subtitles_path, duration)
+
+            for profile_name in profile_names:
+                profile = get_profile(profile_name)
+                output_path = os.path.join(work_dir, f"{profile_name}.mp4")
+                vf_filter = f"ass={subtitles_path}:fontsdir=/usr/share/fonts"
+                scale = scale_filter(profile)
+                if scale:
+                    vf_filter = f"{vf_filter},{scale}"
+                render_threads = thread_count(profile, threads)
+                ffmpeg_cmd = [
+                    'ffmpeg', '-y', '-v', 'error',
+                    '-t', f"{duration:.3f}", '-i', path,
+                    '-vf', vf_filter,
+                    *audio_args(profile),
+                    *video_args(profile),
+                    '-threads', str(render_threads),
+                    output_path
+                ]
+                start_time = time.time()
+                subprocess.run(ffmpeg_cmd, check=True)
+                elapsed = time.time() - start_time
+
+                size_bytes = os.path.getsize(output_path)
+                row = {
+                    'file': os.path.basename(path),
+                    'profile': profile_name,
+                    'preset': profile['preset'],
+                    'crf': profile['crf'],
+                    'max_height': profile['max_height'],
+                    'threads': render_threads,
+                    'media_seconds': round(duration, 1),
+                    'render_seconds': round(elapsed, 2),
+                    'speed': round(duration / elapsed, 2) if elapsed else None,
+                    'size_mb': round(size_bytes / (1024 * 1024), 2),
+                    'bitrate_kbps': round(size_bytes * 8 / 1000 / duration) if duration else None,
+                }
+                rows.append(row)
+                print(f"{row['file']} [{profile_name}] {elapsed:.1f}s for {duration:.1f}s video "
+                      f"({row['speed']}x realtime)", file=sys.stderr)
+    return rows
+
+
+def format_report(rows):
+    """Tabel Markdown cu rezultatele, câte un rând per fișier și profil."""
+    header = ('| Fișier | Profil | Preset | CRF | Înălțime max. | Thread-uri | Video (s) | Randare (s) | '
+              'Viteză (x timp real) | Dimensiune (MB) | Bitrate (kbps) |')
+    lines = [header, '|' + '---|' * (header.count('|') - 1)]
+    for row in rows:
+        def cell(value, suffix=''):
+            return '-' if value is None else f"{value}{suffix}"
+
+        lines.append('| ' + ' | '.join([
+            row['file'],
+            row['profile'],
+            row['preset'],
+            cell(row['crf']),
+            cell(row['max_height']),
+            cell(row['threads']),
+            cell(row['media_seconds']),
+            cell(row['render_seconds']),
+            cell(row['speed'], 'x'),
+            cell(row['size_mb']),
+            cell(row['bitrate_kbps']),
+        ]) + ' |')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Măsoară viteza profilelor de codare la arderea subtitrărilor.')
+    parser.add_argument('files', nargs='+', help='Fișiere video de test')
+    parser.add_argument('--profiles', nargs='+', default=list(ENCODING_PROFILES), choices=list(ENCODING_PROFILES))
+    parser.add_argument('--seconds', type=float, help='Randează doar primele N secunde din fiecare fișier')
+    parser.add_argument('--ass', dest='ass_path', help='Fișier ASS real (implicit se generează unul de test)')
+    parser.add_argument('--threads', type=int, help='Bugetul de thread-uri (implicit toate nucleele disponibile)')
+    parser.add_argument('--json', dest='json_path', help='Salvează și rezultatele detaliate în JSON')
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.files, args.profiles, args.seconds, args.ass_path, args.threads)
+    print(format_report(rows))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as json_file:
+            json.dump(rows, json_file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
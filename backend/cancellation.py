@@ -0,0 +1,224 @@
+# backend/cancellation.py
+# Anularea job-urilor în curs: fiecare task are un token care oprește procesele ffmpeg
+# înregistrate, întrerupe transcrierea (verificări între segmente/bucăți și un hook pe
+# decoderul Whisper) și șterge fișierele temporare ale job-ului.
+# Un watchdog anulează job-urile al căror ffmpeg nu mai raportează progres.
+
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+PROCESS_TERMINATE_TIMEOUT = 5.0
+WATCHDOG_INTERVAL_SECONDS = 5.0
+
+# Token-ul job-ului care rulează în thread-ul curent (setat de `CancellationRegistry.activate`)
+_thread_state = threading.local()
+
+
+class TaskCancelledError(Exception):
+    """Job-ul a fost anulat (de utilizator sau de watchdog)."""
+
+
+class CancellationToken:
+    """Starea de anulare a unui task, plus procesele și fișierele temporare care îi aparțin."""
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.reason = None
+        self.last_progress = time.time()
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = []
+        self._files = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelledError(f"Task {self.task_id} cancelled ({self.reason})")
+
+    def cancel(self, reason='user'):
+        """Marchează task-ul ca anulat și oprește imediat procesele externe."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            processes = list(self._processes)
+        print(f"Task {self.task_id}: cancelling ({reason})")
+        for process in processes:
+            terminate_process(process)
+
+    def register_process(self, process):
+        """Asociază un subprocess (ex: ffmpeg) task-ului; este oprit la anulare."""
+        with self._lock:
+            self._processes.append(process)
+            self.last_progress = time.time()
+            cancelled = self._event.is_set()
+        if cancelled:
+            terminate_process(process)
+
+    def unregister_process(self, process):
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+
+    def has_running_process(self):
+        with self._lock:
+            return any(process.poll() is None for process in self._processes)
+
+    def touch(self):
+        """Marchează progres (folosit de watchdog pentru detectarea ffmpeg-ului blocat)."""
+        self.last_progress = time.time()
+
+    def register_file(self, path):
+        """Fișier temporar șters la finalul job-ului (indiferent de rezultat)."""
+        with self._lock:
+            self._files.append(path)
+
+    def release_file(self, path):
+        """Fișierul nu mai este temporar (ex: output-ul final, după succes)."""
+        with self._lock:
+            if path in self._files:
+                self._files.remove(path)
+
+    def cleanup_files(self):
+        with self._lock:
+            files, self._files = self._files, []
+        for path in files:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Task {self.task_id}: could not remove temp file {path}: {e}")
+
+
+def terminate_process(process, timeout=PROCESS_TERMINATE_TIMEOUT):
+    """SIGTERM, apoi SIGKILL dacă procesul nu se oprește în `timeout` secunde."""
+    if process.poll() is not None:
+        return
+    try:
+        process.terminate()
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    except OSError:
+        pass
+
+
+def current_token():
+    """Token-ul job-ului din thread-ul curent (sau None în afara unui job)."""
+    return getattr(_thread_state, 'token', None)
+
+
+def check_cancelled():
+    """Ridică TaskCancelledError dacă job-ul din thread-ul curent a fost anulat."""
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def install_cancellation_hook(model):
+    """
+    Adaugă pe decoderul Whisper un hook care întrerupe decodarea job-ului anulat.
+
+    Hook-ul acționează doar în bucla de decodare (apelurile cu kv_cache); alinierea
+    pe cuvinte instalează propriile hook-uri fără try/finally și nu trebuie întreruptă.
+    `DecodingTask` curăță kv-cache-ul în `finally`, deci modelul rămâne utilizabil.
+    """
+    def check_before_forward(module, args, kwargs):
+        if kwargs.get('kv_cache') is not None:
+            check_cancelled()
+
+    try:
+        model.decoder.register_forward_pre_hook(check_before_forward, with_kwargs=True)
+    except (AttributeError, TypeError) as e:
+        # torch < 2.0 nu suportă with_kwargs: anularea rămâne doar între segmente/bucăți
+        print(f"Cancellation hook not installed: {e}")
+    return model
+
+
+class CancellationRegistry:
+    """Token-urile task-urilor active, indexate după task_id."""
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._watchdog = None
+        self._stats = {'cancelled': 0, 'stalled': 0}
+
+    def create(self, task_id):
+        """Creează token-ul la trimiterea job-ului (poate fi anulat și cât timp așteaptă în coadă)."""
+        with self._lock:
+            return self._tokens.setdefault(task_id, CancellationToken(task_id))
+
+    def get(self, task_id):
+        with self._lock:
+            return self._tokens.get(task_id)
+
+    def cancel(self, task_id, reason='user'):
+        """Anulează task-ul; returnează False dacă nu există un token activ."""
+        token = self.get(task_id)
+        if token is None:
+            return False
+        if not token.cancelled:
+            with self._lock:
+                self._stats['stalled' if reason == 'stalled' else 'cancelled'] += 1
+        token.cancel(reason)
+        return True
+
+    def discard(self, task_id):
+        """Scoate token-ul unui job care nu va mai rula (ex: anulat cât timp aștepta în coadă)."""
+        with self._lock:
+            self._tokens.pop(task_id, None)
+
+    def run(self, task_id, func, *args, **kwargs):
+        """Rulează `func(task_id, ...)` cu token-ul activ; se folosește ca funcție de job în JobQueue."""
+        with self.activate(task_id):
+            return func(task_id, *args, **kwargs)
+
+    @contextmanager
+    def activate(self, task_id):
+        """
+        Rulează un job cu token-ul lui setat în thread-ul curent; la final șterge
+        fișierele temporare înregistrate și scoate token-ul din registru.
+        """
+        token = self.create(task_id)
+        previous = current_token()
+        _thread_state.token = token
+        try:
+            token.raise_if_cancelled()
+            yield token
+        finally:
+            _thread_state.token = previous
+            token.cleanup_files()
+            with self._lock:
+                self._tokens.pop(task_id, None)
+
+    def start_watchdog(self, stall_seconds, interval=WATCHDOG_INTERVAL_SECONDS):
+        """Pornește thread-ul care anulează job-urile cu ffmpeg fără progres de `stall_seconds`."""
+        if self._watchdog is not None or stall_seconds <= 0:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    tokens = list(self._tokens.values())
+                now = time.time()
+                for token in tokens:
+                    if (not token.cancelled and token.has_running_process()
+                            and now - token.last_progress > stall_seconds):
+                        print(f"Watchdog: task {token.task_id} made no progress for {now - token.last_progress:.0f}s")
+                        self.cancel(token.task_id, reason='stalled')
+
+        self._watchdog = threading.Thread(target=watch, name='ffmpeg-watchdog', daemon=True)
+        self._watchdog.start()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, active=len(self._tokens))
@@ -0,0 +1,335 @@
+# backend/chunked_transcription.py
+# Transcriere paralelă pe bucăți: fișierul WAV 16 kHz este tăiat în zonele de liniște,
+# bucățile sunt transcrise în procese worker separate, iar segmentele sunt reunite
+# cu timestamp-uri absolute, în același format ca rezultatul `model.transcribe`.
+
+import multiprocessing
+import os
+import threading
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+
+from cancellation import TaskCancelledError, check_cancelled
+
+SAMPLE_RATE = 16000
+
+# Parametrii pentru tăierea în zonele de liniște
+FRAME_MS = 30                 # Lungimea unui cadru pentru calculul energiei
+SMOOTHING_MS = 300            # Fereastra de netezire (preferăm pauzele mai lungi)
+SPLIT_SEARCH_SECONDS = 5.0    # Căutăm liniștea în jurul punctului țintă (±)
+MIN_CHUNK_SECONDS = 30.0      # Sub o fereastră Whisper nu are sens să tăiem
+MAX_CHUNK_SECONDS = 300.0
+STREAM_CHUNK_SECONDS = 45.0   # Bucăți scurte în modul streaming: primele segmente apar repede
+PROMPT_CONTEXT_CHARS = 200    # Cât din textul anterior este folosit ca prompt
+
+# Starea procesului worker: modelul este încărcat o singură dată per proces, iar indexul
+# procesului în pool alege grupul de nuclee din bugetul job-ului
+_worker_model = None
+_worker_slot = 0
+
+
+def load_wav_pcm(audio_path):
+    """
+    Citește un fișier WAV PCM 16-bit mono (16 kHz) ca array float32 în [-1, 1].
+
+    Args:
+        audio_path (str): Calea fișierului WAV extras cu ffmpeg
+
+    Returns:
+        np.ndarray: Eșantioanele audio
+    """
+    with wave.open(audio_path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+            raise ValueError(f"Expected 16-bit mono WAV, got {wav_file.getsampwidth() * 8}-bit "
+                             f"with {wav_file.getnchannels()} channels")
+        if wav_file.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"Expected {SAMPLE_RATE} Hz WAV, got {wav_file.getframerate()} Hz")
+        frames = wav_file.readframes(wav_file.getnframes())
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def load_wav_range(audio_path, start_seconds, end_seconds):
+    """
+    Citește doar eșantioanele dintre `start_seconds` și `end_seconds` dintr-un WAV 16 kHz mono.
+
+    Returns:
+        tuple: (eșantioane float32, timpul real de start în secunde)
+    """
+    with wave.open(audio_path, 'rb') as wav_file:
+        total_frames = wav_file.getnframes()
+        start_frame = min(total_frames, max(0, int(start_seconds * SAMPLE_RATE)))
+        end_frame = min(total_frames, max(start_frame, int(end_seconds * SAMPLE_RATE)))
+        wav_file.setpos(start_frame)
+        frames = wav_file.readframes(end_frame - start_frame)
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    return audio, start_frame / SAMPLE_RATE
+
+
+def wav_duration(audio_path):
+    """Durata unui fișier WAV în secunde (citește doar header-ul)."""
+    with wave.open(audio_path, 'rb') as wav_file:
+        return wav_file.getnframes() / wav_file.getframerate()
+
+
+def compute_frame_energy(audio, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+    """Calculează energia RMS pe cadre de `frame_ms` milisecunde (vectorizat)."""
+    frame_length = int(sample_rate * frame_ms / 1000)
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def find_silence_split_points(audio, chunk_seconds, sample_rate=SAMPLE_RATE,
+                              search_seconds=SPLIT_SEARCH_SECONDS):
+    """
+    Alege punctele de tăiere cele mai liniștite în jurul fiecărui multiplu de `chunk_seconds`.
+
+    Returns:
+        list: Intervalele (start_sample, end_sample) ale bucăților, în ordine
+    """
+    energy = compute_frame_energy(audio, sample_rate)
+    frame_length = int(sample_rate * FRAME_MS / 1000)
+    n_frames = len(energy)
+
+    chunk_frames = int(chunk_seconds * 1000 / FRAME_MS)
+    search_frames = int(search_seconds * 1000 / FRAME_MS)
+    min_frames = int(MIN_CHUNK_SECONDS * 1000 / FRAME_MS) // 2
+
+    if n_frames <= chunk_frames + min_frames:
+        return [(0, len(audio))]
+
+    window = max(1, int(SMOOTHING_MS / FRAME_MS))
+    smoothed = np.convolve(energy, np.ones(window) / window, mode='same')
+
+    split_frames = [0]
+    target = chunk_frames
+    while target < n_frames - min_frames:
+        low = max(split_frames[-1] + min_frames, target - search_frames)
+        high = min(n_frames - min_frames, target + search_frames)
+        if high <= low:
+            break
+        split = low + int(np.argmin(smoothed[low:high]))
+        split_frames.append(split)
+        target = split + chunk_frames
+
+    boundaries = [frame * frame_length for frame in split_frames] + [len(audio)]
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def choose_chunk_seconds(duration, num_workers):
+    """Două bucăți per worker pentru echilibrarea încărcării, în limitele rezonabile."""
+    return min(MAX_CHUNK_SECONDS, max(MIN_CHUNK_SECONDS, duration / (num_workers * 2)))
+
+
+def _init_worker(model_name, num_threads, slot_counter):
+    """Inițializarea unui proces worker: își ia indexul, limitează thread-urile și încarcă modelul o dată."""
+    global _worker_model, _worker_slot
+    import torch
+    from quantization import load_model_by_name
+
+    with slot_counter.get_lock():
+        _worker_slot = slot_counter.value
+        slot_counter.value += 1
+    torch.set_num_threads(max(1, num_threads))
+    print(f"Chunk worker {os.getpid()}: loading model {model_name} ({num_threads} threads)")
+    _worker_model = load_model_by_name(model_name)
+
+
+def shift_segments(segments, offset):
+    """Copiază segmentele (cu cuvinte) și adaugă `offset` secunde la toate timestamp-urile."""
+    shifted = []
+    for segment in segments:
+        words = []
+        for word_info in segment.get('words') or []:
+            words.append({
+                'word': word_info['word'],
+                'start': round(word_info['start'] + offset, 3),
+                'end': round(word_info['end'] + offset, 3),
+                'probability': word_info.get('probability'),
+            })
+        shifted.append({
+            'start': round(segment['start'] + offset, 3),
+            'end': round(segment['end'] + offset, 3),
+            'text': segment['text'],
+            'words': words,
+            'avg_logprob': segment.get('avg_logprob'),
+            'no_speech_prob': segment.get('no_speech_prob'),
+        })
+    return shifted
+
+
+def _transcribe_chunk(chunk_index, audio_chunk, offset, options, cpu_budgets=None):
+    """
+    Transcrie o bucată în procesul worker și mută timestamp-urile pe axa absolută.
+
+    `cpu_budgets` = grupurile (nuclee, thread-uri) din alocarea job-ului, câte unul per worker.
+    Grupul este ales după indexul procesului, nu al bucății, deci bucățile care rulează
+    simultan (în procese diferite) nu ajung pe aceleași nuclee. Workerii sunt refolosiți
+    între job-uri, deci bugetul se aplică la fiecare bucată.
+    """
+    if cpu_budgets:
+        import torch
+        from resource_manager import set_thread_affinity
+
+        cores, num_threads = cpu_budgets[_worker_slot % len(cpu_budgets)]
+        set_thread_affinity(cores)
+        torch.set_num_threads(max(1, num_threads))
+    result = _worker_model.transcribe(audio_chunk, **options)
+    return chunk_index, shift_segments(result['segments'], offset), result.get('language')
+
+
+def transcribe_in_sequence(model, audio, segment_callback=None, chunk_seconds=STREAM_CHUNK_SECONDS, **options):
+    """
+    Transcrie bucăți consecutive (tăiate în liniște) cu același model, publicând segmentele
+    fiecărei bucăți imediat ce este gata.
+
+    Textul bucății anterioare este dat ca `initial_prompt`, ca să se păstreze contextul
+    între bucăți la fel ca în transcrierea întregului fișier.
+    """
+    if isinstance(audio, str):
+        audio = load_wav_pcm(audio)
+    spans = find_silence_split_points(audio, chunk_seconds)
+
+    options = dict(options)
+    options.pop('initial_prompt', None)
+    chunk_results = []
+    previous_text = None
+    for start, end in spans:
+        check_cancelled()
+        result = model.transcribe(audio[start:end], initial_prompt=previous_text, **options)
+        segments = shift_segments(result['segments'], start / SAMPLE_RATE)
+        chunk_results.append(segments)
+        if segment_callback and segments:
+            segment_callback(segments)
+        previous_text = result.get('text', '')[-PROMPT_CONTEXT_CHARS:] or None
+
+    return stitch_chunk_segments(chunk_results, options.get('language'), spans)
+
+
+class ChunkedTranscriber:
+    """
+    Pool de procese worker pentru transcrierea paralelă pe bucăți.
+
+    Fiecare model are propriul pool, păstrat între job-uri. Job-urile țin pool-ul printr-o
+    închiriere (`_lease_executor`); un pool este oprit doar când nimeni nu îl folosește și
+    se cere un alt model, deci job-urile cu modele diferite pot rula simultan.
+    """
+
+    def __init__(self, num_workers):
+        self.num_workers = max(1, int(num_workers))
+        self._executors = {}   # model_name -> {'executor': ProcessPoolExecutor, 'leases': int}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _lease_executor(self, model_name):
+        idle = []
+        with self._lock:
+            entry = self._executors.get(model_name)
+            if entry is None:
+                # Pool-urile altor modele, nefolosite acum, eliberează memoria workerilor
+                for other_name, other in list(self._executors.items()):
+                    if other['leases'] == 0:
+                        idle.append((other_name, self._executors.pop(other_name)['executor']))
+
+                threads_per_worker = max(1, (os.cpu_count() or 1) // self.num_workers)
+                # spawn: procesele nu moștenesc thread-urile Flask și starea OpenMP a torch
+                context = multiprocessing.get_context('spawn')
+                entry = {
+                    'executor': ProcessPoolExecutor(
+                        max_workers=self.num_workers,
+                        mp_context=context,
+                        initializer=_init_worker,
+                        initargs=(model_name, threads_per_worker, context.Value('i', 0)),
+                    ),
+                    'leases': 0,
+                }
+                self._executors[model_name] = entry
+            entry['leases'] += 1
+
+        for other_name, executor in idle:
+            print(f"Chunked transcription: shutting down idle workers for {other_name}")
+            executor.shutdown(wait=False)
+        try:
+            yield entry['executor']
+        finally:
+            with self._lock:
+                entry['leases'] -= 1
+
+    def transcribe(self, audio, model_name, progress_callback=None, segment_callback=None, cpu_allocation=None,
+                   **options):
+        """
+        Transcrie audio-ul în paralel și reunește segmentele.
+
+        Args:
+            audio (str | np.ndarray): Fișier WAV 16 kHz mono sau eșantioanele deja încărcate
+            model_name (str): Modelul Whisper folosit în workeri
+            progress_callback (callable): Apelată cu (bucăți_terminate, total_bucăți)
+            segment_callback (callable): Primește segmentele, în ordine, pe măsură ce bucățile se termină
+            cpu_allocation (CpuAllocation): Bugetul de nuclee al job-ului, împărțit între workeri
+            **options: Opțiunile transmise la `model.transcribe` (language, word_timestamps...)
+
+        Returns:
+            dict: {'text', 'segments', 'language', 'chunks'} compatibil cu `model.transcribe`
+        """
+        if isinstance(audio, str):
+            audio = load_wav_pcm(audio)
+        duration = len(audio) / SAMPLE_RATE
+        chunk_seconds = choose_chunk_seconds(duration, self.num_workers)
+        spans = find_silence_split_points(audio, chunk_seconds)
+        print(f"Chunked transcription: {duration:.1f}s audio split into {len(spans)} chunks "
+              f"(~{chunk_seconds:.0f}s each) across {self.num_workers} workers")
+
+        # Rezultatul pe bucăți nu trebuie tipărit în fiecare worker
+        options = dict(options, verbose=None)
+        with self._lease_executor(model_name) as executor:
+            # Bucățile rulează în paralel pe cel mult num_workers procese; fiecare proces are partea lui din buget
+            budgets = cpu_allocation.split(self.num_workers) if cpu_allocation else None
+            futures = [
+                executor.submit(_transcribe_chunk, index, audio[start:end], start / SAMPLE_RATE, options, budgets)
+                for index, (start, end) in enumerate(spans)
+            ]
+
+            chunk_results = [None] * len(spans)
+            language = options.get('language')
+            next_to_publish = 0
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    check_cancelled()
+                except TaskCancelledError:
+                    # Bucățile încă nepornite nu mai ocupă workerii; cele în lucru se termină
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                index, segments, chunk_language = future.result()
+                chunk_results[index] = segments
+                language = language or chunk_language
+                # Publicăm doar prefixul continuu de bucăți terminate, ca ordinea să fie păstrată
+                while next_to_publish < len(spans) and chunk_results[next_to_publish] is not None:
+                    if segment_callback and chunk_results[next_to_publish]:
+                        segment_callback(chunk_results[next_to_publish])
+                    next_to_publish += 1
+                if progress_callback:
+                    progress_callback(done, len(spans))
+
+            return stitch_chunk_segments(chunk_results, language, spans)
+
+
+def stitch_chunk_segments(chunk_results, language, spans):
+    """Reunește segmentele bucăților (deja pe axa absolută) într-un singur rezultat."""
+    segments = []
+    for chunk_segments in chunk_results:
+        for segment in chunk_segments:
+            segment = dict(segment, id=len(segments))
+            segments.append(segment)
+
+    return {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': language,
+        'chunks': [{'start': start / SAMPLE_RATE, 'end': end / SAMPLE_RATE} for start, end in spans],
+    }
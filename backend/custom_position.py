@@ -320,6 +320,9 @@ def create_ass_file_with_custom_position(srt_path, output_path, style, subtitles
     # Calculăm poziția și coordonatele pentru ASS
     alignment = get_ass_alignment_from_position(position, useCustomPosition)
     margins = calculate_ass_margins_from_position(position, useCustomPosition, customX, customY, is_mobile)
+    # Rezoluția de referință a ASS: implicit 1920x1080, iar randările multiple o primesc pe a fiecărei ramuri
+    play_res_x = style.get('playResX', 1920)
+    play_res_y = style.get('playResY', 1080)
     
     # Header ASS complet cu BOLD=1 pentru fonturile groase + MaxTextWidth pentru line wrapping
     video_width = style.get('videoWidth', 1920)
@@ -327,8 +330,8 @@ def create_ass_file_with_custom_position(srt_path, output_path, style, subtitles
     
     ass_header = f"""[Script Info]
 ScriptType: v4.00+
-PlayResX: 1920
-PlayResY: 1080
+PlayResX: {{play_res_x}}
+PlayResY: {{play_res_y}}
 ScaledBorderAndShadow: yes
 WrapStyle: 2
 
@@ -376,7 +379,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         alignment=alignment,
         margin_l=margins['MarginL'],
         margin_r=margins['MarginR'],
-        margin_v=margins['MarginV']
+        margin_v=margins['MarginV'],
+        play_res_x=play_res_x,
+        play_res_y=play_res_y
     )
     
     # Creăm fișierul ASS
@@ -408,9 +413,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             if useCustomPosition:
                 # Pentru poziționare personalizată, folosim tag-ul \pos()
-                # Convertim procentajele în coordonate absolute pentru 1920x1080
-                abs_x = int((customX / 100) * 1920)
-                abs_y = int((customY / 100) * 1080)
+                # Convertim procentajele în coordonate absolute pentru rezoluția ASS
+                abs_x = int((customX / 100) * play_res_x)
+                abs_y = int((customY / 100) * play_res_y)
                 position_tag = f"{{\\pos({abs_x},{abs_y})}}"
                 print(f"Custom position: {customX}%,{customY}% -> {abs_x},{abs_y}")
             else:
@@ -423,8 +428,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                         'bottom-20': 80, 'bottom-30': 70, 'bottom-40': 60
                     }
                     y_percent = position_map.get(position, 90)
-                    abs_x = 960  # Centrat
-                    abs_y = int((y_percent / 100) * 1080)
+                    abs_x = play_res_x // 2  # Centrat
+                    abs_y = int((y_percent / 100) * play_res_y)
                     position_tag = f"{{\\pos({abs_x},{abs_y})}}"
                     print(f"Preset position {position}: {y_percent}% -> {abs_x},{abs_y}")
                 else:
@@ -601,12 +606,15 @@ def create_precise_word_highlighting_ass(srt_path, output_path, style, subtitles
     # Calculăm poziția și coordonatele pentru ASS
     alignment = get_ass_alignment_from_position(position, useCustomPosition)
     margins = calculate_ass_margins_from_position(position, useCustomPosition, customX, customY, is_mobile)
+    # Rezoluția de referință a ASS: implicit 1920x1080, iar randările multiple o primesc pe a fiecărei ramuri
+    play_res_x = style.get('playResX', 1920)
+    play_res_y = style.get('playResY', 1080)
     
     # Header ASS SIMPLIFICAT - doar un stil + BOLD=1
     ass_header = """[Script Info]
 ScriptType: v4.00+
-PlayResX: 1920
-PlayResY: 1080
+PlayResX: {play_res_x}
+PlayResY: {play_res_y}
 ScaledBorderAndShadow: yes
 WrapStyle: 2
 
@@ -659,7 +667,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         alignment=alignment,
         margin_l=margins['MarginL'],
         margin_r=margins['MarginR'],
-        margin_v=margins['MarginV']
+        margin_v=margins['MarginV'],
+        play_res_x=play_res_x,
+        play_res_y=play_res_y
     )
     
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -682,8 +692,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             position_tag = ""
             
             if useCustomPosition:
-                abs_x = int((customX / 100) * 1920)
-                abs_y = int((customY / 100) * 1080)
+                abs_x = int((customX / 100) * play_res_x)
+                abs_y = int((customY / 100) * play_res_y)
                 position_tag = f"{{\\pos({abs_x},{abs_y})}}"
             else:
                 if position in ['top-20', 'top-30', 'top-40', 'bottom-20', 'bottom-30', 'bottom-40']:
@@ -692,8 +702,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                         'bottom-20': 80, 'bottom-30': 70, 'bottom-40': 60
                     }
                     y_percent = position_map.get(position, 90)
-                    abs_x = 960  # Centrat
-                    abs_y = int((y_percent / 100) * 1080)
+                    abs_x = play_res_x // 2  # Centrat
+                    abs_y = int((y_percent / 100) * play_res_y)
                     position_tag = f"{{\\pos({abs_x},{abs_y})}}"
                 else:
                     position_tag = f"{{\\an{alignment}}}"
@@ -786,12 +796,15 @@ def create_karaoke_ass_file(srt_path, output_path, style, subtitles):
     # Calculăm poziția și coordonatele pentru ASS
     alignment = get_ass_alignment_from_position(position, useCustomPosition)
     margins = calculate_ass_margins_from_position(position, useCustomPosition, customX, customY, is_mobile)
+    # Rezoluția de referință a ASS: implicit 1920x1080, iar randările multiple o primesc pe a fiecărei ramuri
+    play_res_x = style.get('playResX', 1920)
+    play_res_y = style.get('playResY', 1080)
     
     # Header ASS cu setări optime pentru karaoke și BOLD=1
     ass_header = """[Script Info]
 ScriptType: v4.00+
-PlayResX: 1920
-PlayResY: 1080
+PlayResX: {play_res_x}
+PlayResY: {play_res_y}
 Timer: 100.0000
 ScaledBorderAndShadow: yes
 WrapStyle: 2
@@ -829,7 +842,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         alignment=alignment,
         margin_l=margins['MarginL'],
         margin_r=margins['MarginR'],
-        margin_v=margins['MarginV']
+        margin_v=margins['MarginV'],
+        play_res_x=play_res_x,
+        play_res_y=play_res_y
     )
     
     # Creăm fișierul ASS
@@ -878,8 +893,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             if useCustomPosition:
                 # Pentru poziționare personalizată
-                abs_x = int((customX / 100) * 1920)
-                abs_y = int((customY / 100) * 1080)
+                abs_x = int((customX / 100) * play_res_x)
+                abs_y = int((customY / 100) * play_res_y)
                 position_tag = f"{{\\pos({abs_x},{abs_y})}}"
             else:
                 if position in ['top-20', 'top-30', 'top-40', 'bottom-20', 'bottom-30', 'bottom-40']:
@@ -888,8 +903,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                         'bottom-20': 80, 'bottom-30': 70, 'bottom-40': 60
                     }
                     y_percent = position_map.get(position, 90)
-                    abs_x = 960  # Centrat
-                    abs_y = int((y_percent / 100) * 1080)
+                    abs_x = play_res_x // 2  # Centrat
+                    abs_y = int((y_percent / 100) * play_res_y)
                     position_tag = f"{{\\pos({abs_x},{abs_y})}}"
                 else:
                     position_tag = f"{{\\an{alignment}}}"
@@ -943,12 +958,15 @@ def create_word_by_word_karaoke(srt_path, output_path, style, subtitles):
     # Calculăm poziția și coordonatele pentru ASS
     alignment = get_ass_alignment_from_position(position, useCustomPosition)
     margins = calculate_ass_margins_from_position(position, useCustomPosition, customX, customY, is_mobile)
+    # Rezoluția de referință a ASS: implicit 1920x1080, iar randările multiple o primesc pe a fiecărei ramuri
+    play_res_x = style.get('playResX', 1920)
+    play_res_y = style.get('playResY', 1080)
     
     # Header ASS cu BOLD=1
     ass_header = """[Script Info]
 ScriptType: v4.00+
-PlayResX: 1920
-PlayResY: 1080
+PlayResX: {play_res_x}
+PlayResY: {play_res_y}
 ScaledBorderAndShadow: yes
 WrapStyle: 2
 
@@ -992,7 +1010,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         alignment=alignment,
         margin_l=margins['MarginL'],
         margin_r=margins['MarginR'],
-        margin_v=margins['MarginV']
+        margin_v=margins['MarginV'],
+        play_res_x=play_res_x,
+        play_res_y=play_res_y
     )
     
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -1016,8 +1036,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             position_tag = ""
             
             if useCustomPosition:
-                abs_x = int((customX / 100) * 1920)
-                abs_y = int((customY / 100) * 1080)
+                abs_x = int((customX / 100) * play_res_x)
+                abs_y = int((customY / 100) * play_res_y)
                 position_tag = f"{{\\pos({abs_x},{abs_y})}}"
             else:
                 if position in ['top-20', 'top-30', 'top-40', 'bottom-20', 'bottom-30', 'bottom-40']:
@@ -1026,8 +1046,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                         'bottom-20': 80, 'bottom-30': 70, 'bottom-40': 60
                     }
                     y_percent = position_map.get(position, 90)
-                    abs_x = 960  # Centrat
-                    abs_y = int((y_percent / 100) * 1080)
+                    abs_x = play_res_x // 2  # Centrat
+                    abs_y = int((y_percent / 100) * play_res_y)
                     position_tag = f"{{\\pos({abs_x},{abs_y})}}"
                 else:
                     position_tag = f"{{\\an{alignment}}}"
@@ -0,0 +1,118 @@
+# backend/encoding_profiles.py
+# Profilele de codare pentru video-urile cu subtitrări arse: 'draft' pentru verificări rapide,
+# 'balanced' (implicit, setările de dinainte) și 'final' pentru livrări de calitate maximă.
+# Fiecare profil fixează preset-ul și CRF-ul x264, rezoluția maximă, thread-urile și audio-ul.
+
+import threading
+
+DEFAULT_PROFILE = 'balanced'
+
+ENCODING_PROFILES = {
+    'draft': {
+        'description': 'Previzualizare rapidă: ultrafast, 480p, calitate redusă',
+        'preset': 'ultrafast',
+        'crf': 30,
+        'max_height': 480,        # Scalare în jos după arderea subtitrărilor (poziționarea rămâne a sursei)
+        'max_threads': 2,         # Nu ocupă tot bugetul de nuclee pentru o verificare
+        'audio': {'codec': 'aac', 'bitrate': '96k'},
+    },
+    'balanced': {
+        'description': 'Implicit: preset fast, rezoluția sursei',
+        'preset': 'fast',
+        'crf': 23,
+        'max_height': None,
+        'max_threads': None,      # None = tot bugetul de nuclee al job-ului
+        'audio': {'codec': 'copy'},
+    },
+    'final': {
+        'description': 'Livrare finală: preset slow, CRF 18, rezoluția sursei',
+        'preset': 'slow',
+        'crf': 18,
+        'max_height': None,
+        'max_threads': None,
+        'audio': {'codec': 'copy'},
+    },
+}
+
+
+def get_profile(name):
+    """
+    Returnează profilul de codare după nume (None = profilul implicit).
+
+    Raises:
+        ValueError: Dacă profilul nu există
+    """
+    name = name or DEFAULT_PROFILE
+    if name not in ENCODING_PROFILES:
+        raise ValueError(f"Unknown encoding profile '{name}' (available: {', '.join(ENCODING_PROFILES)})")
+    return dict(ENCODING_PROFILES[name], name=name)
+
+
+def video_args(profile):
+    """Argumentele encoderului video (x264) ale profilului."""
+    return ['-c:v', 'libx264', '-preset', profile['preset'], '-crf', str(profile['crf'])]
+
+
+def audio_args(profile):
+    """Argumentele audio: copiere fără recodare sau AAC cu bitrate redus."""
+    audio = profile['audio']
+    if audio['codec'] == 'copy':
+        return ['-c:a', 'copy']
+    return ['-c:a', audio['codec'], '-b:a', audio['bitrate']]
+
+
+def scale_filter(profile):
+    """Filtrul de scalare (după `ass`) sau None dacă profilul păstrează rezoluția sursei."""
+    if not profile['max_height']:
+        return None
+    # Nu mărim video-urile mai mici; lățimea pară, cerută de x264
+    return f"scale=-2:'min({profile['max_height']},ih)'"
+
+
+def thread_count(profile, available_threads):
+    """Thread-urile ffmpeg: bugetul job-ului, limitat de profil."""
+    if profile['max_threads']:
+        return max(1, min(profile['max_threads'], available_threads))
+    return available_threads
+
+
+def cache_options(profile):
+    """Setările profilului care influențează fișierul rezultat (pentru cheia cache-ului de randări)."""
+    return {key: profile[key] for key in ('preset', 'crf', 'max_height', 'audio')}
+
+
+class ProfileStats:
+    """Viteza măsurată a fiecărui profil pe acest host (secunde de video per secundă de randare)."""
+
+    def __init__(self, default_profile=DEFAULT_PROFILE):
+        """
+        Args:
+            default_profile (str): Profilul folosit când cererea nu alege unul (ENCODING_PROFILE)
+        """
+        self.default_profile = default_profile
+        self._lock = threading.Lock()
+        self._runs = {}
+
+    def record(self, profile_name, media_seconds, render_seconds):
+        if not media_seconds or not render_seconds:
+            return
+        with self._lock:
+            runs = self._runs.setdefault(profile_name, {'runs': 0, 'media_seconds': 0.0, 'render_seconds': 0.0})
+            runs['runs'] += 1
+            runs['media_seconds'] += media_seconds
+            runs['render_seconds'] += render_seconds
+
+    def report(self):
+        """Tabelul profilelor: setările și viteza medie măsurată (x timp real), dacă există rulări."""
+        with self._lock:
+            table = []
+            for name, profile in ENCODING_PROFILES.items():
+                runs = self._runs.get(name)
+                table.append(dict(
+                    profile,
+                    name=name,
+                    default=name == self.default_profile,
+                    measured_speed=round(runs['media_seconds'] / runs['render_seconds'], 2) if runs else None,
+                    measured_runs=runs['runs'] if runs else 0,
+                ))
+            return table
@@ -0,0 +1,189 @@
+# backend/engines.py
+# Motoare de transcriere interschimbabile: toate primesc audio 16 kHz și returnează
+# același format ca `model.transcribe` din openai-whisper (segments cu words),
+# din care app.py construiește subtitrările brute.
+#
+# - 'whisper': implementarea de referință openai-whisper (PyTorch), prin pool-ul de modele
+# - 'faster-whisper': același checkpoint convertit pentru CTranslate2, inferență int8 pe CPU
+#   (dependență opțională: pip install faster-whisper)
+
+import importlib.util
+import os
+
+from cancellation import check_cancelled
+from mel_cache import precomputed_mel
+from model_pool import ModelPool, estimate_model_memory_mb
+from quantization import INT8_SUFFIX, base_model_name
+
+DEFAULT_ENGINE = 'whisper'
+
+# Opțiuni specifice openai-whisper care nu au echivalent în celelalte motoare
+WHISPER_ONLY_OPTIONS = ('fp16', 'verbose')
+
+# Checkpoint-urile CTranslate2 publicate pentru faster-whisper ('large' în openai-whisper este large-v3)
+FASTER_WHISPER_MODEL_NAMES = {
+    'large': 'large-v3',
+}
+FASTER_WHISPER_DIR = os.environ.get(
+    'FASTER_WHISPER_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'whisper', 'ctranslate2')
+)
+
+
+class TranscriptionEngine:
+    """Interfața comună a motoarelor de transcriere."""
+
+    name = None
+    description = ''
+
+    def is_available(self):
+        """True dacă dependențele motorului sunt instalate."""
+        return True
+
+    def transcribe(self, audio, model_name, segment_callback=None, **options):
+        """
+        Transcrie audio-ul cu modelul `model_name`.
+
+        Args:
+            audio (str | np.ndarray): Fișier WAV 16 kHz mono sau eșantioanele float32
+            model_name (str): Numele modelului din AVAILABLE_MODELS
+            segment_callback (callable): Primește segmentele pe măsură ce sunt gata
+            **options: language, word_timestamps, initial_prompt...
+
+        Returns:
+            dict: {'text', 'segments', 'language'}; fiecare segment are start/end/text/words
+        """
+        raise NotImplementedError
+
+    def pool_model_name(self, model_name):
+        """Numele sub care modelul `model_name` este păstrat în pool-ul motorului."""
+        return model_name
+
+    def describe(self):
+        return {
+            'name': self.name,
+            'description': self.description,
+            'available': self.is_available(),
+        }
+
+
+class WhisperEngine(TranscriptionEngine):
+    """Motorul de referință: `model.transcribe` din openai-whisper, cu modelele din pool."""
+
+    name = 'whisper'
+    description = 'openai-whisper (PyTorch), implementarea de referință'
+
+    def __init__(self, model_pool):
+        self.model_pool = model_pool
+
+    def transcribe(self, audio, model_name, segment_callback=None, mel=None, **options):
+        # `mel` (din MelCache) trebuie să corespundă exact eșantioanelor din `audio`
+        with self.model_pool.lease(model_name) as model, precomputed_mel(mel):
+            result = model.transcribe(audio, **options)
+        if segment_callback and result['segments']:
+            segment_callback(result['segments'])
+        return result
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """
+    Motor CTranslate2 (faster-whisper) cu greutăți int8 pe CPU.
+
+    Modelele au propriul pool (alt format decât checkpoint-urile PyTorch), iar segmentele
+    sunt produse incremental, deci sunt publicate imediat ce sunt decodate.
+    """
+
+    name = 'faster-whisper'
+    description = 'faster-whisper (CTranslate2), inferență int8 optimizată pentru CPU'
+
+    def __init__(self, memory_budget_mb=None, compute_type='int8', cpu_threads=0, download_root=FASTER_WHISPER_DIR,
+                 share_budget_with=None):
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.download_root = download_root
+        # Greutățile CTranslate2 int8 ocupă cât varianta '-int8' a checkpoint-ului PyTorch
+        self.model_pool = ModelPool(self._load_model, memory_budget_mb,
+                                    estimator=lambda name: estimate_model_memory_mb(f"{name}{INT8_SUFFIX}"),
+                                    share_budget_with=share_budget_with)
+
+    def is_available(self):
+        return importlib.util.find_spec('faster_whisper') is not None
+
+    def _load_model(self, model_name):
+        if not self.is_available():
+            raise RuntimeError("faster-whisper is not installed (pip install faster-whisper)")
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            model_name,
+            device='cpu',
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            download_root=self.download_root,
+        )
+
+    def pool_model_name(self, model_name):
+        # Varianta '-int8' nu are sens aici: CTranslate2 cuantizează oricum la încărcare
+        base_name = base_model_name(model_name)
+        return FASTER_WHISPER_MODEL_NAMES.get(base_name, base_name)
+
+    def transcribe(self, audio, model_name, segment_callback=None, **options):
+        ct2_name = self.pool_model_name(model_name)
+        options = {key: value for key, value in options.items() if key not in WHISPER_ONLY_OPTIONS}
+        # Decodare greedy cu fallback pe temperatură, ca `model.transcribe` (faster-whisper folosește implicit beam 5)
+        options.setdefault('beam_size', 1)
+
+        segments = []
+        with self.model_pool.lease(ct2_name) as model:
+            segment_iterator, info = model.transcribe(audio, **options)
+            # Decodarea are loc pe măsură ce iteratorul este consumat
+            for segment in segment_iterator:
+                check_cancelled()
+                converted = {
+                    'id': len(segments),
+                    'seek': segment.seek,
+                    'start': round(segment.start, 3),
+                    'end': round(segment.end, 3),
+                    'text': segment.text,
+                    'tokens': list(segment.tokens),
+                    'temperature': segment.temperature,
+                    'avg_logprob': segment.avg_logprob,
+                    'compression_ratio': segment.compression_ratio,
+                    'no_speech_prob': segment.no_speech_prob,
+                    'words': [
+                        {
+                            'word': word.word,
+                            'start': round(word.start, 3),
+                            'end': round(word.end, 3),
+                            'probability': word.probability,
+                        }
+                        for word in segment.words or []
+                    ],
+                }
+                segments.append(converted)
+                if segment_callback:
+                    segment_callback([converted])
+
+        return {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': info.language,
+        }
+
+
+def create_engines(model_pool, memory_budget_mb=None, cpu_threads=0):
+    """
+    Construiește registrul de motoare disponibile în aplicație.
+
+    Fără `memory_budget_mb`, pool-ul faster-whisper împarte bugetul pool-ului openai-whisper,
+    deci modelele ambelor motoare încap împreună în același buget.
+
+    Returns:
+        dict: nume motor -> instanță TranscriptionEngine
+    """
+    engines = [
+        WhisperEngine(model_pool),
+        FasterWhisperEngine(memory_budget_mb, cpu_threads=cpu_threads,
+                            share_budget_with=model_pool if memory_budget_mb is None else None),
+    ]
+    return {engine.name: engine for engine in engines}
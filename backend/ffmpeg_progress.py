@@ -0,0 +1,187 @@
+# backend/ffmpeg_progress.py
+# Progresul codării citit din fluxul `-progress pipe:1` al ffmpeg (blocuri cheie=valoare, câte
+# unul la ~0.5 s, încheiate cu `progress=continue|end`), nu din liniile de stats de pe stderr.
+# Cu durata din record-ul de metadate se calculează procentul și timpul rămas (ETA).
+
+import collections
+import threading
+import time
+
+PROGRESS_ARGS = ('-progress', 'pipe:1', '-nostats')
+STDERR_TAIL_LINES = 20
+
+
+def with_progress(command):
+    """Comanda ffmpeg cu progresul trimis pe stdout (și fără liniile de stats pe stderr)."""
+    return [command[0], *PROGRESS_ARGS, *command[1:]]
+
+
+def drain_stderr(process, max_lines=STDERR_TAIL_LINES):
+    """
+    Citește stderr-ul procesului într-un thread separat (altfel pipe-ul se umple și ffmpeg se blochează).
+
+    Returns:
+        tuple: (deque cu ultimele `max_lines` linii, thread-ul care trebuie așteptat cu join)
+    """
+    tail = collections.deque(maxlen=max_lines)
+
+    def read():
+        for line in process.stderr:
+            tail.append(line)
+
+    thread = threading.Thread(target=read, name='ffmpeg-stderr', daemon=True)
+    thread.start()
+    return tail, thread
+
+
+def iter_progress_blocks(stream):
+    """Blocurile de progres ca dicționare; ultimul are 'progress' == 'end'."""
+    block = {}
+    for line in stream:
+        key, separator, value = line.strip().partition('=')
+        if not separator:
+            continue
+        block[key] = value.strip()
+        if key == 'progress':
+            yield block
+            block = {}
+
+
+def _number(value, suffix=''):
+    if value is None:
+        return None
+    value = value.strip()
+    if suffix and value.endswith(suffix):
+        value = value[:-len(suffix)]
+    try:
+        return float(value)
+    except ValueError:  # 'N/A' înainte de primul cadru codat
+        return None
+
+
+class EncodeProgress:
+    """Starea unui proces ffmpeg: ultimele valori raportate și momentul pornirii."""
+
+    def __init__(self, duration=None):
+        self.duration = duration or None
+        self.start_time = time.time()
+        self.values = {}
+        self.finished = False
+
+    def update(self, block):
+        self.values.update(block)
+        self.finished = block.get('progress') == 'end'
+
+    @property
+    def out_time(self):
+        """Secundele codate (out_time_us; out_time_ms este tot în microsecunde, din motive istorice)."""
+        microseconds = _number(self.values.get('out_time_us')) or _number(self.values.get('out_time_ms'))
+        seconds = max(0.0, microseconds / 1e6) if microseconds else 0.0
+        if self.duration:
+            seconds = min(seconds, self.duration)
+        return seconds
+
+    def snapshot(self):
+        """Telemetria curentă: timp codat, procent, fps, viteză, bitrate, cadre pierdute și ETA."""
+        elapsed = time.time() - self.start_time
+        out_time = self.out_time
+        speed = _number(self.values.get('speed'), 'x')
+        if not speed and elapsed > 0 and out_time:
+            speed = out_time / elapsed
+        return build_snapshot(
+            out_time=out_time,
+            duration=self.duration,
+            elapsed=elapsed,
+            fps=_number(self.values.get('fps')),
+            speed=speed,
+            bitrate_kbps=_number(self.values.get('bitrate'), 'kbits/s'),
+            frame=_number(self.values.get('frame')),
+            drop_frames=_number(self.values.get('drop_frames')),
+            dup_frames=_number(self.values.get('dup_frames')),
+            total_size=_number(self.values.get('total_size')),
+            finished=self.finished,
+        )
+
+
+def build_snapshot(out_time, duration, elapsed, fps=None, speed=None, bitrate_kbps=None, frame=None,
+                   drop_frames=None, dup_frames=None, total_size=None, finished=False):
+    """Dicționarul expus în /api/status (valorile necunoscute rămân None)."""
+    percent = None
+    eta_seconds = None
+    if duration:
+        percent = round(min(100.0, out_time / duration * 100), 1)
+        if finished:
+            eta_seconds = 0.0
+        elif speed:
+            eta_seconds = round(max(0.0, duration - out_time) / speed, 1)
+    return {
+        'out_time': round(out_time, 3),
+        'duration': round(duration, 3) if duration else None,
+        'percent': percent,
+        'fps': round(fps, 1) if fps is not None else None,
+        'speed': round(speed, 2) if speed else None,
+        'bitrate_kbps': round(bitrate_kbps, 1) if bitrate_kbps is not None else None,
+        'frame': int(frame) if frame is not None else None,
+        'drop_frames': int(drop_frames) if drop_frames is not None else None,
+        'dup_frames': int(dup_frames) if dup_frames is not None else None,
+        'total_size': int(total_size) if total_size is not None else None,
+        'elapsed': round(elapsed, 1),
+        'eta_seconds': eta_seconds,
+    }
+
+
+def combine_snapshots(trackers, duration):
+    """
+    Telemetria agregată a mai multor procese care codează simultan părți din același video
+    (randarea paralelă): timpii, fps-ul, viteza și cadrele se adună.
+    """
+    elapsed = max((time.time() - tracker.start_time for tracker in trackers), default=0.0)
+    snapshots = [tracker.snapshot() for tracker in trackers]
+
+    def total(key):
+        values = [snapshot[key] for snapshot in snapshots if snapshot[key] is not None]
+        return sum(values) if values else None
+
+    bitrates = [snapshot['bitrate_kbps'] for snapshot in snapshots if snapshot['bitrate_kbps'] is not None]
+    return build_snapshot(
+        out_time=sum(snapshot['out_time'] for snapshot in snapshots),
+        duration=duration,
+        elapsed=elapsed,
+        fps=total('fps'),
+        speed=total('speed'),
+        bitrate_kbps=sum(bitrates) / len(bitrates) if bitrates else None,
+        frame=total('frame'),
+        drop_frames=total('drop_frames'),
+        dup_frames=total('dup_frames'),
+        total_size=total('total_size'),
+        finished=all(tracker.finished for tracker in trackers),
+    )
+
+
+def follow_progress(process, token, tracker, callback=None, min_interval=0.5):
+    """
+    Urmărește un proces pornit cu `with_progress` până la terminare.
+
+    Args:
+        process (Popen): Cu stdout și stderr în PIPE (text)
+        token (CancellationToken): Atins la fiecare avans (watchdog-ul oprește doar ffmpeg-ul blocat)
+        tracker (EncodeProgress): Primește blocurile de progres (cu durata de codat pentru procent și ETA)
+        callback (callable): Apelat cu `tracker`, cel mult o dată la `min_interval` și la final
+
+    Returns:
+        str: Ultimele linii din stderr, pentru mesajele de eroare
+    """
+    stderr_tail, stderr_thread = drain_stderr(process)
+    last_report = 0.0
+    last_out_time = None
+    for block in iter_progress_blocks(process.stdout):
+        tracker.update(block)
+        if tracker.out_time != last_out_time:
+            last_out_time = tracker.out_time
+            token.touch()
+        if callback and (tracker.finished or time.time() - last_report >= min_interval):
+            last_report = time.time()
+            callback(tracker)
+    process.wait()
+    stderr_thread.join()
+    return ''.join(stderr_tail)
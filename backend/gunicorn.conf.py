@@ -0,0 +1,26 @@
+# backend/gunicorn.conf.py
+# Pornirea serverului cu gunicorn: `gunicorn -c gunicorn.conf.py app:app`
+# Workerii gthread servesc mai multe cereri simultan (inclusiv stream-urile SSE de segmente).
+# Cu WEB_CONCURRENCY > 1 fiecare worker are propria coadă de job-uri și propriile modele, iar
+# statusurile, rezultatele, segmentele parțiale și cererile de anulare trec prin store-ul SQLite
+# comun (TASK_STORE=sqlite); bugetele de memorie din app.py se împart între workeri.
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Încărcările mari și transcrierile sincrone pot ține o cerere mult timp
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 600))
+graceful_timeout = 30
+# Fiecare worker își pornește propriile thread-uri (coadă, store, watchdog) după fork
+preload_app = False
+
+if workers > 1 and os.environ.get('TASK_STORE', 'memory') != 'sqlite':
+    # Store-ul din memorie este al unui singur proces: polling-ul ar ajunge pe workeri care nu știu de task
+    print("gunicorn: TASK_STORE is not 'sqlite', running a single worker (set TASK_STORE=sqlite for more)")
+    workers = 1
+
+# app.py citește numărul efectiv de workeri pentru a-și împărți bugetele de memorie
+os.environ['WEB_CONCURRENCY'] = str(workers)
@@ -0,0 +1,268 @@
+# backend/job_queue.py
+# Coadă de job-uri cu un număr limitat de workeri pentru procesările lungi (transcriere, randare)
+# Endpoint-urile pun job-ul în coadă și returnează imediat task_id-ul.
+# Job-urile sunt ordonate după prioritate și pornesc doar cât timp memoria estimată
+# a job-urilor active încape în bugetul containerului (altfel procesul este omorât de OOM).
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+
+from cancellation import TaskCancelledError
+
+# Prioritățile job-urilor (număr mai mic = rulează mai devreme)
+PRIORITY_HIGH = 0      # Previzualizări scurte, re-transcrieri de intervale
+PRIORITY_NORMAL = 1    # Transcrieri complete
+PRIORITY_LOW = 2       # Randări complete
+PRIORITIES = {'high': PRIORITY_HIGH, 'normal': PRIORITY_NORMAL, 'low': PRIORITY_LOW}
+
+
+class QueueFullError(Exception):
+    """Coada a atins numărul maxim de job-uri în așteptare."""
+
+
+class _Job:
+    def __init__(self, task_id, func, args, kwargs, priority, memory_mb, kind, sequence, resident_memory=None):
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.memory_mb = memory_mb
+        self.resident_memory = resident_memory
+        self.kind = kind
+        self.sequence = sequence
+        self.submitted_at = time.time()
+        self.waited_for_memory = False
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class JobQueue:
+    """
+    Coadă cu priorități servită de un pool fix de thread-uri worker, cu admitere după memorie.
+
+    Primul job din coadă (cea mai mare prioritate, apoi FIFO) pornește doar dacă memoria
+    estimată încape în buget alături de job-urile active și de memoria deja ocupată
+    (`baseline_memory`, ex: modelele din pool). Nu sărim peste el cu job-uri mai mici,
+    ca job-urile mari să nu aștepte la nesfârșit; dacă nu rulează nimic, pornește oricum.
+
+    Rezultatul fiecărui job (sau eroarea) este păstrat după task_id și poate fi
+    citit ulterior prin `get_result`. Cu `result_store`, stările job-urilor sunt scrise și în
+    store-ul de task-uri (vizibile din alți workeri), iar coada păstrează doar job-urile nefinalizate.
+    """
+
+    def __init__(self, num_workers, max_pending=100, name='jobs', memory_budget_mb=None, baseline_memory=None,
+                 result_store=None):
+        """
+        Args:
+            num_workers (int): Numărul de thread-uri care execută job-uri
+            max_pending (int): Numărul maxim de job-uri în așteptare
+            name (str): Numele cozii (pentru loguri și thread-uri)
+            memory_budget_mb (float): Memoria totală permisă (None = fără admitere după memorie)
+            baseline_memory (callable): Returnează memoria ocupată deja în afara job-urilor (MB)
+            result_store (TaskStore): Store-ul în care se publică stările și rezultatele (None = doar local)
+        """
+        self.name = name
+        self.num_workers = max(1, int(num_workers))
+        self.max_pending = max_pending
+        self.memory_budget_mb = memory_budget_mb
+        self.baseline_memory = baseline_memory or (lambda: 0.0)
+        self.result_store = result_store
+        self._condition = threading.Condition()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._running = {}
+        self._results = {}
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'total_run_time': 0.0,
+                       'memory_waits': 0}
+        self._workers = []
+        for index in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"{name}-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        budget = f"{memory_budget_mb:.0f} MB" if memory_budget_mb else "unlimited"
+        print(f"Job queue '{name}' started with {self.num_workers} workers (memory budget {budget})")
+
+    def submit(self, task_id, func, *args, priority=PRIORITY_NORMAL, memory_mb=0.0, kind='job', resident_memory=None,
+               **kwargs):
+        """
+        Adaugă un job în coadă.
+
+        Args:
+            priority (int): PRIORITY_HIGH / PRIORITY_NORMAL / PRIORITY_LOW
+            memory_mb (float): Vârful de memorie estimat al job-ului
+            kind (str): Tipul job-ului (transcription, render...) pentru status și statistici
+            resident_memory (callable): Returnează partea din `memory_mb` numărată deja în
+                `baseline_memory` (ex: greutățile modelului, odată încărcat în pool)
+
+        Returns:
+            int: Poziția job-ului în coadă (1 = următorul care va rula)
+
+        Raises:
+            QueueFullError: Dacă sunt deja prea multe job-uri în așteptare
+        """
+        with self._condition:
+            if len(self._heap) >= self.max_pending:
+                raise QueueFullError(f"Job queue '{self.name}' is full")
+            job = _Job(task_id, func, args, kwargs, priority, memory_mb, kind, next(self._sequence), resident_memory)
+            heapq.heappush(self._heap, job)
+            self._set_entry(task_id, {'state': 'queued'})
+            self._stats['submitted'] += 1
+            self._condition.notify_all()
+            return self._position(task_id)
+
+    def _set_entry(self, task_id, entry):
+        """
+        Actualizează starea job-ului (apelat sub lock, ca stările să ajungă în ordine în store).
+
+        Cu `result_store`, job-urile terminate sunt păstrate doar în store (cu TTL), nu și în coadă.
+        """
+        if self.result_store is not None:
+            self.result_store.set_result(task_id, entry)
+            if entry['state'] in ('completed', 'error', 'cancelled'):
+                self._results.pop(task_id, None)
+                return
+        self._results[task_id] = entry
+
+    def _position(self, task_id):
+        for position, job in enumerate(sorted(self._heap), 1):
+            if job.task_id == task_id:
+                return position
+        return None
+
+    def queue_position(self, task_id):
+        """Returnează poziția în coadă (1-based) sau None dacă job-ul nu mai așteaptă."""
+        with self._condition:
+            return self._position(task_id)
+
+    def job_info(self, task_id):
+        """Prioritatea, tipul și memoria estimată a unui job în așteptare sau în lucru."""
+        with self._condition:
+            job = self._running.get(task_id) or next((job for job in self._heap if job.task_id == task_id), None)
+            if job is None:
+                return None
+            return {'kind': job.kind, 'priority': job.priority, 'estimated_memory_mb': round(job.memory_mb, 1)}
+
+    def cancel(self, task_id):
+        """
+        Scoate din coadă un job care încă așteaptă (nu mai ocupă un worker).
+
+        Job-urile care rulează deja se opresc singure prin token-ul de anulare. Doar job-urile
+        acestei cozi sunt anulate; pentru cele din alți workeri (vizibile prin `result_store`)
+        se raportează doar starea, fiindcă sunt în coada procesului care le-a primit.
+
+        Returns:
+            tuple: (starea job-ului înainte de anulare ('queued', 'running'...) sau None dacă nu
+                există, True dacă job-ul aparține acestei cozi)
+        """
+        with self._condition:
+            entry = self._results.get(task_id)
+            if entry is None:
+                entry = self.result_store.get_result(task_id) if self.result_store is not None else None
+                return (entry['state'] if entry is not None else None), False
+            state = entry['state']
+            if state == 'queued':
+                self._heap = [job for job in self._heap if job.task_id != task_id]
+                heapq.heapify(self._heap)
+                self._set_entry(task_id, {'state': 'cancelled'})
+                self._stats['cancelled'] += 1
+                self._condition.notify_all()
+            return state, True
+
+    def local_task_ids(self):
+        """Task-urile care așteaptă sau rulează în această coadă (nu și cele din alți workeri)."""
+        with self._condition:
+            return [job.task_id for job in self._heap] + list(self._running)
+
+    def get_result(self, task_id):
+        """
+        Returnează starea job-ului: {'state': queued|running|completed|error|cancelled, ...}
+        sau None dacă task_id-ul nu aparține acestei cozi (sau a expirat din store).
+        """
+        with self._condition:
+            entry = self._results.get(task_id)
+            if entry is not None:
+                return dict(entry)
+        return self.result_store.get_result(task_id) if self.result_store is not None else None
+
+    @staticmethod
+    def _charge(job):
+        """Memoria job-ului fără partea deja inclusă în memoria de bază (altfel ar fi numărată de două ori)."""
+        resident_mb = job.resident_memory() if job.resident_memory is not None else 0.0
+        return max(0.0, job.memory_mb - resident_mb)
+
+    def _memory_in_use(self):
+        return self.baseline_memory() + sum(self._charge(job) for job in self._running.values())
+
+    def _can_start(self, job):
+        if self.memory_budget_mb is None or not self._running:
+            return True
+        return self._memory_in_use() + self._charge(job) <= self.memory_budget_mb
+
+    def _next_job(self):
+        """Așteaptă până când primul job din coadă poate fi admis și îl scoate din coadă."""
+        with self._condition:
+            while True:
+                if self._heap and self._can_start(self._heap[0]):
+                    job = heapq.heappop(self._heap)
+                    self._running[job.task_id] = job
+                    self._set_entry(job.task_id, {'state': 'running',
+                                                  'wait_time': round(time.time() - job.submitted_at, 2)})
+                    if job.waited_for_memory:
+                        self._stats['memory_waits'] += 1
+                    return job
+                if self._heap:
+                    self._heap[0].waited_for_memory = True
+                # Reverificăm periodic: memoria de bază (modelele din pool) se poate elibera între timp
+                self._condition.wait(timeout=1.0 if self._heap else None)
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            start_time = time.time()
+            try:
+                result = job.func(job.task_id, *job.args, **job.kwargs)
+                entry = {'state': 'completed', 'result': result}
+                stat_key = 'completed'
+            except TaskCancelledError as e:
+                print(f"Job {job.task_id} cancelled: {str(e)}")
+                entry = {'state': 'cancelled', 'error': str(e)}
+                stat_key = 'cancelled'
+            except Exception as e:
+                print(f"Job {job.task_id} failed: {str(e)}")
+                traceback.print_exc()
+                entry = {'state': 'error', 'error': str(e)}
+                stat_key = 'failed'
+
+            run_time = time.time() - start_time
+            entry['run_time'] = round(run_time, 2)
+            with self._condition:
+                self._running.pop(job.task_id, None)
+                self._set_entry(job.task_id, entry)
+                self._stats[stat_key] += 1
+                self._stats['total_run_time'] += run_time
+                self._condition.notify_all()
+
+    def stats(self):
+        """Returnează numărul de workeri, job-urile în așteptare/în lucru, memoria și contoarele."""
+        with self._condition:
+            return {
+                'name': self.name,
+                'workers': self.num_workers,
+                'pending': len(self._heap),
+                'running': len(self._running),
+                'running_jobs': [{'task_id': job.task_id, 'kind': job.kind,
+                                  'estimated_memory_mb': round(job.memory_mb, 1)} for job in self._running.values()],
+                'memory_budget_mb': self.memory_budget_mb,
+                'memory_in_use_mb': round(self._memory_in_use(), 1),
+                'submitted': self._stats['submitted'],
+                'completed': self._stats['completed'],
+                'failed': self._stats['failed'],
+                'cancelled': self._stats['cancelled'],
+                'memory_waits': self._stats['memory_waits'],
+                'total_run_time': round(self._stats['total_run_time'], 2),
+            }
@@ -0,0 +1,231 @@
+# backend/media_probe.py
+# Metadatele fișierului încărcat (dimensiuni, durată, fps, codec-uri, cadre cheie, audio) sunt
+# citite cu ffprobe o singură dată, imediat după încărcare, și salvate într-un fișier JSON
+# alăturat. Transcrierea, randarea, previzualizarea și estimările de memorie citesc acest
+# record în loc să pornească fiecare propriul ffprobe.
+
+import json
+import os
+import subprocess
+import threading
+import time
+
+PROBE_SUFFIX = '.probe.json'
+PROBE_VERSION = 1
+DEFAULT_DIMENSIONS = (1920, 1080)
+
+
+def probe_record_path(media_path):
+    """Calea record-ului de metadate asociat unui fișier încărcat."""
+    return f"{os.path.splitext(media_path)[0]}{PROBE_SUFFIX}"
+
+
+def _source_identity(media_path):
+    stat = os.stat(media_path)
+    return {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+
+def _parse_rate(rate):
+    """Rata ffprobe ('30000/1001') ca float; None dacă lipsește."""
+    try:
+        numerator, denominator = (float(part) for part in str(rate).split('/'))
+        return round(numerator / denominator, 3) if denominator else None
+    except ValueError:
+        return None
+
+
+def probe_keyframes(media_path):
+    """
+    Momentele (secunde) cadrelor cheie din primul stream video.
+
+    Citește doar antetele pachetelor (fără decodare), deci e rapid și pe fișiere lungi.
+    """
+    probe_cmd = [
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0',
+        media_path
+    ]
+    output = subprocess.check_output(probe_cmd, universal_newlines=True)
+    keyframes = []
+    for line in output.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) >= 2 and 'K' in parts[1] and parts[0] not in ('', 'N/A'):
+            keyframes.append(float(parts[0]))
+    return sorted(set(keyframes))
+
+
+def probe_media(media_path):
+    """
+    Citește metadatele fișierului: un ffprobe pentru stream-uri și container, unul pentru cadrele cheie.
+
+    Returns:
+        dict: Record-ul de metadate (dimensiunile video sunt None pentru fișierele doar audio)
+    """
+    probe_cmd = [
+        'ffprobe', '-v', 'error', '-show_streams', '-show_format', '-of', 'json',
+        media_path
+    ]
+    probe = json.loads(subprocess.check_output(probe_cmd, universal_newlines=True))
+    streams = probe.get('streams', [])
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'
+                  and not stream.get('disposition', {}).get('attached_pic')), None)
+    audio = next((stream for stream in streams if stream.get('codec_type') == 'audio'), None)
+
+    duration = float(probe.get('format', {}).get('duration') or 0.0)
+    if not duration:
+        duration = max((float(stream.get('duration') or 0.0) for stream in streams), default=0.0)
+
+    record = dict(
+        _source_identity(media_path),
+        version=PROBE_VERSION,
+        duration=round(duration, 3),
+        format=probe.get('format', {}).get('format_name'),
+        width=None,
+        height=None,
+        fps=None,
+        video_codec=None,
+        pixel_format=None,
+        keyframes=[],
+        audio_codec=None,
+        audio_channels=None,
+        audio_channel_layout=None,
+        audio_sample_rate=None,
+    )
+    if video:
+        record.update(
+            width=int(video.get('width') or 0) or None,
+            height=int(video.get('height') or 0) or None,
+            fps=_parse_rate(video.get('avg_frame_rate')) or _parse_rate(video.get('r_frame_rate')),
+            video_codec=video.get('codec_name'),
+            pixel_format=video.get('pix_fmt'),
+            keyframes=probe_keyframes(media_path),
+        )
+    if audio:
+        record.update(
+            audio_codec=audio.get('codec_name'),
+            audio_channels=audio.get('channels'),
+            audio_channel_layout=audio.get('channel_layout'),
+            audio_sample_rate=int(audio.get('sample_rate') or 0) or None,
+        )
+    return record
+
+
+class MediaProbeStore:
+    """
+    Record-urile de metadate ale fișierelor încărcate: în memorie și în fișierul JSON alăturat.
+
+    Cererile pentru un fișier aflat încă în analiză așteaptă rezultatul în loc să pornească
+    un al doilea ffprobe. Un record al cărui fișier sursă s-a schimbat (dimensiune, mtime)
+    este recalculat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._in_progress = {}  # media_path -> threading.Event
+        self._errors = {}
+        self._stats = {'probes': 0, 'reuses': 0, 'failures': 0, 'total_probe_time': 0.0}
+
+    def start_probe(self, media_path):
+        """Pornește analiza în fundal (dacă nu există deja un record valid sau una în lucru)."""
+        with self._lock:
+            if media_path in self._in_progress or self._valid_record(media_path) is not None:
+                return
+            done_event = threading.Event()
+            self._in_progress[media_path] = done_event
+            self._errors.pop(media_path, None)
+
+        thread = threading.Thread(target=self._probe, args=(media_path, done_event), daemon=True)
+        thread.start()
+
+    def _valid_record(self, media_path):
+        """Record-ul din memorie sau de pe disc, dacă încă descrie fișierul (apelat sub lock)."""
+        record = self._records.get(media_path)
+        if record is None:
+            try:
+                with open(probe_record_path(media_path), encoding='utf-8') as record_file:
+                    record = json.load(record_file)
+            except (OSError, ValueError):
+                return None
+        try:
+            identity = _source_identity(media_path)
+        except OSError:
+            return None
+        if record.get('version') != PROBE_VERSION or any(record.get(key) != value for key, value in identity.items()):
+            self._records.pop(media_path, None)
+            return None
+        self._records[media_path] = record
+        return record
+
+    def _probe(self, media_path, done_event):
+        try:
+            start_time = time.time()
+            record = probe_media(media_path)
+            record_path = probe_record_path(media_path)
+            temp_path = f"{record_path}.part"
+            with open(temp_path, 'w', encoding='utf-8') as record_file:
+                json.dump(record, record_file)
+            os.replace(temp_path, record_path)
+            elapsed = time.time() - start_time
+            with self._lock:
+                self._records[media_path] = record
+                self._stats['probes'] += 1
+                self._stats['total_probe_time'] += elapsed
+            print(f"Media probe: {os.path.basename(media_path)} {record['width']}x{record['height']}, "
+                  f"{record['duration']:.1f}s, {len(record['keyframes'])} keyframes ({elapsed:.2f}s)")
+        except Exception as e:
+            print(f"Media probe: failed for {media_path}: {e}")
+            with self._lock:
+                self._errors[media_path] = str(e)
+                self._stats['failures'] += 1
+        finally:
+            with self._lock:
+                self._in_progress.pop(media_path, None)
+            done_event.set()
+
+    def get(self, media_path, timeout=None):
+        """
+        Record-ul de metadate al fișierului, așteptând sau pornind analiza dacă e nevoie.
+
+        Returns:
+            dict: Record-ul sau None dacă ffprobe a eșuat (apelanții folosesc valori implicite)
+        """
+        with self._lock:
+            done_event = self._in_progress.get(media_path)
+            record = self._valid_record(media_path) if done_event is None else None
+            if record is not None:
+                self._stats['reuses'] += 1
+                return record
+
+        if done_event is None:
+            self.start_probe(media_path)
+            with self._lock:
+                done_event = self._in_progress.get(media_path)
+        if done_event is not None:
+            done_event.wait(timeout)
+
+        with self._lock:
+            return self._records.get(media_path)
+
+    def dimensions(self, media_path):
+        """(lățime, înălțime) ale primului stream video; `DEFAULT_DIMENSIONS` dacă nu se cunosc."""
+        record = self.get(media_path)
+        if record and record['width'] and record['height']:
+            return record['width'], record['height']
+        print(f"Video dimensions unknown for {os.path.basename(media_path)}, using {DEFAULT_DIMENSIONS}")
+        return DEFAULT_DIMENSIONS
+
+    def duration(self, media_path):
+        """Durata fișierului în secunde; 0 dacă nu se cunoaște."""
+        record = self.get(media_path)
+        return record['duration'] if record else 0.0
+
+    def keyframes(self, media_path):
+        """Momentele cadrelor cheie (lista goală dacă nu se cunosc)."""
+        record = self.get(media_path)
+        return record['keyframes'] if record else []
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_progress=len(self._in_progress), records=len(self._records),
+                        total_probe_time=round(self._stats['total_probe_time'], 2))
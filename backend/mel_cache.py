@@ -0,0 +1,275 @@
+# backend/mel_cache.py
+# Cache pe disc pentru spectrogramele log-mel, păstrate ca fișiere .npy memory-mapped
+# Toate modelele cu același `n_mels` (base, small, medium: 80; large-v3: 128) citesc aceleași
+# caracteristici, deci schimbarea modelului nu mai recalculează mel-ul fișierului.
+
+import hashlib
+import importlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+N_FFT = 400
+HOP_LENGTH = 160
+N_SAMPLES = 30 * SAMPLE_RATE            # Padding-ul de 30 s adăugat de `whisper.transcribe`
+CHUNK_FRAMES = 60 * 100                 # Calculăm câte 60 s de mel odată (limitează vârful de memorie)
+TEMP_SUFFIX = '.tmp.npy'
+STALE_TEMP_SECONDS = 3600               # Fișiere temporare rămase de la o scriere întreruptă
+
+
+def _virtual_slice(audio, start, end, padding):
+    """
+    Eșantioanele [start, end) din semnalul virtual `audio + zerouri(padding)`, cu reflexie
+    la margini (ca `torch.stft(center=True)`), fără a copia tot fișierul.
+    """
+    total = len(audio) + padding
+    parts = []
+    if start < 0:
+        parts.append(_virtual_slice(audio, 1, 1 - start, padding)[::-1])
+        start = 0
+    if end > total:
+        tail = _virtual_slice(audio, 2 * (total - 1) - end + 1, total - 1, padding)[::-1]
+        end = total
+    else:
+        tail = None
+    audio_end = min(end, len(audio))
+    if start < audio_end:
+        parts.append(audio[start:audio_end])
+    zeros = end - max(start, len(audio))
+    if zeros > 0:
+        parts.append(np.zeros(zeros, dtype=np.float32))
+    if tail is not None:
+        parts.append(tail)
+    return np.concatenate(parts).astype(np.float32, copy=False)
+
+
+def compute_log_mel(audio, n_mels, out, padding=N_SAMPLES):
+    """
+    Calculează log-mel-ul în `out` (n_mels x cadre) pe bucăți de CHUNK_FRAMES cadre.
+
+    Rezultatul este identic cu `whisper.log_mel_spectrogram(audio, n_mels, padding)`:
+    fiecare cadru primește exact eșantioanele pe care le-ar primi în STFT-ul complet, iar
+    normalizarea față de maximul global se face într-o a doua trecere.
+    """
+    import torch
+    from whisper.audio import mel_filters
+
+    filters = mel_filters('cpu', n_mels)
+    window = torch.hann_window(N_FFT)
+    n_frames = out.shape[1]
+
+    global_max = -np.inf
+    for frame_start in range(0, n_frames, CHUNK_FRAMES):
+        frame_end = min(n_frames, frame_start + CHUNK_FRAMES)
+        samples = _virtual_slice(audio, frame_start * HOP_LENGTH - N_FFT // 2,
+                                 (frame_end - 1) * HOP_LENGTH + N_FFT // 2, padding)
+        stft = torch.stft(torch.from_numpy(samples), N_FFT, HOP_LENGTH, window=window,
+                          center=False, return_complex=True)
+        magnitudes = stft.abs() ** 2
+        log_spec = torch.clamp(filters @ magnitudes, min=1e-10).log10()
+        out[:, frame_start:frame_end] = log_spec.numpy()
+        global_max = max(global_max, float(log_spec.max()))
+
+    for frame_start in range(0, n_frames, CHUNK_FRAMES):
+        block = out[:, frame_start:frame_start + CHUNK_FRAMES]
+        np.maximum(block, global_max - 8.0, out=block)
+        block += 4.0
+        block /= 4.0
+    return out
+
+
+def mel_frame_count(num_samples, padding=N_SAMPLES):
+    return (num_samples + padding) // HOP_LENGTH
+
+
+_precomputed = threading.local()
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+def _install_transcribe_hook():
+    """
+    Înlocuiește o singură dată `log_mel_spectrogram` din `whisper.transcribe` cu o variantă
+    care returnează mel-ul precalculat al thread-ului curent, dacă forma lui se potrivește.
+
+    `whisper.transcribe` calculează mereu mel-ul din audio (un tensor primit e tratat ca
+    eșantioane), deci fără hook modul standard ar ignora cache-ul.
+    """
+    global _hook_installed
+    with _hook_lock:
+        if _hook_installed:
+            return
+        import torch
+
+        # `whisper.transcribe` ca atribut este funcția; modulul îl luăm din importlib
+        transcribe_module = importlib.import_module('whisper.transcribe')
+        original = transcribe_module.log_mel_spectrogram
+
+        def log_mel_spectrogram(audio, n_mels=80, padding=0, device=None):
+            mel = getattr(_precomputed, 'mel', None)
+            if (mel is not None and padding == N_SAMPLES and not isinstance(audio, str)
+                    and mel.shape == (n_mels, mel_frame_count(len(audio), padding))):
+                # Copie în RAM: memmap-ul este read-only, iar torch cere un buffer modificabil
+                tensor = torch.from_numpy(np.array(mel))
+                return tensor.to(device) if device is not None else tensor
+            return original(audio, n_mels, padding, device)
+
+        transcribe_module.log_mel_spectrogram = log_mel_spectrogram
+        _hook_installed = True
+
+
+@contextmanager
+def precomputed_mel(mel):
+    """
+    Cât timp blocul rulează, `model.transcribe` apelat din acest thread folosește `mel`
+    (de la `MelCache.get_or_compute`) în loc să recalculeze spectrograma.
+
+    Args:
+        mel (np.ndarray): Mel-ul cu padding-ul de 30 s, sau None (fără efect)
+    """
+    if mel is None:
+        yield
+        return
+    _install_transcribe_hook()
+    previous = getattr(_precomputed, 'mel', None)
+    _precomputed.mel = mel
+    try:
+        yield
+    finally:
+        _precomputed.mel = previous
+
+
+class MelCache:
+    """
+    Spectrograme log-mel pe disc (un .npy per audio și n_mels), citite prin memory-map.
+
+    Evacuare LRU după dimensiunea totală; ordinea se reconstruiește la pornire din mtime.
+    Un fișier șters în timp ce e mapat rămâne valid pentru job-ul care îl citește (Linux).
+    """
+
+    def __init__(self, cache_dir, max_size_mb=2000):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._entries = OrderedDict()  # key -> dimensiunea fișierului
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'compute_time': 0.0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        existing = []
+        now = time.time()
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.endswith(TEMP_SUFFIX):
+                # Nu sunt intrări; cele recente pot fi scrise chiar acum de alt worker
+                if now - os.stat(path).st_mtime > STALE_TEMP_SECONDS:
+                    self._remove_file(path)
+                continue
+            if name.endswith('.npy'):
+                stat = os.stat(path)
+                existing.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+
+    @staticmethod
+    def make_key(audio_hash, n_mels, variant=None):
+        """Cheia unei spectrograme; `variant` distinge audio derivat (ex: compactat de VAD)."""
+        key_data = f"{audio_hash}:{n_mels}:{variant or ''}"
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _open(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            try:
+                mel = np.load(self._path(key), mmap_mode='r')
+                os.utime(self._path(key), None)
+            except (OSError, ValueError) as e:
+                print(f"Mel cache: dropping unreadable entry {key}: {e}")
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return mel
+
+    def get_or_compute(self, audio_hash, audio, n_mels, variant=None):
+        """
+        Returnează mel-ul (np.memmap read-only, n_mels x cadre, cu padding-ul de 30 s),
+        calculându-l o singură dată chiar dacă mai multe job-uri îl cer simultan.
+        """
+        key = self.make_key(audio_hash, n_mels, variant)
+        mel = self._open(key)
+        if mel is not None:
+            return mel
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            mel = self._open(key)
+            if mel is not None:
+                return mel
+
+            start_time = time.time()
+            path = self._path(key)
+            temp_path = f"{path}{TEMP_SUFFIX}"
+            try:
+                out = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32,
+                                                shape=(n_mels, mel_frame_count(len(audio))))
+                compute_log_mel(audio, n_mels, out)
+                out.flush()
+                del out
+                os.replace(temp_path, path)
+            except BaseException:
+                self._remove_file(temp_path)
+                raise
+            elapsed = time.time() - start_time
+
+            with self._lock:
+                self._entries[key] = os.path.getsize(path)
+                self._entries.move_to_end(key)
+                self._stats['misses'] += 1
+                self._stats['compute_time'] += elapsed
+                self._key_locks.pop(key, None)
+                self._evict(keep=key)
+            print(f"Mel cache: computed {n_mels}-bin mel for {len(audio) / SAMPLE_RATE:.1f}s audio in {elapsed:.1f}s")
+            return np.load(path, mmap_mode='r')
+
+    def _evict(self, keep=None):
+        total_size = sum(self._entries.values())
+        for key in list(self._entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if key == keep:
+                continue
+            total_size -= self._entries.pop(key)
+            self._remove_file(self._path(key))
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'entries': len(self._entries),
+                'size_mb': round(sum(self._entries.values()) / (1024 * 1024), 2),
+                'max_size_mb': round(self.max_size_bytes / (1024 * 1024), 2),
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                'evictions': self._stats['evictions'],
+                'compute_time': round(self._stats['compute_time'], 2),
+            }
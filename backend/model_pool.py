@@ -0,0 +1,300 @@
+# backend/model_pool.py
+# Pool de modele Whisper ținute în memorie simultan, cu buget de RAM și evacuare LRU
+# Înlocuiește modelul unic global: cererile alternative (small/medium) nu mai reîncarcă de pe disc
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Numărul aproximativ de parametri (milioane) pentru fiecare checkpoint Whisper.
+# Folosit pentru a estima memoria înainte de încărcare (fp32 = 4 octeți / parametru).
+MODEL_PARAMS_MILLIONS = {
+    'tiny': 39,
+    'base': 74,
+    'small': 244,
+    'medium': 769,
+    'large': 1550,
+}
+
+# Overhead peste greutăți (buffere, structuri PyTorch, fragmentare alocator)
+MEMORY_OVERHEAD_FACTOR = 1.15
+
+
+def estimate_model_memory_mb(model_name):
+    """
+    Estimează memoria RAM ocupată de un model Whisper fp32 înainte de încărcare.
+
+    Args:
+        model_name (str): Numele modelului (ex: 'small', 'large-v2')
+
+    Returns:
+        float: Memoria estimată în MB
+    """
+    from quantization import INT8_MEMORY_FACTOR, is_quantized_name
+
+    base_name = model_name.split('-')[0].split('.')[0]
+    params_millions = MODEL_PARAMS_MILLIONS.get(base_name, MODEL_PARAMS_MILLIONS['large'])
+    memory_mb = params_millions * 4 * MEMORY_OVERHEAD_FACTOR
+    if is_quantized_name(model_name):
+        memory_mb *= INT8_MEMORY_FACTOR
+    return memory_mb
+
+
+def measure_model_memory_mb(model):
+    """
+    Măsoară memoria ocupată de tensorii unui model încărcat.
+
+    Folosește state_dict-ul, care include și greutățile împachetate ale straturilor
+    cuantizate INT8 (acestea nu apar în `model.parameters()`).
+    """
+    def tensor_bytes(value):
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(item) for item in value)
+        if hasattr(value, 'numel') and hasattr(value, 'element_size'):
+            return value.numel() * value.element_size()
+        return 0
+
+    try:
+        total_bytes = sum(tensor_bytes(value) for value in model.state_dict().values())
+    except Exception as e:
+        print(f"Could not measure model memory: {e}")
+        return None
+    return total_bytes / (1024 * 1024)
+
+
+class _PoolEntry:
+    """Un model rezident în pool, cu contorul de utilizări active și lock-ul de inferență."""
+
+    def __init__(self, model, memory_mb, load_time):
+        self.model = model
+        self.memory_mb = memory_mb
+        self.load_time = load_time
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.uses = 0
+        self.pins = 0
+        # Whisper instalează hook-uri de kv-cache pe modul la fiecare decodare,
+        # deci două transcrieri simultane pe același model s-ar corupe reciproc.
+        self.inference_lock = threading.Lock()
+
+
+class ModelPool:
+    """
+    Pool LRU de modele Whisper limitat de un buget de memorie.
+
+    Modelele rămân încărcate cât timp încap în buget; la nevoie este evacuat
+    modelul folosit cel mai demult care nu este în uz.
+    """
+
+    def __init__(self, loader, memory_budget_mb=None, estimator=estimate_model_memory_mb, share_budget_with=None):
+        """
+        Args:
+            loader (callable): Funcția care încarcă un model după nume
+            memory_budget_mb (float): Bugetul total de RAM pentru modele
+            estimator (callable): Estimează memoria unui model înainte de încărcare
+            share_budget_with (ModelPool): Pool cu care se împarte bugetul (ex: alt motor);
+                evacuarea alege modelul LRU nefolosit din oricare pool al grupului
+        """
+        self.loader = loader
+        self.estimator = estimator
+        self._entries = OrderedDict()
+        if share_budget_with is not None:
+            # Același lock pentru tot grupul: evacuarea atinge și intrările celorlalte pool-uri
+            self.memory_budget_mb = share_budget_with.memory_budget_mb
+            self._lock = share_budget_with._lock
+            self._group = share_budget_with._group
+        else:
+            self.memory_budget_mb = memory_budget_mb
+            self._lock = threading.Lock()
+            self._group = []
+        self._group.append(self)
+        self._load_locks = {}
+        self._measured_memory = {}  # Memoria măsurată rămâne cunoscută și după evacuare
+        self._runs = {}  # Statistici de viteză per model (audio procesat vs. timp de procesare)
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'load_errors': 0,
+            'total_load_time': 0.0,
+            'load_times': {},
+        }
+
+    def _used_memory_mb(self):
+        return sum(entry.memory_mb for entry in self._entries.values())
+
+    def _budget_used_mb(self):
+        """Memoria tuturor pool-urilor care împart bugetul (apelat cu lock-ul grupului)."""
+        return sum(pool._used_memory_mb() for pool in self._group)
+
+    def _evict_for(self, required_mb, keep=None):
+        """Evacuează modele LRU nefolosite (din tot grupul) până când `required_mb` încape în buget."""
+        candidates = sorted(
+            ((entry.last_used, pool, name) for pool in self._group for name, entry in pool._entries.items()),
+            key=lambda candidate: candidate[0]
+        )
+        for _, pool, name in candidates:
+            if self._budget_used_mb() + required_mb <= self.memory_budget_mb:
+                break
+            entry = pool._entries[name]
+            if entry.pins > 0 or (pool is self and name == keep):
+                continue
+            print(f"Model pool: evicting {name} ({entry.memory_mb:.0f} MB, idle {time.time() - entry.last_used:.0f}s)")
+            del pool._entries[name]
+            del entry
+            pool._stats['evictions'] += 1
+
+        if self._budget_used_mb() + required_mb > self.memory_budget_mb:
+            print(f"Model pool: budget of {self.memory_budget_mb:.0f} MB exceeded "
+                  f"({self._budget_used_mb():.0f} MB in use + {required_mb:.0f} MB requested)")
+
+    def _touch(self, name, pin=False):
+        entry = self._entries[name]
+        entry.last_used = time.time()
+        entry.uses += 1
+        if pin:
+            entry.pins += 1
+        self._entries.move_to_end(name)
+        return entry
+
+    def _get_entry(self, name, pin=False):
+        with self._lock:
+            if name in self._entries:
+                self._stats['hits'] += 1
+                return self._touch(name, pin)
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Încărcarea se face în afara lock-ului principal, ca alte modele să rămână accesibile
+        with load_lock:
+            with self._lock:
+                if name in self._entries:
+                    self._stats['hits'] += 1
+                    return self._touch(name, pin)
+                self._stats['misses'] += 1
+                self._evict_for(self.estimator(name))
+            gc.collect()
+
+            print(f"Model pool: loading {name}")
+            start_time = time.time()
+            try:
+                model = self.loader(name)
+            except Exception:
+                with self._lock:
+                    self._stats['load_errors'] += 1
+                raise
+            load_time = time.time() - start_time
+
+            measured_mb = measure_model_memory_mb(model)
+            memory_mb = measured_mb or self.estimator(name)
+            with self._lock:
+                if measured_mb:
+                    self._measured_memory[name] = measured_mb
+                self._entries[name] = _PoolEntry(model, memory_mb, load_time)
+                self._stats['total_load_time'] += load_time
+                self._stats['load_times'].setdefault(name, []).append(round(load_time, 2))
+                entry = self._touch(name, pin)
+                # Estimarea poate fi mai mică decât realitatea; reverificăm bugetul
+                self._evict_for(0, keep=name)
+            print(f"Model pool: loaded {name} in {load_time:.1f}s ({memory_mb:.0f} MB)")
+            return entry
+
+    def get(self, name):
+        """Returnează modelul cerut, încărcându-l în pool dacă este necesar."""
+        return self._get_entry(name).model
+
+    @contextmanager
+    def lease(self, name):
+        """
+        Împrumută un model pentru inferență.
+
+        Modelul nu poate fi evacuat cât timp este împrumutat, iar inferențele pe
+        același model sunt serializate.
+        """
+        entry = self._get_entry(name, pin=True)
+        try:
+            with entry.inference_lock:
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.pins -= 1
+
+    def is_loaded(self, name):
+        with self._lock:
+            return name in self._entries
+
+    def memory_used_mb(self):
+        """Memoria ocupată de modelele rezidente (MB)."""
+        with self._lock:
+            return self._used_memory_mb()
+
+    def loaded_models(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def unload(self, name):
+        """Scoate un model din pool (dacă nu este în uz)."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.pins > 0:
+                return False
+            del self._entries[name]
+        gc.collect()
+        return True
+
+    def record_run(self, name, audio_seconds, processing_seconds):
+        """Înregistrează o transcriere, pentru calculul factorului de timp real (RTF) al modelului."""
+        if not audio_seconds:
+            return
+        with self._lock:
+            runs = self._runs.setdefault(name, {'runs': 0, 'audio_seconds': 0.0, 'processing_seconds': 0.0})
+            runs['runs'] += 1
+            runs['audio_seconds'] += audio_seconds
+            runs['processing_seconds'] += processing_seconds
+
+    def model_report(self, name):
+        """
+        Memoria (măsurată dacă modelul a fost încărcat, altfel estimată) și RTF-ul măsurat.
+
+        RTF = timp de procesare / durata audio (sub 1.0 înseamnă mai rapid decât timpul real).
+        """
+        with self._lock:
+            measured = self._measured_memory.get(name)
+            runs = self._runs.get(name)
+            return {
+                'memory_mb': round(measured if measured is not None else self.estimator(name), 1),
+                'memory_measured': measured is not None,
+                'loaded': name in self._entries,
+                'rtf': round(runs['processing_seconds'] / runs['audio_seconds'], 3) if runs else None,
+                'rtf_runs': runs['runs'] if runs else 0,
+            }
+
+    def stats(self):
+        """Returnează statisticile pool-ului: hits, misses, timpi de încărcare, modele rezidente."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'memory_budget_mb': self.memory_budget_mb,
+                'memory_used_mb': round(self._used_memory_mb(), 1),
+                'budget_used_mb': round(self._budget_used_mb(), 1),
+                'shares_budget': len(self._group) > 1,
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                'evictions': self._stats['evictions'],
+                'load_errors': self._stats['load_errors'],
+                'total_load_time': round(self._stats['total_load_time'], 2),
+                'load_times': {name: list(times) for name, times in self._stats['load_times'].items()},
+                'models': [
+                    {
+                        'name': name,
+                        'memory_mb': round(entry.memory_mb, 1),
+                        'load_time': round(entry.load_time, 2),
+                        'uses': entry.uses,
+                        'in_use': entry.pins > 0,
+                        'idle_seconds': round(time.time() - entry.last_used, 1),
+                    }
+                    for name, entry in self._entries.items()
+                ],
+            }
@@ -0,0 +1,183 @@
+# backend/parallel_render.py
+# Randare paralelă a subtitrărilor arse: video-ul este împărțit la cadre cheie în N intervale,
+# fiecare interval este codat de un ffmpeg separat (același fișier ASS, cu timpii decalați),
+# apoi segmentele sunt concatenate fără recodare video și se adaugă audio-ul original.
+
+import os
+import subprocess
+import threading
+import time
+
+from cancellation import terminate_process
+from ffmpeg_progress import EncodeProgress, combine_snapshots, follow_progress, with_progress
+
+MIN_SEGMENT_SECONDS = 30.0     # Sub această lungime, pornirea unui ffmpeg nu se mai amortizează
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+def plan_segments(keyframes, duration, parts, min_segment_seconds=MIN_SEGMENT_SECONDS):
+    """
+    Alege punctele de tăiere: pentru fiecare graniță ideală (duration * i / parts),
+    cadrul cheie cel mai apropiat.
+
+    Args:
+        keyframes (list): Momentele cadrelor cheie (secunde), din record-ul `media_probe`
+        duration (float): Durata video-ului
+        parts (int): Numărul dorit de segmente
+        min_segment_seconds (float): Lungimea minimă a unui segment
+
+    Returns:
+        list: Intervale (start, end) consecutive care acoperă tot video-ul; un singur
+        interval dacă video-ul este prea scurt sau nu are suficiente cadre cheie
+    """
+    if duration <= 0:
+        return [(0.0, duration)]
+    parts = max(1, min(parts, int(duration // min_segment_seconds)))
+    cuts = [0.0]
+    for index in range(1, parts):
+        target = duration * index / parts
+        candidates = [keyframe for keyframe in keyframes
+                      if keyframe - cuts[-1] >= min_segment_seconds and duration - keyframe >= min_segment_seconds]
+        if not candidates:
+            break
+        cut = min(candidates, key=lambda keyframe: abs(keyframe - target))
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(duration)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def segment_command(input_path, segment_path, ass_path, start, end, threads, encoder_args, fonts_dir,
+                    extra_filters=None):
+    """
+    Comanda ffmpeg pentru un segment, doar video.
+
+    Cu `-ss` înaintea lui `-i`, timpii încep de la 0; `setpts` îi readuce pe axa
+    fișierului original pentru filtrul `ass`, apoi îi resetează pentru concatenare.
+    `extra_filters` (ex: scalarea profilului draft) se aplică după subtitrări.
+    """
+    filters = [f"setpts=PTS+{start:.6f}/TB", f"ass={ass_path}:fontsdir={fonts_dir}"]
+    filters.extend(extra_filters or [])
+    filters.append("setpts=PTS-STARTPTS")
+    vf_filter = ','.join(filters)
+    return [
+        'ffmpeg', '-y',
+        '-ss', f"{start:.6f}", '-t', f"{end - start:.6f}", '-i', input_path,
+        '-vf', vf_filter,
+        '-an',
+        *encoder_args,
+        '-threads', str(threads),
+        segment_path
+    ]
+
+
+def render_segments_parallel(input_path, output_path, ass_path, segments, cpu_allocation, token,
+                             encoder_args=('-c:v', 'libx264', '-preset', 'fast'), audio_args=('-c:a', 'copy'),
+                             extra_filters=None, fonts_dir='/usr/share/fonts', progress_callback=None,
+                             max_threads=None):
+    """
+    Arde subtitrările pe fiecare segment în paralel și asamblează fișierul final.
+
+    Args:
+        segments (list): Intervalele (start, end) din `plan_segments`
+        cpu_allocation (CpuAllocation): Nucleele job-ului, împărțite între procesele ffmpeg
+        token (CancellationToken): Procesele și fișierele temporare se înregistrează pe el
+        encoder_args (tuple): Codec-ul și setările video ale segmentelor
+        audio_args (tuple): Tratamentul audio-ului original la asamblare (copiere sau recodare)
+        extra_filters (list): Filtre aplicate după subtitrări (ex: scalare)
+        progress_callback (callable): Primește telemetria agregată pe segmente (`combine_snapshots`)
+        max_threads (int): Limita totală de thread-uri, împărțită între segmente (None = toată alocarea)
+
+    Raises:
+        RuntimeError: Dacă un segment sau asamblarea finală eșuează
+    """
+    base_path = os.path.splitext(output_path)[0]
+    segment_paths = [f"{base_path}.part{index:03d}.mp4" for index in range(len(segments))]
+    list_path = f"{base_path}.parts.txt"
+    for path in segment_paths + [list_path]:
+        token.register_file(path)
+
+    total_seconds = sum(end - start for start, end in segments)
+    trackers = [EncodeProgress(end - start) for start, end in segments]
+    return_codes = [None] * len(segments)
+    processes = []
+    lock = threading.Lock()
+    last_report = [0.0]
+
+    def run_segment(index, cores, threads):
+        start, end = segments[index]
+        if max_threads:
+            threads = max(1, min(threads, max_threads // len(segments)))
+        process = subprocess.Popen(
+            with_progress(segment_command(input_path, segment_paths[index], ass_path, start, end, threads,
+                                          encoder_args, fonts_dir, extra_filters)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        cpu_allocation.apply_to_process(process.pid, cores)
+        with lock:
+            processes.append(process)
+        token.register_process(process)
+
+        def report_progress(_tracker):
+            with lock:
+                report = time.time() - last_report[0] > PROGRESS_INTERVAL_SECONDS
+                if report:
+                    last_report[0] = time.time()
+            if report and progress_callback:
+                progress_callback(combine_snapshots(trackers, total_seconds))
+
+        stderr_tail = follow_progress(process, token, trackers[index], report_progress,
+                                      min_interval=PROGRESS_INTERVAL_SECONDS)
+        token.unregister_process(process)
+        return_codes[index] = process.returncode
+        if process.returncode != 0:
+            print(f"FFmpeg segment {index} error: {stderr_tail}")
+            # Un segment eșuat face inutile celelalte: le oprim imediat
+            with lock:
+                others = list(processes)
+            for other in others:
+                terminate_process(other)
+
+    budgets = cpu_allocation.split(len(segments))
+    workers = [threading.Thread(target=run_segment, args=(index, cores, threads),
+                                name=f"render-segment-{index}", daemon=True)
+               for index, (cores, threads) in enumerate(budgets)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    token.raise_if_cancelled()
+    failed = [index for index, code in enumerate(return_codes) if code != 0]
+    if failed:
+        raise RuntimeError(f"FFmpeg failed on render segments {failed}")
+
+    with open(list_path, 'w', encoding='utf-8') as list_file:
+        for path in segment_paths:
+            escaped_path = path.replace("'", "'\\''")
+            list_file.write(f"file '{escaped_path}'\n")
+
+    # Concatenare fără recodare video + audio-ul original (copiat sau recodat după profil)
+    concat_cmd = [
+        'ffmpeg', '-y',
+        '-f', 'concat', '-safe', '0', '-i', list_path,
+        '-i', input_path,
+        '-map', '0:v:0', '-map', '1:a:0?',
+        '-c:v', 'copy', *audio_args,
+        output_path
+    ]
+    # Și concatenarea raportează progresul: fără el watchdog-ul ar opri un fișier mare ca blocat
+    process = subprocess.Popen(with_progress(concat_cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               universal_newlines=True)
+    token.register_process(process)
+    stderr = follow_progress(process, token, EncodeProgress(total_seconds))
+    token.unregister_process(process)
+    token.raise_if_cancelled()
+    if process.returncode != 0:
+        print(f"FFmpeg concat error: {stderr}")
+        raise RuntimeError("FFmpeg failed to concatenate render segments")
+
+    if progress_callback:
+        progress_callback(combine_snapshots(trackers, total_seconds))
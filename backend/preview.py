@@ -0,0 +1,60 @@
+# backend/preview.py
+# Previzualizarea stilului pe o fereastră scurtă din video (și exportul unui clip dintr-un interval):
+# se păstrează doar subtitrările care ating fereastra, cu timpii mutați la începutul ei,
+# iar ffmpeg taie exact fereastra (seek precis) înainte de arderea subtitrărilor.
+
+DEFAULT_PREVIEW_SECONDS = 5.0
+MIN_WINDOW_SECONDS = 0.5
+
+
+def preview_window(center=None, duration=None, start=None, end=None, media_duration=None):
+    """
+    Intervalul randat: [start, end] explicit sau `duration` secunde în jurul lui `center`.
+
+    Fereastra este mutată (nu micșorată) când depășește începutul sau sfârșitul video-ului.
+
+    Returns:
+        tuple: (start, end) în secunde
+
+    Raises:
+        ValueError: Dacă lipsesc parametrii sau intervalul este invalid
+    """
+    if start is not None and end is not None:
+        start, end = max(0.0, float(start)), float(end)
+    elif center is not None:
+        duration = float(duration) if duration is not None else DEFAULT_PREVIEW_SECONDS
+        if duration <= 0:
+            raise ValueError("Preview duration must be positive")
+        start = float(center) - duration / 2
+        end = start + duration
+        if start < 0:
+            start, end = 0.0, duration
+    else:
+        raise ValueError("Provide either 'center' (with optional 'duration') or 'start' and 'end'")
+
+    if media_duration:
+        if end > media_duration:
+            start, end = max(0.0, start - (end - media_duration)), media_duration
+    if end - start < MIN_WINDOW_SECONDS:
+        raise ValueError(f"Invalid time window {start:.3f}-{end:.3f}")
+    return start, end
+
+
+def window_subtitles(subtitles, start, end):
+    """
+    Subtitrările (și cuvintele lor) care se suprapun cu [start, end], mutate astfel încât
+    fereastra să înceapă la 0 și limitate la durata ei.
+    """
+    duration = end - start
+
+    def shift(value):
+        return round(min(duration, max(0.0, value - start)), 3)
+
+    shifted = []
+    for subtitle in subtitles:
+        if subtitle['end'] <= start or subtitle['start'] >= end:
+            continue
+        words = [dict(word, start=shift(word['start']), end=shift(word['end']))
+                 for word in subtitle.get('words') or []]
+        shifted.append(dict(subtitle, start=shift(subtitle['start']), end=shift(subtitle['end']), words=words))
+    return shifted
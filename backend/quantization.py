@@ -0,0 +1,101 @@
+# backend/quantization.py
+# Variante INT8 ale modelelor Whisper pentru inferență pe CPU
+# Straturile liniare sunt cuantizate dinamic (torch.quantization.quantize_dynamic), iar
+# greutățile cuantizate sunt salvate pe disc, lângă checkpoint-urile Whisper (volumul whisper_models).
+
+import os
+from dataclasses import asdict
+
+INT8_SUFFIX = '-int8'
+
+# Greutățile liniare ocupă majoritatea parametrilor; restul (embedding-uri, conv) rămân fp32
+INT8_MEMORY_FACTOR = 0.35
+
+QUANTIZED_CACHE_DIR = os.environ.get(
+    'WHISPER_QUANTIZED_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'whisper', 'int8')
+)
+
+
+def is_quantized_name(model_name):
+    return model_name.endswith(INT8_SUFFIX)
+
+
+def base_model_name(model_name):
+    """Numele checkpoint-ului fp32 din care provine varianta (ex: 'small-int8' -> 'small')."""
+    return model_name[:-len(INT8_SUFFIX)] if is_quantized_name(model_name) else model_name
+
+
+def quantize_linear_layers(model):
+    """
+    Aplică cuantizarea dinamică INT8 pe toate straturile liniare ale modelului (in-place).
+
+    `whisper.model.Linear` doar convertește greutățile la dtype-ul intrării, ceea ce pe CPU
+    (fp32) nu schimbă nimic; îl transformăm în `nn.Linear` ca să fie recunoscut de torch.
+    """
+    import torch
+    from whisper.model import Linear as WhisperLinear
+
+    for module in model.modules():
+        if isinstance(module, WhisperLinear):
+            module.__class__ = torch.nn.Linear
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def load_quantized_model(model_name, cache_dir=QUANTIZED_CACHE_DIR):
+    """
+    Încarcă varianta INT8 a unui model; la prima utilizare o creează din checkpoint-ul fp32
+    și o salvează în `cache_dir`.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    base_name = base_model_name(model_name)
+    quantized_path = os.path.join(cache_dir, f"{base_name}{INT8_SUFFIX}.pt")
+
+    if os.path.exists(quantized_path):
+        print(f"Loading quantized weights from {quantized_path}")
+        checkpoint = torch.load(quantized_path, map_location='cpu')
+        model = Whisper(ModelDimensions(**checkpoint['dims']))
+        quantize_linear_layers(model)
+        model.load_state_dict(checkpoint['state_dict'])
+    else:
+        print(f"Quantizing {base_name} to INT8 (first use)")
+        model = whisper.load_model(base_name, device='cpu')
+        quantize_linear_layers(model)
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{quantized_path}.tmp"
+        torch.save({'dims': asdict(model.dims), 'state_dict': model.state_dict()}, temp_path)
+        os.replace(temp_path, quantized_path)
+        print(f"Saved quantized weights to {quantized_path}")
+
+    # Capetele de atenție pentru alinierea pe cuvinte nu fac parte din state_dict
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(base_name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model.eval()
+
+
+def load_model_by_name(model_name):
+    """Încarcă un model Whisper după nume, inclusiv variantele '-int8'."""
+    if is_quantized_name(model_name):
+        return load_quantized_model(model_name)
+
+    import whisper
+    return whisper.load_model(model_name)
+
+
+def add_quantized_variants(models):
+    """Returnează dicționarul de modele completat cu câte o variantă INT8 pentru fiecare intrare."""
+    extended = dict(models)
+    for model_key, model_info in models.items():
+        extended[f"{model_key}{INT8_SUFFIX}"] = {
+            'name': f"{model_info['name'].split(' (')[0]} INT8 (CPU, cuantizat)",
+            'size': model_info['size'],
+            'description': 'Straturi liniare cuantizate INT8: mai puțină memorie și inferență mai rapidă pe CPU',
+            'quantized': True,
+            'base_model': model_key,
+        }
+    return extended
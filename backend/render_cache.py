@@ -0,0 +1,170 @@
+# backend/render_cache.py
+# Cache pentru video-urile randate: aceeași sursă + același fișier ASS + aceleași setări
+# ffmpeg dau același rezultat, deci o randare repetată (dublu-click, reîncercare după o
+# descărcare eșuată) returnează fișierul existent din PROCESSED_FOLDER fără recodare.
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def file_identity(path):
+    """Identitatea unui fișier sursă: calea reală, dimensiunea și mtime-ul (fără a-l citi)."""
+    stat = os.stat(path)
+    return f"{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def make_render_key(input_path, ass_path, render_options):
+    """
+    Cheia unei randări: identitatea sursei, octeții fișierului ASS generat și opțiunile
+    ffmpeg (codec, preset, mod de randare...).
+    """
+    digest = hashlib.sha256()
+    digest.update(file_identity(input_path).encode())
+    with open(ass_path, 'rb') as ass_file:
+        digest.update(hashlib.sha256(ass_file.read()).digest())
+    digest.update(json.dumps(render_options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Indexul video-urilor randate (un JSON per intrare, cu numele fișierului din `output_dir`).
+
+    Evacuare LRU după dimensiunea totală a video-urilor; la evacuare se șterge și video-ul.
+    Ordinea LRU se reconstruiește la pornire din mtime-ul fișierelor de index.
+
+    Două randări identice pornite simultan (ambele ratează cache-ul) înregistrează aceeași
+    cheie. Video-ul înlocuit nu este șters: clientul primului job i-a primit deja numele și
+    încă îl poate descărca. Rămâne în bugetul cache-ului și este primul evacuat.
+    """
+
+    def __init__(self, index_dir, output_dir, max_size_mb=5000):
+        self.index_dir = index_dir
+        self.output_dir = output_dir
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (output_filename, dimensiunea video-ului)
+        self._superseded = OrderedDict()  # output_filename -> dimensiune, video-uri înlocuite la aceeași cheie
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'saved_seconds': 0.0}
+
+        os.makedirs(index_dir, exist_ok=True)
+        existing = []
+        for name in os.listdir(index_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(index_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as index_file:
+                    entry = json.load(index_file)
+                output_path = os.path.join(output_dir, entry['output_filename'])
+                existing.append((os.stat(path).st_mtime, name[:-5], entry['output_filename'],
+                                 os.path.getsize(output_path)))
+            except (OSError, ValueError, KeyError):
+                # Video-ul a fost șters între timp: intrarea nu mai e validă
+                self._remove_index(path)
+        for _, key, output_filename, size in sorted(existing):
+            self._entries[key] = (output_filename, size)
+        print(f"Render cache: {len(self._entries)} entries in {index_dir}")
+
+    def _index_path(self, key):
+        return os.path.join(self.index_dir, f"{key}.json")
+
+    @staticmethod
+    def _remove_index(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        """Returnează intrarea ({'output_filename', 'render_time', ...}) dacă video-ul există încă, altfel None."""
+        with self._lock:
+            if key not in self._entries:
+                self._stats['misses'] += 1
+                return None
+            output_filename, _ = self._entries[key]
+            index_path = self._index_path(key)
+            try:
+                if not os.path.exists(os.path.join(self.output_dir, output_filename)):
+                    raise OSError(f"{output_filename} is missing")
+                with open(index_path, 'r', encoding='utf-8') as index_file:
+                    entry = json.load(index_file)
+                os.utime(index_path, None)
+            except (OSError, ValueError) as e:
+                print(f"Render cache: dropping entry {key}: {e}")
+                self._entries.pop(key, None)
+                self._remove_index(index_path)
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            self._stats['saved_seconds'] += entry.get('render_time', 0.0)
+            return entry
+
+    def put(self, key, output_filename, **metadata):
+        """Înregistrează video-ul randat `output_filename` (din `output_dir`) pentru cheia dată."""
+        size = os.path.getsize(os.path.join(self.output_dir, output_filename))
+        entry = dict(metadata, output_filename=output_filename, created_at=time.time())
+        index_path = self._index_path(key)
+        temp_path = f"{index_path}.tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as index_file:
+                json.dump(entry, index_file)
+            os.replace(temp_path, index_path)
+            previous = self._entries.get(key)
+            if previous and previous[0] != output_filename:
+                self._superseded[previous[0]] = previous[1]
+            self._superseded.pop(output_filename, None)
+            self._entries[key] = (output_filename, size)
+            self._entries.move_to_end(key)
+            self._stats['stores'] += 1
+            self._evict(keep=key)
+
+    def _remove_output(self, output_filename):
+        try:
+            os.remove(os.path.join(self.output_dir, output_filename))
+        except OSError:
+            pass
+
+    def _total_size(self):
+        return sum(size for _, size in self._entries.values()) + sum(self._superseded.values())
+
+    def _evict(self, keep=None):
+        total_size = self._total_size()
+        # Video-urile înlocuite nu mai pot fi găsite prin cache: pleacă înaintea intrărilor
+        for output_filename in list(self._superseded):
+            if total_size <= self.max_size_bytes:
+                return
+            total_size -= self._superseded.pop(output_filename)
+            self._remove_output(output_filename)
+            self._stats['evictions'] += 1
+        for key in list(self._entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if key == keep:
+                continue
+            output_filename, size = self._entries.pop(key)
+            total_size -= size
+            self._remove_output(output_filename)
+            self._remove_index(self._index_path(key))
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'entries': len(self._entries),
+                'superseded': len(self._superseded),
+                'size_mb': round(self._total_size() / (1024 * 1024), 2),
+                'max_size_mb': round(self.max_size_bytes / (1024 * 1024), 2),
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                'stores': self._stats['stores'],
+                'evictions': self._stats['evictions'],
+                'saved_render_seconds': round(self._stats['saved_seconds'], 2),
+            }
@@ -0,0 +1,194 @@
+# backend/renditions.py
+# Mai multe variante ale aceluiași video subtitrat (ex: 1080p, 720p, vertical 9:16) dintr-o singură
+# decodare: filtrul `split` împarte cadrele decodate în ramuri, fiecare ramură este decupată și/sau
+# scalată la geometria ei, primește propriul fișier ASS (așezat pentru acea geometrie) și este codată
+# ca ieșire separată a aceluiași proces ffmpeg.
+
+import subprocess
+
+from ffmpeg_progress import EncodeProgress, follow_progress, with_progress
+
+MAX_RENDITIONS = 4
+
+RENDITION_PRESETS = {
+    '1080p': {'height': 1080},
+    '720p': {'height': 720},
+    '480p': {'height': 480},
+    'vertical': {'height': 1920, 'aspect': '9:16'},   # Reels / Shorts / TikTok
+    'square': {'height': 1080, 'aspect': '1:1'},
+}
+
+
+def _even(value):
+    """Dimensiunile trebuie să fie pare pentru x264 (yuv420p)."""
+    return max(2, int(round(value / 2.0)) * 2)
+
+
+def _parse_aspect(aspect):
+    try:
+        width, height = (float(part) for part in str(aspect).split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid aspect ratio '{aspect}' (expected e.g. '9:16')")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid aspect ratio '{aspect}'")
+    return width, height
+
+
+def parse_renditions(items):
+    """
+    Normalizează lista de variante cerute.
+
+    Fiecare element este numele unui preset ('1080p', '720p', 'vertical', ...) sau un dicționar
+    cu 'height' și, opțional, 'name' și 'aspect' ('9:16' = decupare centrată la acest raport).
+
+    Returns:
+        list: Dicționare {'name', 'height', 'aspect'}
+
+    Raises:
+        ValueError: Dacă lista este goală, prea lungă sau conține variante invalide
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("'renditions' must be a non-empty list")
+    if len(items) > MAX_RENDITIONS:
+        raise ValueError(f"At most {MAX_RENDITIONS} renditions per request")
+
+    renditions = []
+    for item in items:
+        if isinstance(item, str):
+            if item not in RENDITION_PRESETS:
+                raise ValueError(f"Unknown rendition '{item}' (available: {', '.join(RENDITION_PRESETS)})")
+            item = dict(RENDITION_PRESETS[item], name=item)
+        elif not isinstance(item, dict):
+            raise ValueError("Each rendition must be a preset name or an object")
+
+        try:
+            height = int(item.get('height', 0))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid rendition height: {item.get('height')}")
+        if not 144 <= height <= 4320:
+            raise ValueError(f"Invalid rendition height: {height}")
+        aspect = item.get('aspect')
+        if aspect:
+            _parse_aspect(aspect)
+        renditions.append({'name': str(item.get('name') or f"{height}p"), 'height': height, 'aspect': aspect})
+
+    names = [rendition['name'] for rendition in renditions]
+    if len(set(names)) != len(names):
+        raise ValueError("Rendition names must be unique")
+    return renditions
+
+
+def rendition_geometry(rendition, source_width, source_height):
+    """
+    Geometria ramurii: decuparea din sursă (sau None) și dimensiunea finală.
+
+    Fără 'aspect' se păstrează raportul sursei și nu se mărește video-ul; cu 'aspect' se decupează
+    centrat zona cea mai mare cu acel raport, scalată la înălțimea cerută.
+
+    Returns:
+        dict: {'crop': (w, h) sau None, 'width', 'height'}
+    """
+    aspect = rendition.get('aspect')
+    if not aspect:
+        height = _even(min(rendition['height'], source_height))
+        return {'crop': None, 'width': _even(source_width * height / source_height), 'height': height}
+
+    aspect_width, aspect_height = _parse_aspect(aspect)
+    ratio = aspect_width / aspect_height
+    if source_width / source_height > ratio:
+        crop = (_even(source_height * ratio), _even(source_height))
+    else:
+        crop = (_even(source_width), _even(source_width / ratio))
+    height = _even(rendition['height'])
+    return {'crop': crop, 'width': _even(height * ratio), 'height': height}
+
+
+def filter_graph(branches, fonts_dir='/usr/share/fonts'):
+    """
+    Graful de filtre: o decodare, `split` în N ramuri, decupare/scalare și `ass` pe fiecare.
+
+    Subtitrările se ard după scalare, deci fiecare ASS este randat direct la rezoluția ramurii.
+
+    Args:
+        branches (list): Dicționare cu 'crop', 'width', 'height' și 'ass_path'
+
+    Returns:
+        str: Valoarea pentru -filter_complex; ieșirile se numesc [out0], [out1], ...
+    """
+    labels = ''.join(f"[split{index}]" for index in range(len(branches)))
+    chains = [f"[0:v]split={len(branches)}{labels}"]
+    for index, branch in enumerate(branches):
+        filters = []
+        if branch['crop']:
+            crop_width, crop_height = branch['crop']
+            filters.append(f"crop={crop_width}:{crop_height}:(iw-{crop_width})/2:(ih-{crop_height})/2")
+        filters.append(f"scale={branch['width']}:{branch['height']}")
+        filters.append("setsar=1")
+        filters.append(f"ass={branch['ass_path']}:fontsdir={fonts_dir}")
+        chains.append(f"[split{index}]{','.join(filters)}[out{index}]")
+    return ';'.join(chains)
+
+
+def rendition_command(input_path, branches, encoder_args, audio_args, threads, fonts_dir='/usr/share/fonts'):
+    """
+    Comanda ffmpeg cu câte o ieșire per ramură; audio-ul sursei este mapat în fiecare ieșire.
+
+    Args:
+        branches (list): Dicționare cu geometria, 'ass_path' și 'output_path'
+        threads (int): Thread-urile encoderelor, împărțite între ieșiri
+    """
+    command = [
+        'ffmpeg', '-y',
+        '-i', input_path,
+        '-filter_complex', filter_graph(branches, fonts_dir),
+    ]
+    output_threads = max(1, threads // len(branches))
+    for index, branch in enumerate(branches):
+        command.extend([
+            '-map', f"[out{index}]", '-map', '0:a?',
+            *encoder_args,
+            *audio_args,
+            '-threads', str(output_threads),
+            branch['output_path']
+        ])
+    return command
+
+
+def render_renditions(input_path, branches, cpu_allocation, token, encoder_args, audio_args, threads,
+                      duration=None, fonts_dir='/usr/share/fonts', progress_callback=None):
+    """
+    Randează toate variantele într-un singur proces ffmpeg.
+
+    Args:
+        branches (list): Din `rendition_geometry`, completate cu 'ass_path' și 'output_path'
+        cpu_allocation (CpuAllocation): Nucleele job-ului (afinitatea procesului ffmpeg)
+        token (CancellationToken): Procesul și fișierele de ieșire se înregistrează pe el
+        duration (float): Durata sursei, pentru progres
+        progress_callback (callable): Primește telemetria codării (`EncodeProgress.snapshot`)
+
+    Raises:
+        RuntimeError: Dacă ffmpeg eșuează
+    """
+    for branch in branches:
+        token.register_file(branch['output_path'])
+
+    command = with_progress(rendition_command(input_path, branches, encoder_args, audio_args, threads, fonts_dir))
+    print(f"Running multi-rendition FFmpeg command: {' '.join(command)}")
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               universal_newlines=True)
+    cpu_allocation.apply_to_process(process.pid)
+    token.register_process(process)
+
+    def report_progress(tracker):
+        if progress_callback:
+            progress_callback(tracker.snapshot())
+
+    stderr_tail = follow_progress(process, token, EncodeProgress(duration), report_progress)
+    token.unregister_process(process)
+    token.raise_if_cancelled()
+    if process.returncode != 0:
+        print(f"FFmpeg multi-rendition error: {stderr_tail}")
+        raise RuntimeError("FFmpeg failed to render the requested renditions")
+
+    for branch in branches:
+        token.release_file(branch['output_path'])
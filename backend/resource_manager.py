@@ -0,0 +1,229 @@
+# backend/resource_manager.py
+# Buget de thread-uri și set de nuclee pentru fiecare job activ (transcriere sau randare)
+# Fără el, fiecare instanță torch și fiecare ffmpeg pornesc câte un thread per nucleu,
+# iar job-urile concurente se sufocă reciproc (oversubscription).
+# Conține și estimările de memorie folosite de coadă pentru admiterea job-urilor.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Estimările vârfului de RSS al unui job (MB), folosite pentru admiterea în coadă
+JOB_BASE_MEMORY_MB = 150                # Interpretor, buffere, ffmpeg de extragere audio
+INFERENCE_MEMORY_FACTOR = 0.25          # Activări și kv-cache, ca fracție din greutățile modelului
+AUDIO_BYTES_PER_SECOND = 16000 * 4      # PCM float32 16 kHz
+AUDIO_COPIES = 3                        # Semnalul, varianta cu padding și mel-ul / audio-ul compactat de VAD
+RENDER_FRAMES_IN_FLIGHT = 60            # Lookahead x264 + cadre de referință + filtrul de subtitrări
+RENDER_BYTES_PER_PIXEL = 1.5            # YUV 4:2:0
+
+
+def available_cpus():
+    """Nucleele pe care procesul are voie să ruleze (respectă limitele containerului)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def set_thread_affinity(cores):
+    """Fixează thread-ul curent pe `cores` (pid 0 = thread-ul apelant pe Linux); fără efect în rest."""
+    if not cores or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        print(f"Could not set CPU affinity {cores}: {e}")
+
+
+def estimate_transcription_memory_mb(model_memory_mb, duration_seconds, workers=1):
+    """
+    Estimează vârful de memorie al unei transcrieri.
+
+    Greutățile sunt incluse mereu; cât timp modelul este în pool, coada le scade din
+    estimare (`resident_memory`), fiindcă sunt numărate deja în memoria de bază.
+
+    Args:
+        model_memory_mb (float): Memoria greutăților modelului
+        duration_seconds (float): Durata audio-ului
+        workers (int): Procesele care încarcă fiecare propriul model (transcrierea pe bucăți)
+
+    Returns:
+        float: Memoria estimată în MB
+    """
+    weights_mb = model_memory_mb * workers
+    inference_mb = model_memory_mb * INFERENCE_MEMORY_FACTOR * workers
+    audio_mb = (duration_seconds or 0.0) * AUDIO_BYTES_PER_SECOND * AUDIO_COPIES / (1024 * 1024)
+    return JOB_BASE_MEMORY_MB + weights_mb + inference_mb + audio_mb
+
+
+def estimate_render_memory_mb(width, height, workers=1):
+    """
+    Estimează vârful de memorie al randării (crește cu rezoluția și cu numărul de procese ffmpeg).
+
+    Args:
+        width (int): Lățimea video-ului
+        height (int): Înălțimea video-ului
+        workers (int): Procesele ffmpeg care codează simultan (randarea paralelă pe segmente)
+
+    Returns:
+        float: Memoria estimată în MB
+    """
+    frame_mb = width * height * RENDER_BYTES_PER_PIXEL / (1024 * 1024)
+    return JOB_BASE_MEMORY_MB + frame_mb * RENDER_FRAMES_IN_FLIGHT * max(1, workers)
+
+
+def estimate_renditions_memory_mb(source_width, source_height, output_sizes):
+    """
+    Estimează vârful de memorie al randării mai multor variante într-un singur proces ffmpeg:
+    cadrele decodate ale sursei plus cadrele din fiecare ramură (scalare, subtitrări, encoder).
+
+    Args:
+        output_sizes (list): Dimensiunile (lățime, înălțime) ale variantelor
+
+    Returns:
+        float: Memoria estimată în MB
+    """
+    pixels = source_width * source_height + sum(width * height for width, height in output_sizes)
+    return JOB_BASE_MEMORY_MB + pixels * RENDER_BYTES_PER_PIXEL / (1024 * 1024) * RENDER_FRAMES_IN_FLIGHT
+
+
+class CpuAllocation:
+    """Nucleele și numărul de thread-uri alocate unui job."""
+
+    def __init__(self, job_id, kind, cores):
+        self.job_id = job_id
+        self.kind = kind
+        self.cores = list(cores)
+        self.threads = len(self.cores)
+        self.allocated_at = time.time()
+        self.applied_to_thread = False
+
+    def ffmpeg_args(self):
+        """Argumentele care limitează thread-urile ffmpeg la bugetul job-ului."""
+        return ['-threads', str(self.threads)]
+
+    def apply_to_current_thread(self):
+        """
+        Aplică bugetul pe thread-ul curent: afinitate și thread-uri intra-op torch.
+
+        Afinitatea este per thread, dar `torch.set_num_threads` schimbă și numărul de thread-uri
+        al întregului proces: job-urile concurente îl suprascriu reciproc, iar ultimul job pornit
+        îl stabilește pentru toate. Afinitatea ține totuși fiecare job pe nucleele lui.
+        """
+        set_thread_affinity(self.cores)
+        self.applied_to_thread = True
+        try:
+            import torch
+            torch.set_num_threads(self.threads)
+        except ImportError:
+            pass
+
+    def apply_to_process(self, pid, cores=None):
+        """
+        Fixează un proces copil (ex: ffmpeg) pe nucleele job-ului (sau pe subsetul `cores`
+        primit din `split`); thread-urile lui noi le moștenesc.
+        """
+        if not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            os.sched_setaffinity(pid, cores or self.cores)
+        except OSError as e:
+            print(f"Could not set CPU affinity for process {pid}: {e}")
+
+    def split(self, parts):
+        """Împarte alocarea între `parts` procese worker: [(nuclee, thread-uri), ...]."""
+        parts = max(1, parts)
+        if len(self.cores) >= parts:
+            groups = [self.cores[index::parts] for index in range(parts)]
+        else:
+            # Mai mulți workeri decât nuclee: workerii împart nucleele job-ului
+            groups = [[self.cores[index % len(self.cores)]] for index in range(parts)]
+        return [(group, len(group)) for group in groups]
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'threads': self.threads,
+            'cores': self.cores,
+            'allocated_at': self.allocated_at,
+        }
+
+
+class ResourceManager:
+    """
+    Împarte nucleele între job-urile active.
+
+    Un job nou primește `total / job-uri active` nuclee (cel puțin `min_threads`): un job
+    pornit pe o mașină liberă le primește pe toate. Nucleele nerezervate de alte job-uri sunt
+    alese primele, deci job-urile care pornesc după ce altele s-au terminat își împart nucleele
+    eliberate; doar dacă acestea nu ajung se completează cu nucleele cele mai puțin încărcate.
+    Alocarea unui job nu se schimbă cât timp rulează: torch și ffmpeg nu își pot micșora
+    thread-urile din mers.
+    """
+
+    def __init__(self, cpus=None, min_threads=1):
+        self.cpus = list(cpus) if cpus else available_cpus()
+        self.min_threads = max(1, min(min_threads, len(self.cpus)))
+        self._allocations = {}
+        self._lock = threading.Lock()
+        self._stats = {'allocations': 0, 'max_concurrent': 0}
+
+    def _core_usage(self):
+        usage = {core: 0 for core in self.cpus}
+        for allocation in self._allocations.values():
+            for core in allocation.cores:
+                usage[core] = usage.get(core, 0) + 1
+        return usage
+
+    def _reserve(self, job_id, kind):
+        with self._lock:
+            active = len(self._allocations) + 1
+            usage = self._core_usage()
+            share = max(self.min_threads, len(self.cpus) // active)
+            free = [core for core in self.cpus if usage[core] == 0]
+            cores = free[:share]
+            if len(cores) < share:
+                # Nu sunt destule nuclee libere: completăm cu cele mai puțin încărcate
+                busy = sorted((core for core in self.cpus if usage[core] > 0), key=lambda core: usage[core])
+                cores = sorted(cores + busy[:share - len(cores)])
+            allocation = CpuAllocation(job_id, kind, cores)
+            self._allocations[job_id] = allocation
+            self._stats['allocations'] += 1
+            self._stats['max_concurrent'] = max(self._stats['max_concurrent'], len(self._allocations))
+        print(f"Resources: {kind} {job_id} -> {allocation.threads} threads on cores {cores} ({active} active jobs)")
+        return allocation
+
+    def _release(self, job_id):
+        with self._lock:
+            self._allocations.pop(job_id, None)
+
+    @contextmanager
+    def allocate(self, job_id, kind='transcription'):
+        """Alocă nuclee pentru durata blocului `with`."""
+        allocation = self._reserve(job_id, kind)
+        try:
+            yield allocation
+        finally:
+            self._release(job_id)
+            # Thread-urile cozii sunt refolosite: următorul job pornește fără restricții
+            if allocation.applied_to_thread:
+                set_thread_affinity(self.cpus)
+
+    def get_allocation(self, job_id):
+        """Alocarea curentă a unui job (dict) sau None dacă nu rulează."""
+        with self._lock:
+            allocation = self._allocations.get(job_id)
+            return allocation.to_dict() if allocation else None
+
+    def stats(self):
+        with self._lock:
+            usage = self._core_usage()
+            return {
+                'cpus': self.cpus,
+                'active_jobs': len(self._allocations),
+                'core_usage': usage,
+                'oversubscribed_cores': sum(1 for count in usage.values() if count > 1),
+                'allocations': {job_id: allocation.to_dict() for job_id, allocation in self._allocations.items()},
+                'total_allocations': self._stats['allocations'],
+                'max_concurrent': self._stats['max_concurrent'],
+            }
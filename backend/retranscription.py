@@ -0,0 +1,113 @@
+# backend/retranscription.py
+# Re-transcrierea doar a unor intervale de timp alese de utilizator (pasaje greșite),
+# eventual cu alt model, și înlocuirea lor în transcrierea existentă.
+# Restul subtitrărilor rămâne neschimbat; structura start/end/text/words se păstrează.
+
+RANGE_PADDING_SECONDS = 0.5   # Audio suplimentar în jurul intervalului, ca Whisper să nu taie cuvinte
+MIN_RANGE_SECONDS = 1.0
+
+
+def merge_ranges(ranges, min_length=MIN_RANGE_SECONDS):
+    """
+    Validează, sortează și unește intervalele suprapuse.
+
+    Args:
+        ranges (list): [{'start': s, 'end': e}, ...] sau [(start, end), ...]
+
+    Returns:
+        list: Intervale (start, end) disjuncte, în ordine
+    """
+    parsed = []
+    for item in ranges:
+        start, end = (item['start'], item['end']) if isinstance(item, dict) else item
+        start, end = max(0.0, float(start)), float(end)
+        if end <= start:
+            raise ValueError(f"Invalid time range {start}-{end}")
+        if end - start < min_length:
+            # Intervalele foarte scurte sunt extinse simetric (Whisper are nevoie de context)
+            center = (start + end) / 2
+            start, end = max(0.0, center - min_length / 2), center + min_length / 2
+        parsed.append((start, end))
+
+    merged = []
+    for start, end in sorted(parsed):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def expand_ranges_to_subtitles(ranges, subtitles):
+    """
+    Extinde fiecare interval până la marginile subtitrărilor pe care le atinge,
+    ca să înlocuim subtitrări întregi (nu jumătăți de frază).
+    """
+    expanded = []
+    for start, end in ranges:
+        for subtitle in subtitles:
+            if subtitle['start'] < end and subtitle['end'] > start:
+                start = min(start, subtitle['start'])
+                end = max(end, subtitle['end'])
+        expanded.append((start, end))
+    return merge_ranges(expanded, min_length=0.0)
+
+
+def clip_segments_to_range(segments, start, end):
+    """
+    Păstrează doar cuvintele cu mijlocul în [start, end] (cu timpii limitați la interval);
+    segmentele rămase sunt recalculate din cuvinte (textul, start și end).
+    """
+    clipped = []
+    for segment in segments:
+        words = segment.get('words') or []
+        if not words:
+            middle = (segment['start'] + segment['end']) / 2
+            if start <= middle <= end:
+                clipped.append(segment)
+            continue
+
+        kept = [dict(word, start=max(start, word['start']), end=min(end, word['end']))
+                for word in words if start <= (word['start'] + word['end']) / 2 <= end]
+        if not kept:
+            continue
+        clipped.append(dict(
+            segment,
+            start=max(start, kept[0]['start']),
+            end=min(end, kept[-1]['end']),
+            text=''.join(word['word'] for word in kept) if len(kept) < len(words) else segment['text'],
+            words=kept,
+        ))
+    return clipped
+
+
+def context_prompt(subtitles, before, max_chars=200):
+    """Textul subtitrărilor dinaintea intervalului, folosit ca `initial_prompt`."""
+    text = ' '.join(subtitle['text'] for subtitle in subtitles if subtitle['end'] <= before)
+    return text[-max_chars:].strip() or None
+
+
+def splice_subtitles(subtitles, replacements):
+    """
+    Înlocuiește subtitrările din fiecare interval cu cele noi.
+
+    Args:
+        subtitles (list): Transcrierea existentă (start/end/text/words)
+        replacements (list): [((start, end), subtitrări_noi), ...]
+
+    Returns:
+        tuple: (subtitrările rezultate sortate după start, numărul de subtitrări eliminate)
+    """
+    kept = []
+    removed = 0
+    for subtitle in subtitles:
+        middle = (subtitle['start'] + subtitle['end']) / 2
+        if any(start <= middle <= end for (start, end), _ in replacements):
+            removed += 1
+        else:
+            kept.append(subtitle)
+
+    for _, new_subtitles in replacements:
+        kept.extend(new_subtitles)
+    kept.sort(key=lambda subtitle: (subtitle['start'], subtitle['end']))
+    return kept, removed
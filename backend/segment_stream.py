@@ -0,0 +1,114 @@
+# backend/segment_stream.py
+# Stream per task cu segmentele transcrise pe măsură ce Whisper le produce
+# Clienții le citesc incremental (SSE sau polling cu `since`) înainte de finalul job-ului
+# Cu un store de task-uri partajat, segmentele sunt scrise și acolo, ca un client servit de alt
+# worker gunicorn decât cel care rulează job-ul să le poată citi.
+
+import threading
+import time
+
+# Stream-urile terminate sunt păstrate o perioadă pentru clienții care citesc cu întârziere
+STREAM_RETENTION_SECONDS = 3600
+STORE_POLL_SECONDS = 0.5   # Cât de des verifică un cititor segmentele unui job din alt worker
+
+
+class _Stream:
+    def __init__(self):
+        self.segments = []
+        self.finished = False
+        self.error = None
+        self.updated_at = time.time()
+
+
+class SegmentStreamRegistry:
+    """
+    Registrul stream-urilor de segmente, indexat după task_id.
+
+    Cu `store` (TaskStore partajat), stream-urile job-urilor acestui worker sunt copiate în store,
+    iar task-urile necunoscute local sunt citite din store.
+    """
+
+    def __init__(self, retention_seconds=STREAM_RETENTION_SECONDS, store=None):
+        self.retention_seconds = retention_seconds
+        self.store = store
+        self._streams = {}
+        self._condition = threading.Condition()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for task_id in [task_id for task_id, stream in self._streams.items()
+                        if stream.finished and stream.updated_at < cutoff]:
+            del self._streams[task_id]
+
+    def open(self, task_id):
+        """Creează (sau resetează) stream-ul unui task."""
+        with self._condition:
+            self._prune()
+            self._streams[task_id] = _Stream()
+            if self.store is not None:
+                self.store.open_segments(task_id)
+
+    def publish(self, task_id, segments):
+        """Adaugă segmente noi (format subtitrare: start/end/text/words) și trezește cititorii."""
+        if not segments:
+            return
+        with self._condition:
+            stream = self._streams.setdefault(task_id, _Stream())
+            if self.store is not None:
+                self.store.append_segments(task_id, len(stream.segments), segments)
+            stream.segments.extend(segments)
+            stream.updated_at = time.time()
+            self._condition.notify_all()
+
+    def finish(self, task_id, error=None):
+        """Marchează stream-ul ca terminat (cu succes sau cu eroare)."""
+        with self._condition:
+            stream = self._streams.setdefault(task_id, _Stream())
+            stream.finished = True
+            stream.error = error
+            stream.updated_at = time.time()
+            if self.store is not None:
+                self.store.finish_segments(task_id, error)
+            self._condition.notify_all()
+
+    def read(self, task_id, since=0):
+        """
+        Returnează segmentele de la indexul `since` încolo.
+
+        Returns:
+            dict: {'segments', 'next', 'finished', 'error'} sau None dacă stream-ul nu există
+        """
+        with self._condition:
+            stream = self._streams.get(task_id)
+            if stream is None:
+                return self.store.read_segments(task_id, since) if self.store is not None else None
+            return {
+                'segments': list(stream.segments[since:]),
+                'next': len(stream.segments),
+                'finished': stream.finished,
+                'error': stream.error,
+            }
+
+    def wait(self, task_id, since=0, timeout=15.0):
+        """Ca `read`, dar așteaptă până apar segmente noi, se termină stream-ul sau expiră timeout-ul."""
+        deadline = time.time() + timeout
+        with self._condition:
+            remote = task_id not in self._streams and self.store is not None
+        if remote:
+            # Job-ul rulează în alt worker: verificăm store-ul periodic
+            while True:
+                partial = self.store.read_segments(task_id, since)
+                if partial is None or partial['finished'] or partial['next'] > since or time.time() >= deadline:
+                    return partial
+                time.sleep(min(STORE_POLL_SECONDS, max(0.0, deadline - time.time())))
+
+        with self._condition:
+            while True:
+                stream = self._streams.get(task_id)
+                if stream is None or stream.finished or len(stream.segments) > since:
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+        return self.read(task_id, since)
@@ -0,0 +1,60 @@
+# backend/soft_subtitles.py
+# Subtitrări "soft": pista de subtitrare este adăugată în container lângă video și audio,
+# copiate fără recodare (-c copy). Durează câteva secunde (doar I/O), iar utilizatorul
+# poate activa/dezactiva subtitrările din player.
+#
+# - mkv: pista ASS generată pentru randare (stilurile și evidențierea cuvintelor se păstrează)
+# - mp4: pista mov_text din SRT-ul subtitrărilor formatate (doar text, fără stiluri)
+
+import subprocess
+
+from ffmpeg_progress import EncodeProgress, follow_progress, with_progress
+
+SOFT_SUBTITLE_CONTAINERS = {
+    'mkv': {'subtitle_format': 'ass', 'codec': 'copy'},
+    'mp4': {'subtitle_format': 'srt', 'codec': 'mov_text'},
+}
+DEFAULT_SOFT_CONTAINER = 'mkv'
+SUBTITLE_LANGUAGE = 'rum'  # ISO 639-2 pentru română
+
+
+def mux_command(input_path, subtitle_path, output_path, container, language=SUBTITLE_LANGUAGE):
+    """
+    Comanda ffmpeg care copiază video-ul și audio-ul și adaugă pista de subtitrare.
+
+    Pista nouă este marcată implicită (default), ca playerele să o afișeze direct.
+    """
+    settings = SOFT_SUBTITLE_CONTAINERS[container]
+    return [
+        'ffmpeg', '-y',
+        '-i', input_path,
+        '-i', subtitle_path,
+        '-map', '0:v:0', '-map', '0:a?', '-map', '1:0',
+        '-c:v', 'copy', '-c:a', 'copy', '-c:s', settings['codec'],
+        '-metadata:s:s:0', f"language={language}",
+        '-disposition:s:0', 'default',
+        output_path
+    ]
+
+
+def mux_subtitles(input_path, subtitle_path, output_path, container, token):
+    """
+    Adaugă pista de subtitrare fără recodare.
+
+    Args:
+        subtitle_path (str): Fișierul ASS (mkv) sau SRT (mp4), după `SOFT_SUBTITLE_CONTAINERS`
+        token (CancellationToken): Procesul ffmpeg este înregistrat pentru anulare și atins la
+            fiecare avans, ca watchdog-ul să nu oprească o copiere lungă
+
+    Raises:
+        RuntimeError: Dacă ffmpeg eșuează (ex: codec-ul sursei nu este acceptat de container)
+    """
+    process = subprocess.Popen(with_progress(mux_command(input_path, subtitle_path, output_path, container)),
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    token.register_process(process)
+    stderr = follow_progress(process, token, EncodeProgress())
+    token.unregister_process(process)
+    token.raise_if_cancelled()
+    if process.returncode != 0:
+        print(f"FFmpeg mux error: {stderr}")
+        raise RuntimeError(f"FFmpeg failed to mux subtitles into {container}")
@@ -0,0 +1,379 @@
+# backend/task_store.py
+# Statusul și rezultatul task-urilor (încărcări, transcrieri, randări), citite de /api/status și
+# /api/result. Implementarea în memorie ajunge pentru un singur proces; cea SQLite (WAL, pe un
+# volum comun) este partajată de mai mulți workeri gunicorn, deci un polling poate ajunge pe
+# orice worker. Task-urile terminate expiră după un TTL, iar actualizările dese de progres ale
+# aceluiași task sunt comasate (se scrie doar ultima, cel mult o dată pe interval).
+# Tot aici sunt segmentele transcrise parțial (SSE / ?since=) și cererile de anulare, ca ele
+# să ajungă la worker-ul care rulează job-ul indiferent de worker-ul care primește cererea.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+TERMINAL_STATES = ('completed', 'error', 'cancelled')
+DEFAULT_TTL_SECONDS = 3600.0          # Cât rămân disponibile task-urile terminate
+DEFAULT_STALE_SECONDS = 24 * 3600.0   # Task-uri neterminate fără nicio actualizare (worker oprit)
+PURGE_INTERVAL_SECONDS = 60.0
+
+
+class TaskStore:
+    """
+    Logica comună: comasarea scrierilor de progres și expirarea task-urilor.
+
+    Subclasele implementează stocarea (`_write_status`, `_read_status`, `_write_result`,
+    `_read_result`, `_purge`, segmentele și cererile de anulare); toate sunt apelate sub
+    lock-ul store-ului. `shared` spune dacă store-ul este văzut și de alți workeri.
+    """
+
+    shared = False
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, write_interval=0.0, stale_seconds=DEFAULT_STALE_SECONDS):
+        """
+        Args:
+            ttl_seconds (float): Cât rămân disponibile statusul și rezultatul unui task terminat
+            write_interval (float): Intervalul minim între două scrieri de progres ale aceluiași task
+                (0 = fiecare actualizare se scrie imediat)
+            stale_seconds (float): După cât timp fără actualizări expiră un task neterminat
+        """
+        self.ttl_seconds = ttl_seconds
+        self.write_interval = write_interval
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._pending = {}      # task_id -> statusul comasat, încă nescris
+        self._last_write = {}   # task_id -> (starea, momentul ultimei scrieri), pentru task-urile active
+        self._last_purge = time.time()
+        self._stats = {'writes': 0, 'coalesced': 0, 'purges': 0}
+        if write_interval > 0:
+            threading.Thread(target=self._flush_loop, name='task-store-flush', daemon=True).start()
+
+    def _expires_at(self, state, now):
+        return now + (self.ttl_seconds if state in TERMINAL_STATES else self.stale_seconds)
+
+    def update_status(self, task_id, status):
+        """
+        Salvează statusul task-ului ({'status', 'progress', 'message', ...}).
+
+        Actualizările care nu schimbă starea și vin la mai puțin de `write_interval` după
+        scrierea precedentă sunt comasate; trecerile de stare se scriu imediat.
+
+        Returns:
+            bool: True dacă starea task-ului s-a schimbat (util pentru loguri)
+        """
+        now = time.time()
+        state = status.get('status')
+        with self._lock:
+            last = self._last_write.get(task_id)
+            changed = last is None or last[0] != state
+            if not changed and state not in TERMINAL_STATES and now - last[1] < self.write_interval:
+                self._pending[task_id] = status
+                self._stats['coalesced'] += 1
+                return False
+            self._pending.pop(task_id, None)
+            self._write(task_id, status, now)
+            if now - self._last_purge > PURGE_INTERVAL_SECONDS:
+                self._purge_expired(now)
+        return changed
+
+    def _write(self, task_id, status, now):
+        state = status.get('status')
+        if state in TERMINAL_STATES:
+            self._last_write.pop(task_id, None)
+        else:
+            self._last_write[task_id] = (state, now)
+        self._write_status(task_id, status, self._expires_at(state, now))
+        self._stats['writes'] += 1
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.write_interval)
+            self.flush()
+
+    def flush(self):
+        """Scrie actualizările comasate care încă așteaptă."""
+        now = time.time()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for task_id, status in pending.items():
+                self._write(task_id, status, now)
+
+    def _purge_expired(self, now):
+        self._purge(now)
+        for task_id, (_, written_at) in list(self._last_write.items()):
+            if now - written_at > self.stale_seconds:
+                del self._last_write[task_id]
+        self._last_purge = now
+        self._stats['purges'] += 1
+
+    def get_status(self, task_id):
+        """Ultimul status al task-ului sau None dacă nu există (sau a expirat)."""
+        with self._lock:
+            status = self._pending.get(task_id)
+            return dict(status) if status is not None else self._read_status(task_id, time.time())
+
+    def set_result(self, task_id, entry):
+        """Salvează starea job-ului din coadă ({'state', 'result'/'error', ...})."""
+        now = time.time()
+        with self._lock:
+            self._write_result(task_id, entry, self._expires_at(entry.get('state'), now))
+
+    def get_result(self, task_id):
+        """Starea job-ului sau None dacă nu există (sau a expirat)."""
+        with self._lock:
+            return self._read_result(task_id, time.time())
+
+    def request_cancel(self, task_id):
+        """Cere anularea unui job din coada altui worker (acesta verifică periodic cererile)."""
+        with self._lock:
+            self._write_cancel_request(task_id, time.time())
+
+    def take_cancel_requests(self, task_ids):
+        """Task-urile din `task_ids` (job-urile acestui worker) cu anulare cerută; cererile sunt consumate."""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        with self._lock:
+            return self._take_cancel_requests(task_ids)
+
+    def open_segments(self, task_id):
+        """Creează (sau golește) lista de segmente parțiale a task-ului."""
+        with self._lock:
+            self._open_segments(task_id)
+
+    def append_segments(self, task_id, start_index, segments):
+        """Adaugă segmentele publicate, numerotate de la `start_index`."""
+        with self._lock:
+            self._append_segments(task_id, start_index, segments)
+
+    def finish_segments(self, task_id, error=None):
+        """Marchează lista de segmente ca terminată (cu succes sau cu eroare)."""
+        with self._lock:
+            self._finish_segments(task_id, error)
+
+    def read_segments(self, task_id, since=0):
+        """
+        Segmentele de la indexul `since` încolo.
+
+        Returns:
+            dict: {'segments', 'next', 'finished', 'error'} sau None dacă task-ul nu are segmente
+        """
+        with self._lock:
+            return self._read_segments(task_id, since)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, backend=self.backend, pending_writes=len(self._pending),
+                        active_tasks=len(self._last_write), ttl_seconds=self.ttl_seconds,
+                        write_interval=self.write_interval)
+
+
+class MemoryTaskStore(TaskStore):
+    """Task-urile în dicționare din memoria procesului (un singur worker)."""
+
+    backend = 'memory'
+
+    def __init__(self, **kwargs):
+        self._statuses = {}   # task_id -> (status, expires)
+        self._results = {}    # task_id -> (entry, expires)
+        self._segments = {}   # task_id -> {'segments', 'finished', 'error'}
+        self._cancel_requests = set()
+        super().__init__(**kwargs)
+
+    def _write_status(self, task_id, status, expires):
+        self._statuses[task_id] = (dict(status), expires)
+
+    def _read_status(self, task_id, now):
+        status, expires = self._statuses.get(task_id, (None, 0.0))
+        return dict(status) if status is not None and expires > now else None
+
+    def _write_result(self, task_id, entry, expires):
+        self._results[task_id] = (dict(entry), expires)
+
+    def _read_result(self, task_id, now):
+        entry, expires = self._results.get(task_id, (None, 0.0))
+        return dict(entry) if entry is not None and expires > now else None
+
+    def _write_cancel_request(self, task_id, requested_at):
+        self._cancel_requests.add(task_id)
+
+    def _take_cancel_requests(self, task_ids):
+        taken = [task_id for task_id in task_ids if task_id in self._cancel_requests]
+        self._cancel_requests.difference_update(taken)
+        return taken
+
+    def _open_segments(self, task_id):
+        self._segments[task_id] = {'segments': [], 'finished': False, 'error': None}
+
+    def _append_segments(self, task_id, start_index, segments):
+        stream = self._segments.setdefault(task_id, {'segments': [], 'finished': False, 'error': None})
+        stream['segments'][start_index:] = [dict(segment) for segment in segments]
+
+    def _finish_segments(self, task_id, error):
+        stream = self._segments.setdefault(task_id, {'segments': [], 'finished': False, 'error': None})
+        stream.update(finished=True, error=error)
+
+    def _read_segments(self, task_id, since):
+        stream = self._segments.get(task_id)
+        if stream is None:
+            return None
+        return {'segments': [dict(segment) for segment in stream['segments'][since:]],
+                'next': len(stream['segments']), 'finished': stream['finished'], 'error': stream['error']}
+
+    def _purge(self, now):
+        for records in (self._statuses, self._results):
+            for task_id in [task_id for task_id, (_, expires) in records.items() if expires <= now]:
+                del records[task_id]
+        live = set(self._statuses) | set(self._results)
+        for task_id in [task_id for task_id in self._segments if task_id not in live]:
+            del self._segments[task_id]
+        self._cancel_requests &= live
+
+
+class SqliteTaskStore(TaskStore):
+    """
+    Task-urile într-o bază SQLite în modul WAL (cititorii nu blochează scrierile), pe un volum
+    comun tuturor workerilor. Fiecare thread are propria conexiune; căutarea se face după cheia primară.
+    """
+
+    backend = 'sqlite'
+    shared = True
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            ' task_id TEXT PRIMARY KEY,'
+            ' status TEXT, status_expires REAL,'
+            ' result TEXT, result_expires REAL)'
+        )
+        connection.execute('CREATE TABLE IF NOT EXISTS cancel_requests (task_id TEXT PRIMARY KEY, requested_at REAL)')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS segment_streams (task_id TEXT PRIMARY KEY, finished INTEGER, error TEXT)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS segments ('
+            ' task_id TEXT, seq INTEGER, segment TEXT,'
+            ' PRIMARY KEY (task_id, seq))'
+        )
+        super().__init__(**kwargs)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _write_status(self, task_id, status, expires):
+        self._connection().execute(
+            'INSERT INTO tasks (task_id, status, status_expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(task_id) DO UPDATE SET status = excluded.status, status_expires = excluded.status_expires',
+            (task_id, json.dumps(status, default=str), expires)
+        )
+
+    def _read_column(self, task_id, column, now):
+        row = self._connection().execute(
+            f'SELECT {column}, {column}_expires FROM tasks WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        if row is None or row[0] is None or row[1] <= now:
+            return None
+        return json.loads(row[0])
+
+    def _read_status(self, task_id, now):
+        return self._read_column(task_id, 'status', now)
+
+    def _write_result(self, task_id, entry, expires):
+        self._connection().execute(
+            'INSERT INTO tasks (task_id, result, result_expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(task_id) DO UPDATE SET result = excluded.result, result_expires = excluded.result_expires',
+            (task_id, json.dumps(entry, default=str), expires)
+        )
+
+    def _read_result(self, task_id, now):
+        return self._read_column(task_id, 'result', now)
+
+    def _write_cancel_request(self, task_id, requested_at):
+        self._connection().execute(
+            'INSERT OR REPLACE INTO cancel_requests (task_id, requested_at) VALUES (?, ?)', (task_id, requested_at)
+        )
+
+    def _take_cancel_requests(self, task_ids):
+        connection = self._connection()
+        placeholders = ','.join('?' * len(task_ids))
+        taken = [row[0] for row in connection.execute(
+            f'SELECT task_id FROM cancel_requests WHERE task_id IN ({placeholders})', task_ids
+        )]
+        if taken:
+            connection.execute(f"DELETE FROM cancel_requests WHERE task_id IN ({','.join('?' * len(taken))})", taken)
+        return taken
+
+    def _open_segments(self, task_id):
+        connection = self._connection()
+        connection.execute('BEGIN')
+        connection.execute('DELETE FROM segments WHERE task_id = ?', (task_id,))
+        connection.execute('INSERT OR REPLACE INTO segment_streams (task_id, finished, error) VALUES (?, 0, NULL)',
+                           (task_id,))
+        connection.execute('COMMIT')
+
+    def _append_segments(self, task_id, start_index, segments):
+        connection = self._connection()
+        connection.execute('BEGIN')
+        connection.execute('INSERT OR IGNORE INTO segment_streams (task_id, finished, error) VALUES (?, 0, NULL)',
+                           (task_id,))
+        connection.executemany(
+            'INSERT OR REPLACE INTO segments (task_id, seq, segment) VALUES (?, ?, ?)',
+            [(task_id, start_index + offset, json.dumps(segment, default=str))
+             for offset, segment in enumerate(segments)]
+        )
+        connection.execute('COMMIT')
+
+    def _finish_segments(self, task_id, error):
+        self._connection().execute(
+            'INSERT OR REPLACE INTO segment_streams (task_id, finished, error) VALUES (?, 1, ?)', (task_id, error)
+        )
+
+    def _read_segments(self, task_id, since):
+        connection = self._connection()
+        stream = connection.execute(
+            'SELECT finished, error FROM segment_streams WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        if stream is None:
+            return None
+        rows = connection.execute(
+            'SELECT segment FROM segments WHERE task_id = ? AND seq >= ? ORDER BY seq', (task_id, since)
+        ).fetchall()
+        total = connection.execute('SELECT COUNT(*) FROM segments WHERE task_id = ?', (task_id,)).fetchone()[0]
+        return {'segments': [json.loads(row[0]) for row in rows], 'next': total,
+                'finished': bool(stream[0]), 'error': stream[1]}
+
+    def _purge(self, now):
+        connection = self._connection()
+        connection.execute(
+            'DELETE FROM tasks WHERE COALESCE(status_expires, 0) <= ? AND COALESCE(result_expires, 0) <= ?',
+            (now, now)
+        )
+        for table in ('segments', 'segment_streams', 'cancel_requests'):
+            connection.execute(f'DELETE FROM {table} WHERE task_id NOT IN (SELECT task_id FROM tasks)')
+
+
+def create_task_store(backend='memory', path=None, ttl_seconds=DEFAULT_TTL_SECONDS, write_interval=0.0):
+    """
+    Store-ul configurat: 'memory' (un singur proces) sau 'sqlite' (partajat între workeri).
+
+    Raises:
+        ValueError: Dacă backend-ul nu există sau lipsește calea bazei SQLite
+    """
+    if backend == 'memory':
+        return MemoryTaskStore(ttl_seconds=ttl_seconds, write_interval=write_interval)
+    if backend == 'sqlite':
+        if not path:
+            raise ValueError("The sqlite task store needs a database path")
+        return SqliteTaskStore(path, ttl_seconds=ttl_seconds, write_interval=write_interval)
+    raise ValueError(f"Unknown task store '{backend}' (available: memory, sqlite)")
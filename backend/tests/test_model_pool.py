@@ -0,0 +1,60 @@
+# backend/tests/test_model_pool.py
+# Bugetul de memorie comun pool-urilor celor două motoare de transcriere.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_pool import ModelPool  # noqa: E402
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def state_dict(self):
+        return {}
+
+
+def make_pools(budget_mb=2500, model_mb=1000):
+    whisper_pool = ModelPool(FakeModel, budget_mb, estimator=lambda name: model_mb)
+    faster_pool = ModelPool(FakeModel, estimator=lambda name: model_mb, share_budget_with=whisper_pool)
+    return whisper_pool, faster_pool
+
+
+def test_shared_pool_inherits_budget():
+    whisper_pool, faster_pool = make_pools()
+    assert faster_pool.memory_budget_mb == whisper_pool.memory_budget_mb == 2500
+
+
+def test_loading_evicts_least_recently_used_model_from_either_pool():
+    whisper_pool, faster_pool = make_pools()
+    whisper_pool.get('base')
+    time.sleep(0.01)
+    faster_pool.get('small')
+    time.sleep(0.01)
+    faster_pool.get('medium')
+
+    assert not whisper_pool.is_loaded('base')
+    assert faster_pool.loaded_models() == ['small', 'medium']
+    assert whisper_pool.stats()['evictions'] == 1
+    assert whisper_pool.memory_used_mb() + faster_pool.memory_used_mb() <= 2500
+
+
+def test_leased_model_of_other_pool_is_not_evicted():
+    whisper_pool, faster_pool = make_pools(budget_mb=1500)
+    with whisper_pool.lease('base'):
+        faster_pool.get('small')
+        assert whisper_pool.is_loaded('base')
+        assert faster_pool.stats()['budget_used_mb'] == 2000
+
+
+def test_separate_budgets_do_not_interact():
+    whisper_pool = ModelPool(FakeModel, 1000, estimator=lambda name: 1000)
+    faster_pool = ModelPool(FakeModel, 1000, estimator=lambda name: 1000)
+    whisper_pool.get('base')
+    faster_pool.get('small')
+    assert whisper_pool.is_loaded('base')
+    assert not faster_pool.stats()['shares_budget']
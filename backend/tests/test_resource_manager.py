@@ -0,0 +1,42 @@
+# backend/tests/test_resource_manager.py
+# Împărțirea nucleelor între job-urile active.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resource_manager import ResourceManager  # noqa: E402
+
+CPUS = list(range(8))
+
+
+def test_lone_job_gets_every_core():
+    manager = ResourceManager(cpus=CPUS)
+    with manager.allocate('job-1') as allocation:
+        assert allocation.cores == CPUS
+        assert allocation.threads == len(CPUS)
+        assert allocation.ffmpeg_args() == ['-threads', '8']
+
+
+def test_share_follows_active_jobs():
+    manager = ResourceManager(cpus=CPUS)
+    with manager.allocate('job-1'):
+        with manager.allocate('job-2') as second:
+            assert second.threads == 4
+
+
+def test_new_job_prefers_cores_freed_by_finished_jobs():
+    manager = ResourceManager(cpus=CPUS)
+    manager._reserve('job-1', 'render')
+    second = manager._reserve('job-2', 'transcription')
+    manager._release('job-1')
+    third = manager._reserve('job-3', 'transcription')
+    assert third.threads == 4
+    assert set(third.cores).isdisjoint(second.cores)
+
+
+def test_min_threads_is_respected():
+    manager = ResourceManager(cpus=CPUS, min_threads=3)
+    allocations = [manager._reserve(f"job-{index}", 'render') for index in range(6)]
+    assert all(allocation.threads >= 3 for allocation in allocations)
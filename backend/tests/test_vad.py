@@ -0,0 +1,46 @@
+# backend/tests/test_vad.py
+# Maparea timpilor din audio-ul compactat (doar vorbire) înapoi pe axa originală.
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad import SpeechTimeline  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def _timeline():
+    """Zonele de vorbire 0-10s și 70-80s dintr-un audio de 90s."""
+    audio = np.zeros(90 * SAMPLE_RATE, dtype=np.float32)
+    spans = [(0, 10 * SAMPLE_RATE), (70 * SAMPLE_RATE, 80 * SAMPLE_RATE)]
+    return SpeechTimeline(audio, spans, SAMPLE_RATE)
+
+
+def test_boundary_start_maps_to_next_span():
+    assert _timeline().to_original(10.0) == 70.0
+
+
+def test_boundary_end_maps_to_previous_span():
+    assert _timeline().to_original(10.0, is_end=True) == 10.0
+
+
+def test_segment_ending_on_boundary_does_not_cover_removed_silence():
+    segments = [
+        {'start': 5.0, 'end': 10.0, 'words': [{'start': 8.0, 'end': 10.0}]},
+        {'start': 10.0, 'end': 12.5, 'words': [{'start': 10.0, 'end': 12.5}]},
+    ]
+    _timeline().remap_segments(segments)
+    assert (segments[0]['start'], segments[0]['end']) == (5.0, 10.0)
+    assert (segments[0]['words'][0]['start'], segments[0]['words'][0]['end']) == (8.0, 10.0)
+    assert (segments[1]['start'], segments[1]['end']) == (70.0, 72.5)
+    assert (segments[1]['words'][0]['start'], segments[1]['words'][0]['end']) == (70.0, 72.5)
+
+
+def test_zero_length_segment_on_boundary_keeps_end_after_start():
+    segments = [{'start': 10.0, 'end': 10.0}]
+    _timeline().remap_segments(segments)
+    assert segments[0]['end'] >= segments[0]['start']
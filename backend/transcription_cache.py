@@ -0,0 +1,134 @@
+# backend/transcription_cache.py
+# Cache persistent pentru rezultatele brute Whisper (înainte de format_srt_with_auto_lines)
+# Cheia este hash-ul audio-ului decodat (PCM) + modelul + limba + opțiunile de transcriere,
+# astfel încât reformatarea aceluiași fișier (ex: alt maxLines) nu mai rulează Whisper.
+
+import hashlib
+import json
+import os
+import threading
+import time
+import wave
+from collections import OrderedDict
+
+HASH_BLOCK_FRAMES = 1024 * 1024
+
+
+def hash_audio_pcm(audio_path):
+    """
+    Calculează SHA-256 peste eșantioanele PCM ale unui fișier WAV (fără header).
+
+    Două extrageri ale aceluiași audio dau același hash chiar dacă header-ul WAV diferă.
+    """
+    digest = hashlib.sha256()
+    with wave.open(audio_path, 'rb') as wav_file:
+        digest.update(f"{wav_file.getframerate()}:{wav_file.getnchannels()}:{wav_file.getsampwidth()}".encode())
+        block = wav_file.readframes(HASH_BLOCK_FRAMES)
+        while block:
+            digest.update(block)
+            block = wav_file.readframes(HASH_BLOCK_FRAMES)
+    return digest.hexdigest()
+
+
+def make_cache_key(audio_hash, model_name, language, word_timestamps, **options):
+    """Construiește cheia de cache din hash-ul audio și opțiunile care influențează rezultatul."""
+    key_data = {
+        'audio': audio_hash,
+        'model': model_name,
+        'language': language,
+        'word_timestamps': bool(word_timestamps),
+    }
+    key_data.update({name: value for name, value in options.items() if value is not None})
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+class TranscriptionCache:
+    """
+    Cache pe disc (un fișier JSON per intrare) cu evacuare LRU.
+
+    Ordinea LRU se reconstruiește la pornire din mtime-ul fișierelor; la fiecare
+    hit mtime-ul este actualizat.
+    """
+
+    def __init__(self, cache_dir, max_entries=200, max_size_mb=500):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> dimensiunea fișierului
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        existing = []
+        for name in os.listdir(cache_dir):
+            if name.endswith('.json'):
+                path = os.path.join(cache_dir, name)
+                stat = os.stat(path)
+                existing.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+        print(f"Transcription cache: {len(self._entries)} entries in {cache_dir}")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returnează intrarea din cache ({'subtitles', 'model', ...}) sau None."""
+        with self._lock:
+            if key not in self._entries:
+                self._stats['misses'] += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as cache_file:
+                    entry = json.load(cache_file)
+                os.utime(path, None)
+            except (OSError, ValueError) as e:
+                print(f"Transcription cache: dropping unreadable entry {key}: {e}")
+                self._entries.pop(key, None)
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def put(self, key, subtitles, **metadata):
+        """Salvează subtitrările brute (segmente cu timing pe cuvinte) pentru cheia dată."""
+        entry = dict(metadata, subtitles=subtitles, created_at=time.time())
+        data = json.dumps(entry, ensure_ascii=False)
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, path)
+            self._entries[key] = os.path.getsize(path)
+            self._entries.move_to_end(key)
+            self._stats['stores'] += 1
+            self._evict()
+
+    def _evict(self):
+        total_size = sum(self._entries.values())
+        while self._entries and (len(self._entries) > self.max_entries or total_size > self.max_size_bytes):
+            key, size = self._entries.popitem(last=False)
+            total_size -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'entries': len(self._entries),
+                'size_mb': round(sum(self._entries.values()) / (1024 * 1024), 2),
+                'max_entries': self.max_entries,
+                'max_size_mb': round(self.max_size_bytes / (1024 * 1024), 2),
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                'stores': self._stats['stores'],
+                'evictions': self._stats['evictions'],
+            }
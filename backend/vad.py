@@ -0,0 +1,140 @@
+# backend/vad.py
+# Pre-procesare VAD (detecție de vorbire pe bază de energie, vectorizată cu NumPy)
+# Zonele fără vorbire (liniște, pauze lungi) sunt eliminate înainte de Whisper, iar
+# timestamp-urile segmentelor și ale cuvintelor sunt mapate înapoi pe axa originală.
+
+import hashlib
+
+import numpy as np
+
+from chunked_transcription import SAMPLE_RATE, compute_frame_energy
+
+VAD_FRAME_MS = 30
+VAD_MARGIN_DB = 12.0        # Cât peste zgomotul de fond trebuie să fie vorbirea
+VAD_MIN_THRESHOLD_DB = -50.0
+VAD_MIN_SPEECH_MS = 250     # Zonele de vorbire mai scurte sunt ignorate
+VAD_MIN_SILENCE_MS = 1500   # Pauzele mai scurte rămân în audio (nu tăiem în mijlocul frazei)
+VAD_PAD_MS = 300            # Marjă păstrată în jurul fiecărei zone de vorbire
+
+
+def _runs(mask):
+    """Returnează intervalele [start, end) în care `mask` este True."""
+    padded = np.concatenate(([False], mask, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    return changes.reshape(-1, 2)
+
+
+def detect_speech_spans(audio, sample_rate=SAMPLE_RATE, margin_db=VAD_MARGIN_DB,
+                        min_speech_ms=VAD_MIN_SPEECH_MS, min_silence_ms=VAD_MIN_SILENCE_MS,
+                        pad_ms=VAD_PAD_MS):
+    """
+    Detectează zonele de vorbire pe baza energiei cu prag adaptiv.
+
+    Pragul este zgomotul de fond estimat (percentila 10 a energiei în dB) plus `margin_db`.
+
+    Returns:
+        list: Intervalele (start_sample, end_sample) care conțin vorbire
+    """
+    energy = compute_frame_energy(audio, sample_rate, VAD_FRAME_MS)
+    if len(energy) == 0:
+        return []
+
+    frame_length = int(sample_rate * VAD_FRAME_MS / 1000)
+    energy_db = 20 * np.log10(np.maximum(energy, 1e-10))
+    noise_floor_db = np.percentile(energy_db, 10)
+    threshold_db = max(VAD_MIN_THRESHOLD_DB, noise_floor_db + margin_db)
+    speech = energy_db > threshold_db
+
+    # Umplem pauzele scurte dintre zonele de vorbire
+    min_silence_frames = int(min_silence_ms / VAD_FRAME_MS)
+    for start, end in _runs(~speech):
+        if start > 0 and end < len(speech) and end - start < min_silence_frames:
+            speech[start:end] = True
+
+    # Eliminăm zonele de vorbire prea scurte (clicuri, zgomote izolate)
+    min_speech_frames = int(min_speech_ms / VAD_FRAME_MS)
+    pad_frames = int(pad_ms / VAD_FRAME_MS)
+    spans = []
+    for start, end in _runs(speech):
+        if end - start < min_speech_frames:
+            continue
+        start = max(0, start - pad_frames)
+        end = min(len(speech), end + pad_frames)
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+
+    total_samples = len(audio)
+    return [(start * frame_length, min(total_samples, end * frame_length)) for start, end in spans]
+
+
+class SpeechTimeline:
+    """
+    Audio-ul compactat (doar vorbire) și maparea timpului compactat -> timp original.
+    """
+
+    def __init__(self, audio, spans, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.total_seconds = len(audio) / sample_rate
+        self.spans = spans
+        lengths = np.array([end - start for start, end in spans], dtype=np.int64)
+        self._compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) / sample_rate if spans else np.zeros(0)
+        self._original_starts = np.array([start for start, _ in spans], dtype=np.float64) / sample_rate
+        self._lengths = lengths / sample_rate
+        if spans:
+            self.audio = np.concatenate([audio[start:end] for start, end in spans])
+        else:
+            self.audio = np.zeros(0, dtype=audio.dtype)
+        self.speech_seconds = len(self.audio) / sample_rate
+
+    def to_original(self, compact_time, is_end=False):
+        """
+        Mapează un timp din audio-ul compactat pe axa originală.
+
+        Un moment aflat exact la granița dintre două zone aparține, ca început, zonei următoare,
+        iar ca sfârșit, zonei precedente (altfel un segment care se termină la graniță s-ar
+        întinde peste toată liniștea eliminată).
+
+        Args:
+            compact_time (float): Timpul în audio-ul compactat
+            is_end (bool): True pentru sfârșitul unui segment sau al unui cuvânt
+        """
+        if len(self._compact_starts) == 0:
+            return compact_time
+        side = 'left' if is_end else 'right'
+        index = max(0, int(np.searchsorted(self._compact_starts, compact_time, side=side)) - 1)
+        offset = min(max(0.0, compact_time - self._compact_starts[index]), self._lengths[index])
+        return round(float(self._original_starts[index] + offset), 3)
+
+    def remap_segments(self, segments):
+        """Mută start/end pentru segmente și cuvinte pe axa originală (in-place)."""
+        for segment in segments:
+            for item in [segment, *(segment.get('words') or [])]:
+                start = self.to_original(item['start'])
+                # Un segment de durată zero chiar pe graniță nu trebuie să se termine înainte de a începe
+                item['end'] = max(start, self.to_original(item['end'], is_end=True))
+                item['start'] = start
+        return segments
+
+    def fingerprint(self):
+        """Identificator stabil al zonelor păstrate (pentru cache-urile audio-ului compactat)."""
+        spans = ','.join(f"{int(start)}-{int(end)}" for start, end in self.spans)
+        return hashlib.sha256(spans.encode()).hexdigest()[:16]
+
+    def stats(self):
+        """Cât audio a fost eliminat și accelerarea estimată a transcrierii."""
+        skipped = self.total_seconds - self.speech_seconds
+        return {
+            'total_seconds': round(self.total_seconds, 2),
+            'speech_seconds': round(self.speech_seconds, 2),
+            'skipped_seconds': round(skipped, 2),
+            'skipped_percent': round(100 * skipped / self.total_seconds, 1) if self.total_seconds else 0.0,
+            'speech_spans': len(self.spans),
+            'estimated_speedup': round(self.total_seconds / self.speech_seconds, 2) if self.speech_seconds else None,
+        }
+
+
+def build_speech_timeline(audio, sample_rate=SAMPLE_RATE):
+    """Rulează detecția de vorbire și construiește audio-ul compactat."""
+    return SpeechTimeline(audio, detect_speech_spans(audio, sample_rate), sample_rate)
@@ -189,11 +189,14 @@ function App() {
           setProgressFunc(response.data.progress);
           setProgressStatus(response.data.message || '');
           
-          if (response.data.status !== 'completed' && response.data.status !== 'error') {
+          if (!['completed', 'error', 'cancelled'].includes(response.data.status)) {
             setTimeout(checkProgress, 1000);
           } else if (response.data.status === 'error') {
             setError(`Eroare: ${response.data.message}`);
             setIsProcessing(false);
+          } else if (response.data.status === 'cancelled') {
+            setUploadStatus(response.data.message || 'Activitate anulată');
+            setIsProcessing(false);
           } else if (response.data.status === 'completed' && completionCallback) {
             completionCallback(response.data);
           }
@@ -291,48 +294,61 @@ function App() {
         model: whisperModel
       });
 
-      setSubtitles(response.data.subtitles);
-      
-      const modelUsed = response.data.model_used || whisperModel;
-      setUploadStatus(`Subtitrări generate cu succes folosind modelul ${modelUsed.toUpperCase()}!`);
-      
-      // UX FIX #5: Success toast for subtitle generation
-      addToast(`Subtitrări generate cu succes! (${response.data.subtitles.length} segmente)`, 'success', 4000, '🎵');
-      
-      // FIX: Expandează secțiunile pe desktop
-      if (!isMobile) {
-        setSectionsExpanded(prev => ({
-          ...prev,
-          subtitlesList: true,
-          subtitlesConfig: true
-        }));
-      } else {
-        setSectionsExpanded(prev => ({
-          ...prev,
-          subtitlesList: true
-        }));
-      }
-      
-      if (response.data.task_id) {
-        setTranscribeTaskId(response.data.task_id);
-        pollTaskProgress(response.data.task_id, setTranscribeProgress, 'transcribe');
-      } else {
-        setTranscribeProgress(100);
-      }
+      // Transcrierea rulează în fundal; preluăm rezultatul când task-ul este finalizat
+      const taskId = response.data.task_id;
+      setTranscribeTaskId(taskId);
+      pollTaskProgress(taskId, setTranscribeProgress, 'transcribe', async () => {
+        try {
+          const resultResponse = await axios.get(`${API_URL}/result/${taskId}`);
+          handleTranscriptionResult(resultResponse.data);
+        } catch (err) {
+          handleTranscriptionError(err);
+        } finally {
+          setIsProcessing(false);
+        }
+      });
     } catch (err) {
-      console.error('Error generating subtitles:', err);
-      const errorMsg = `Eroare la generarea subtitrărilor: ${err.response?.data?.error || err.message}`;
-      setError(errorMsg);
-      
-      // UX FIX #5: Error toast for subtitle generation
-      addToast('Eroare la generarea subtitrărilor', 'error', 4000);
-      
-      setTranscribeProgress(0);
-    } finally {
+      handleTranscriptionError(err);
       setIsProcessing(false);
     }
   };
 
+  const handleTranscriptionResult = (result) => {
+    setSubtitles(result.subtitles);
+    setTranscribeProgress(100);
+    
+    const modelUsed = result.model_used || whisperModel;
+    setUploadStatus(`Subtitrări generate cu succes folosind modelul ${modelUsed.toUpperCase()}!`);
+    
+    // UX FIX #5: Success toast for subtitle generation
+    addToast(`Subtitrări generate cu succes! (${result.subtitles.length} segmente)`, 'success', 4000, '🎵');
+    
+    // FIX: Expandează secțiunile pe desktop
+    if (!isMobile) {
+      setSectionsExpanded(prev => ({
+        ...prev,
+        subtitlesList: true,
+        subtitlesConfig: true
+      }));
+    } else {
+      setSectionsExpanded(prev => ({
+        ...prev,
+        subtitlesList: true
+      }));
+    }
+  };
+
+  const handleTranscriptionError = (err) => {
+    console.error('Error generating subtitles:', err);
+    const errorMsg = `Eroare la generarea subtitrărilor: ${err.response?.data?.error || err.message}`;
+    setError(errorMsg);
+    
+    // UX FIX #5: Error toast for subtitle generation
+    addToast('Eroare la generarea subtitrărilor', 'error', 4000);
+    
+    setTranscribeProgress(0);
+  };
+
   // FIX: Handler SIMPLIFICAT pentru schimbări de stil - SE APLICĂ DIRECT
   const handleStyleChange = useCallback((e) => {
     const { name, value } = e.target;
@@ -448,8 +464,8 @@ function App() {
         style: stylePayload
       });
 
-      setOutputVideo(response.data.output_filename);
-      setUploadStatus('Videoclip cu subtitrări creat. Se inițiază descărcarea...');
+      // Randarea este pusă în coadă; numele fișierului vine din /result la final
+      setUploadStatus('Randare în așteptare...');
       
       if (response.data.task_id) {
         setProcessTaskId(response.data.task_id);
@@ -462,7 +478,10 @@ function App() {
               setProgressStatus(statusResponse.data.message || '');
               
               if (statusResponse.data.status === 'completed') {
-                const downloadUrl = `${API_URL}/download/${response.data.output_filename}`;
+                const resultResponse = await axios.get(`${API_URL}/result/${response.data.task_id}`);
+                const outputFilename = resultResponse.data.output_filename;
+                setOutputVideo(outputFilename);
+                const downloadUrl = `${API_URL}/download/${outputFilename}`;
                 console.log("Download initiated for:", downloadUrl);
                 directDownload(downloadUrl);
                 setUploadStatus('Videoclip cu subtitrări creat și descărcat cu succes!');
@@ -476,6 +495,10 @@ function App() {
                 setError(`Eroare: ${statusResponse.data.message}`);
                 setIsProcessing(false);
                 return;
+              } else if (statusResponse.data.status === 'cancelled') {
+                setUploadStatus(statusResponse.data.message || 'Procesare video anulată');
+                setIsProcessing(false);
+                return;
               } 
               
               setTimeout(monitorProgress, 1000);
@@ -489,10 +512,7 @@ function App() {
         
         monitorProgress();
       } else {
-        setProcessProgress(100);
-        const downloadUrl = `${API_URL}/download/${response.data.output_filename}`;
-        directDownload(downloadUrl);
-        setUploadStatus('Videoclip cu subtitrări creat și descărcat cu succes!');
+        setError('Răspuns invalid de la server: lipsește task_id');
         setIsProcessing(false);
       }
     } catch (err) {